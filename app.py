@@ -12,7 +12,12 @@ sys.path.insert(0, str(project_root))
 
 from app.model_loader import ModelLoader
 from app.inference import QAInference
+from app.batching import MicroBatcher
+from app.prefork import PreforkServer
+from app.cache import AnswerCache
+from app.retrieval import CorpusQA, PassageIndex
 from app.interface import create_interface
+from app.metrics import MetricsCollector, start_metrics_server
 
 
 def main():
@@ -24,10 +29,37 @@ def main():
     
     # Configuration
     MODEL_PATH = "models/multilingual_model"  # Change this to your model path
+    BACKEND = "torch"         # "torch", or "onnx" with MODEL_PATH pointing at an app.onnx_backend export
+    TORCH_COMPILE = False     # torch.compile encoder/decoder, warmed up per length bucket (minutes of startup)
+    ENABLE_BATCHING = True    # Group concurrent requests into one generate call
+    MAX_BATCH_SIZE = 8        # Maximum requests per batch
+    MAX_WAIT_MS = 10          # Maximum time a request waits for its batch to fill
+    NUM_WORKERS = 2           # Inference threads sharing the loaded model
+    PREFORK_WORKERS = 0       # Serve from forked processes sharing the weights (0 = threads only)
+    THREADS_PER_WORKER = 1    # torch threads per forked process
+    CACHE_SIZE = 1024         # Cached answers for repeated requests (0 disables)
+    CACHE_TTL_SECONDS = None  # Expire cached answers after this long (None = never)
+    CONSTRAINED_DECODING = False  # Only generate spans of the context (extractive answers)
+    CASCADE = False           # Greedy first, beam search only for ungrounded/low-score answers
+    CASCADE_MIN_SCORE = -1.0  # Greedy acceptance threshold (tune with python -m app.cascade)
+    ENABLE_METRICS = True     # Per-stage latency metrics, live panel and Prometheus endpoint
+    METRICS_PORT = 9100       # Prometheus scrape port (/metrics)
+    ADAPTERS = {}             # Extra LoRA adapters {name: path} over the same base model (API "adapter" field)
+    MAX_RESIDENT_ADAPTERS = 4 # Extra adapters kept loaded at once (least recently used is evicted)
+    STREAM_ANSWERS = True     # Show "Get Answer" answers token by token (greedy; API calls keep beam search)
+    REQUEST_TIMEOUT_SECONDS = 30  # UI answers stop with a timeout message after this long (None = no limit)
+    CORPUS_INDEX = None       # BM25 passage index (python -m app.retrieval build) for the "Search Corpus" tab
+    RETRIEVAL_TOP_K = 5       # Passages read by the model per corpus question
     
     # Load model
     print(f"\n📂 Model path: {MODEL_PATH}")
-    loader = ModelLoader(model_path=MODEL_PATH)
+    loader = ModelLoader(
+        model_path=MODEL_PATH,
+        backend=BACKEND,
+        adapters=ADAPTERS,
+        max_resident_adapters=MAX_RESIDENT_ADAPTERS,
+        torch_compile=TORCH_COMPILE
+    )
     
     try:
         model, tokenizer = loader.load()
@@ -41,16 +73,67 @@ def main():
     
     # Create inference engine
     print("\n🔧 Initializing inference engine...")
+    metrics = MetricsCollector() if ENABLE_METRICS else None
     inference_engine = QAInference(
         model=model,
         tokenizer=tokenizer,
-        device=loader.device
+        device=loader.device,
+        cache=AnswerCache(CACHE_SIZE, ttl_seconds=CACHE_TTL_SECONDS) if CACHE_SIZE else None,
+        constrained_decoding=CONSTRAINED_DECODING,
+        cascade=CASCADE,
+        cascade_min_score=CASCADE_MIN_SCORE,
+        hooks=[metrics] if metrics else None,
+        adapters=loader.adapters
     )
     print("✅ Inference engine ready")
     
+    concurrency_limit = NUM_WORKERS
+    if PREFORK_WORKERS:
+        # Fork before any other thread is started
+        print(f"\n🍴 Forking {PREFORK_WORKERS} worker processes ({THREADS_PER_WORKER} torch threads each)...")
+        inference_engine = PreforkServer(
+            inference_engine,
+            num_workers=PREFORK_WORKERS,
+            threads_per_worker=THREADS_PER_WORKER,
+            max_batch_size=MAX_BATCH_SIZE
+        ).start()
+        concurrency_limit = MAX_BATCH_SIZE * PREFORK_WORKERS
+        print(f"✅ Workers ready (total PSS {inference_engine.get_stats()['total_pss_mb']} MB)")
+    elif ENABLE_BATCHING:
+        print(f"\n📦 Enabling micro-batching (max batch {MAX_BATCH_SIZE}, max wait {MAX_WAIT_MS} ms, "
+              f"{NUM_WORKERS} workers)...")
+        inference_engine = MicroBatcher(
+            inference_engine,
+            max_batch_size=MAX_BATCH_SIZE,
+            max_wait_ms=MAX_WAIT_MS,
+            num_workers=NUM_WORKERS
+        ).start()
+        concurrency_limit = MAX_BATCH_SIZE * NUM_WORKERS
+        print("✅ Micro-batching enabled")
+    
+    if metrics:
+        start_metrics_server(metrics, port=METRICS_PORT)
+        print(f"📈 Prometheus metrics at: http://localhost:{METRICS_PORT}/metrics")
+    
+    retriever = None
+    if CORPUS_INDEX:
+        if Path(CORPUS_INDEX).exists():
+            retriever = CorpusQA(PassageIndex(CORPUS_INDEX), inference_engine, top_k=RETRIEVAL_TOP_K)
+            stats = retriever.index.get_stats()
+            print(f"🔎 Passage index: {stats['passages']:,} passages ({stats['size_mb']} MB)")
+        else:
+            print(f"⚠️ Passage index not found at {CORPUS_INDEX}; corpus search disabled")
+    
     # Create interface
     print("\n🎨 Building Gradio interface...")
-    demo = create_interface(inference_engine)
+    demo = create_interface(
+        inference_engine,
+        concurrency_limit=concurrency_limit,
+        metrics=metrics,
+        retriever=retriever,
+        stream=STREAM_ANSWERS,
+        request_timeout=REQUEST_TIMEOUT_SECONDS
+    )
     print("✅ Interface created")
     
     # Launch
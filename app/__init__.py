@@ -1,18 +1,46 @@
 """
 Multilingual Question Answering System
 App package initialization
+
+Public names are resolved lazily on first access, so importing the package
+(or a light submodule such as app.utils) does not load torch, transformers
+or peft until a caller actually needs them.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Praanshull Verma"
 
-from .model_loader import ModelLoader
-from .inference import QAInference
-from .utils import calculate_confidence, format_answer
+# Public name -> submodule defining it
+_EXPORTS = {
+    "ModelLoader": ".model_loader",
+    "QAInference": ".inference",
+    "MicroBatcher": ".batching",
+    "AnswerCache": ".cache",
+    "calculate_confidence": ".utils",
+    "format_answer": ".utils",
+    "is_grounded": ".utils"
+}
 
 __all__ = [
     "ModelLoader",
     "QAInference", 
+    "MicroBatcher",
+    "AnswerCache",
     "calculate_confidence",
-    "format_answer"
-]
\ No newline at end of file
+    "format_answer",
+    "is_grounded"
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
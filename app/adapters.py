@@ -0,0 +1,366 @@
+"""
+Multi-Adapter Module
+Serves several LoRA adapters over one resident base model: adapters are
+registered by name, loaded on first use, evicted least-recently-used and
+selected per request
+
+Usage:
+    python -m app.adapters models/multilingual_model --adapter legal=models/legal_lora --adapter med=models/med_lora
+    python -m app.adapters --tiny --tiny-adapters 4 --output adapter_report.json
+"""
+
+import argparse
+import gc
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from .utils import get_memory_usage
+
+
+# Adapters kept in memory at once (the default adapter does not count)
+MAX_RESIDENT_ADAPTERS = 4
+
+
+class _ReadWriteLock:
+    """Shared/exclusive lock that lets waiting writers in before new readers"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def shared(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class AdapterRegistry:
+    """
+    Named LoRA adapters sharing one PEFT-wrapped base model
+
+    Registering an adapter only records its path; the weights are loaded
+    the first time a request selects it. At most max_resident adapters
+    besides the default one stay loaded; loading another evicts the least
+    recently used. Each adapter adds only its LoRA matrices (a few MB for
+    mBART-large at r=16) instead of a second 610M-parameter model.
+
+    PEFT switches adapters by changing state on the shared model, so
+    generation with a non-default adapter (and every load or unload) holds
+    an exclusive lock, while default-adapter generation runs concurrently
+    under a shared lock. Grouping queued requests by adapter (as
+    MicroBatcher does) keeps the number of switches low.
+    """
+
+    def __init__(self, model, max_resident: int = MAX_RESIDENT_ADAPTERS):
+        """
+        Initialize AdapterRegistry
+
+        Args:
+            model: PeftModel holding the default adapter (fp32, unmerged)
+            max_resident: Adapters besides the default kept loaded at once
+        """
+        from peft import PeftModel
+
+        if not isinstance(model, PeftModel):
+            raise ValueError(
+                "Multi-adapter serving needs an unmerged LoRA model "
+                "(not a merged artifact, ONNX export or bf16/int8 model)"
+            )
+        if max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+
+        self.model = model
+        self.max_resident = max_resident
+        self.default_adapter = model.active_adapter
+
+        self._lock = _ReadWriteLock()
+        self._paths: Dict[str, str] = {}
+        self._resident: "OrderedDict[str, None]" = OrderedDict()
+        self._stats: Dict[str, Dict] = {}
+        self._stats_lock = threading.Lock()
+        self._switches = 0
+        self._evictions = 0
+
+    def register(self, name: str, path: str, preload: bool = False):
+        """
+        Register an adapter directory under a name
+
+        Args:
+            name: Adapter name selected by requests
+            path: Directory saved by PeftModel.save_pretrained
+            preload: Load the weights now instead of on first use
+        """
+        if not name or name == self.default_adapter:
+            raise ValueError(f"Invalid adapter name '{name}'")
+
+        with self._lock.exclusive():
+            if name in self._resident and self._paths.get(name) != path:
+                self._delete(name)
+            self._paths[name] = path
+            with self._stats_lock:
+                self._stats.setdefault(name, {"loads": 0, "requests": 0})
+            if preload:
+                self._ensure_loaded(name)
+
+    def unload(self, name: str, forget: bool = False) -> bool:
+        """
+        Free an adapter's weights
+
+        Args:
+            name: Adapter name
+            forget: Also unregister it (otherwise it reloads on next use)
+
+        Returns:
+            True if the adapter was resident
+        """
+        self._check_known(name)
+        with self._lock.exclusive():
+            resident = name in self._resident
+            if resident:
+                self._delete(name)
+            if forget:
+                self._paths.pop(name, None)
+                with self._stats_lock:
+                    self._stats.pop(name, None)
+            return resident
+
+    def names(self) -> List[str]:
+        """Default adapter followed by every registered adapter"""
+        return [self.default_adapter] + list(self._paths)
+
+    def __contains__(self, name: str) -> bool:
+        return name == self.default_adapter or name in self._paths
+
+    @contextmanager
+    def use(self, name: Optional[str] = None):
+        """
+        Make an adapter active for the enclosed generate call
+
+        Args:
+            name: Adapter name (None = default adapter)
+        """
+        if name is None or name == self.default_adapter:
+            with self._lock.shared():
+                yield
+            return
+
+        self._check_known(name)
+        with self._lock.exclusive():
+            self._ensure_loaded(name)
+            self._resident.move_to_end(name)
+            self.model.set_adapter(name)
+            with self._stats_lock:
+                self._switches += 1
+                self._stats[name]["requests"] += 1
+            try:
+                yield
+            finally:
+                self.model.set_adapter(self.default_adapter)
+
+    def _check_known(self, name: str):
+        if name not in self._paths:
+            raise ValueError(f"Unknown adapter '{name}' (registered: {', '.join(self.names())})")
+
+    def _ensure_loaded(self, name: str):
+        """Load an adapter, then evict the least recently used ones over the limit (exclusive lock held)"""
+        if name in self._resident:
+            return
+
+        gc.collect()
+        rss_before = get_memory_usage()["rss_mb"]
+        start = time.perf_counter()
+        self.model.load_adapter(self._paths[name], adapter_name=name, is_trainable=False)
+        self.model.set_adapter(self.default_adapter)
+        load_seconds = time.perf_counter() - start
+        rss_after = get_memory_usage()["rss_mb"]
+
+        parameters = [
+            parameter for parameter_name, parameter in self.model.named_parameters()
+            if f".{name}." in parameter_name
+        ]
+        with self._stats_lock:
+            stats = self._stats[name]
+            stats["loads"] += 1
+            stats.update({
+                "parameters": sum(parameter.numel() for parameter in parameters),
+                "weights_mb": round(sum(p.numel() * p.element_size() for p in parameters) / 1024 ** 2, 2),
+                "rss_delta_mb": round(rss_after - rss_before, 1),
+                "load_ms": round(load_seconds * 1000, 1)
+            })
+        self._resident[name] = None
+
+        # Evict only after a successful load, so a bad path costs no resident adapter
+        while len(self._resident) > self.max_resident:
+            evicted, _ = self._resident.popitem(last=False)
+            self._delete(evicted, already_removed=True)
+            self._evictions += 1
+
+    def _delete(self, name: str, already_removed: bool = False):
+        if not already_removed:
+            self._resident.pop(name, None)
+        self.model.delete_adapter(name)
+        self.model.set_adapter(self.default_adapter)
+        gc.collect()
+
+    def get_stats(self) -> Dict:
+        """
+        Get residency, usage and memory statistics per adapter
+
+        Returns:
+            Dictionary with the resident set (LRU order), switch and eviction
+            counts, the base model size and per-adapter weight memory
+        """
+        base_parameters = sum(
+            parameter.numel() * parameter.element_size()
+            for parameter_name, parameter in self.model.named_parameters()
+            if "lora_" not in parameter_name
+        )
+        with self._stats_lock:
+            adapters = {
+                name: dict(stats, resident=name in self._resident, path=self._paths.get(name))
+                for name, stats in self._stats.items()
+            }
+            switches = self._switches
+            evictions = self._evictions
+
+        return {
+            "default": self.default_adapter,
+            "max_resident": self.max_resident,
+            "resident": list(self._resident),
+            "switches": switches,
+            "evictions": evictions,
+            "base_model_mb": round(base_parameters / 1024 ** 2, 1),
+            "adapters": adapters
+        }
+
+
+def measure_adapters(inference_engine, names: List[str], samples: List[Dict] = None) -> Dict:
+    """
+    Load every adapter once, answer the samples with each and report memory
+
+    Args:
+        inference_engine: QAInference with an AdapterRegistry
+        names: Registered adapter names
+        samples: QA items (defaults to the precision check samples)
+
+    Returns:
+        Registry statistics plus per-adapter latency of the sample set
+    """
+    from .precision import PRECISION_CHECK_SAMPLES
+
+    samples = samples or PRECISION_CHECK_SAMPLES
+    latency = {}
+    for name in [None] + names:
+        # First use loads the adapter (reported separately as load_ms)
+        inference_engine.answer_batch([samples[0]["question"]], [samples[0]["context"]], adapter=name)
+        start = time.perf_counter()
+        inference_engine.answer_batch(
+            [item["question"] for item in samples],
+            [item["context"] for item in samples],
+            [item["language"] for item in samples],
+            adapter=name
+        )
+        latency[name or inference_engine.adapters.default_adapter] = round(
+            (time.perf_counter() - start) * 1000 / len(samples), 1
+        )
+
+    report = inference_engine.adapters.get_stats()
+    report["ms_per_item"] = latency
+    return report
+
+
+def print_report(report: Dict):
+    """Print a multi-adapter memory report as a table"""
+    print("\n" + "=" * 80)
+    print("🧩 MULTI-ADAPTER SERVING")
+    print("=" * 80)
+    print(f"Base model weights: {report['base_model_mb']} MB | resident limit: {report['max_resident']} | "
+          f"switches: {report['switches']} | evictions: {report['evictions']}")
+    print(f"Default adapter: {report['ms_per_item'].get(report['default'], 0):.1f} ms/item")
+    print(f"\n{'Adapter':<16} {'Params':>10} {'Weights':>10} {'RSS delta':>10} {'Load':>9} {'ms/item':>8} {'Resident':>9}")
+    for name, stats in report["adapters"].items():
+        print(f"{name:<16} {stats.get('parameters', 0):>10,} {stats.get('weights_mb', 0):>7.2f} MB "
+              f"{stats.get('rss_delta_mb', 0):>7.1f} MB {stats.get('load_ms', 0):>6.1f} ms "
+              f"{report['ms_per_item'].get(name, 0):>8.1f} {'yes' if stats['resident'] else 'no':>9}")
+    print(f"\nEach extra adapter costs its weights column instead of another {report['base_model_mb']} MB model.")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load several LoRA adapters over one base model and report memory")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapters are applied to")
+    parser.add_argument("--adapter", action="append", default=[], metavar="NAME=PATH",
+                        help="Extra adapter (repeatable)")
+    parser.add_argument("--max-resident", type=int, default=MAX_RESIDENT_ADAPTERS)
+    parser.add_argument("--tiny", action="store_true", help="Use a tiny random mBART with random adapters")
+    parser.add_argument("--tiny-adapters", type=int, default=3, help="Random adapters created with --tiny")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    from .inference import QAInference
+    from .model_loader import ModelLoader
+
+    model_path = args.model_path
+    base_model = args.base_model
+    adapters = dict(spec.split("=", 1) for spec in args.adapter)
+    if args.tiny:
+        import tempfile
+        from .tiny_model import build_tiny_adapter, build_tiny_model
+
+        base_model = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(save_path=base_model)
+        model_path = build_tiny_adapter(base_model, tempfile.mkdtemp(prefix="tiny_lora_"), seed=0)
+        for i in range(1, args.tiny_adapters + 1):
+            adapters[f"tiny-{i}"] = build_tiny_adapter(base_model, tempfile.mkdtemp(prefix="tiny_lora_"), seed=i)
+
+    loader = ModelLoader(
+        model_path=model_path,
+        base_model=base_model,
+        adapters=adapters,
+        max_resident_adapters=args.max_resident
+    )
+    model, tokenizer = loader.load()
+    inference = QAInference(model, tokenizer, loader.device, adapters=loader.adapters)
+
+    report = measure_adapters(inference, list(adapters))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,535 @@
+"""
+HTTP API Module
+Headless async JSON API around ModelLoader and QAInference, separate from
+the Gradio demo
+
+Usage:
+    python -m app.api --host 0.0.0.0 --port 8000
+    python -m app.api --tiny --port 8000
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Literal, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+
+from .cancellation import CancelToken, RequestTimeout, abort_from_answer
+from .utils import calculate_confidence
+
+
+# Server defaults
+MAX_WORKERS = 2                # Threads running generate
+MAX_PENDING = 64               # Requests queued or running before 503
+MAX_BODY_BYTES = 1024 * 1024   # Request body limit (413 above it)
+MAX_BATCH_ITEMS = 64           # Items per /v1/answer/batch request
+MAX_TIMEOUT_SECONDS = 600      # Largest accepted per-request timeout_seconds
+KEEP_ALIVE_SECONDS = 30        # Idle keep-alive timeout
+
+
+class AnswerRequest(BaseModel):
+    question: str = Field(..., min_length=1, pattern=r"\S")
+    context: str = Field(..., min_length=1, pattern=r"\S")
+    language: Literal["English", "German"] = "English"
+    max_length: int = Field(64, ge=1, le=512)
+    adapter: Optional[str] = None
+    timeout_seconds: Optional[float] = Field(None, gt=0, le=MAX_TIMEOUT_SECONDS)
+
+
+class BatchItem(BaseModel):
+    question: str = Field(..., min_length=1, pattern=r"\S")
+    context: str = Field(..., min_length=1, pattern=r"\S")
+    language: Literal["English", "German"] = "English"
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem] = Field(..., min_length=1)
+    max_length: int = Field(64, ge=1, le=512)
+    adapter: Optional[str] = None
+    timeout_seconds: Optional[float] = Field(None, gt=0, le=MAX_TIMEOUT_SECONDS)
+
+
+class AdapterLoad(BaseModel):
+    name: str = Field(..., min_length=1, pattern=r"^[\w.-]+$")
+    path: str = Field(..., min_length=1)
+    preload: bool = True
+
+
+class _BodySizeLimit:
+    """ASGI middleware rejecting bodies above max_bytes, declared or streamed"""
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        declared = headers.get(b"content-length")
+        if declared is not None:
+            if int(declared) > self.max_bytes:
+                await self._reject(send)
+            else:
+                await self.app(scope, receive, send)
+            return
+
+        # Streamed body of unknown size: buffer up to the limit, then replay it
+        chunks = []
+        received = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                await self.app(scope, _replay([message], receive), send)
+                return
+            chunks.append(message)
+            received += len(message.get("body", b""))
+            if received > self.max_bytes:
+                await self._reject(send)
+                return
+            if not message.get("more_body", False):
+                break
+        await self.app(scope, _replay(chunks, receive), send)
+
+    async def _reject(self, send):
+        response = JSONResponse({"detail": f"Request body exceeds {self.max_bytes} bytes"}, status_code=413)
+        await response({"type": "http"}, None, send)
+
+
+def _replay(messages, receive):
+    """ASGI receive callable yielding buffered messages, then the original receive"""
+    pending = list(messages)
+
+    async def replay():
+        if pending:
+            return pending.pop(0)
+        return await receive()
+
+    return replay
+
+
+def _result(answer: str, context: str, language: str, adapter: Optional[str] = None) -> dict:
+    """Turn an engine answer into a JSON result, raising on engine errors"""
+    aborted = abort_from_answer(answer)
+    if aborted is not None:
+        # 504 when the deadline passed; 499 (client closed request) when cancelled
+        raise HTTPException(status_code=504 if isinstance(aborted, RequestTimeout) else 499, detail=answer)
+    if answer.startswith("❌ Error"):
+        raise HTTPException(status_code=500, detail=answer)
+    if answer.startswith("⚠️"):
+        raise HTTPException(status_code=422, detail=answer)
+    result = {
+        "answer": answer,
+        "confidence": calculate_confidence(answer, context),
+        "language": language
+    }
+    if adapter:
+        result["adapter"] = adapter
+    return result
+
+
+def create_app(
+    engine_factory: Callable[[], object],
+    max_workers: int = MAX_WORKERS,
+    max_pending: int = MAX_PENDING,
+    max_body_bytes: int = MAX_BODY_BYTES,
+    max_batch_items: int = MAX_BATCH_ITEMS,
+    metrics=None
+) -> FastAPI:
+    """
+    Create the FastAPI application
+
+    The engine is built in the background on startup, so /health answers
+    immediately and /ready reports when the model can serve. Generation runs
+    in a bounded thread pool; the event loop only parses and routes. With a
+    MicroBatcher or PreforkServer engine, single questions wait for their
+    batch on a separate pool of up to max_pending threads instead, so they
+    keep the cache and single-flight of answer_question without holding a
+    generate thread.
+
+    Args:
+        engine_factory: Returns a QAInference (or MicroBatcher); called once
+            on startup in a worker thread
+        max_workers: Threads running generate
+        max_pending: Requests admitted (queued or running) before answering 503
+        max_body_bytes: Largest accepted request body
+        max_batch_items: Largest accepted batch
+        metrics: Optional MetricsCollector exposed at /metrics
+
+    Returns:
+        FastAPI application
+    """
+    state = {"engine": None, "error": None, "pending": 0}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qa-api")
+    waiters = ThreadPoolExecutor(max_workers=max_pending, thread_name_prefix="qa-api-wait")
+
+    async def load_engine():
+        try:
+            state["engine"] = await asyncio.get_running_loop().run_in_executor(executor, engine_factory)
+        except Exception as e:
+            state["error"] = f"{type(e).__name__}: {e}"
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        loading = asyncio.create_task(load_engine())
+        yield
+        loading.cancel()
+        engine = state["engine"]
+        if hasattr(engine, "stop"):
+            engine.stop()
+        executor.shutdown(wait=False, cancel_futures=True)
+        waiters.shutdown(wait=False, cancel_futures=True)
+
+    app = FastAPI(title="Multilingual QA API", version="1.0.0", lifespan=lifespan)
+    app.add_middleware(_BodySizeLimit, max_bytes=max_body_bytes)
+
+    async def admit(call):
+        """Await call() for an admitted request, answering 503 when not ready or overloaded"""
+        if state["engine"] is None:
+            raise HTTPException(status_code=503, detail="Model is not loaded yet")
+        if state["pending"] >= max_pending:
+            raise HTTPException(status_code=503, detail="Server is overloaded", headers={"Retry-After": "1"})
+
+        state["pending"] += 1
+        try:
+            return await call()
+        finally:
+            state["pending"] -= 1
+
+    def registry():
+        """AdapterRegistry of the loaded engine (None without LoRA adapters)"""
+        engine = state["engine"]
+        return getattr(getattr(engine, "inference_engine", engine), "adapters", None)
+
+    def check_adapter(name: Optional[str]):
+        """Answer 404 for an adapter the engine does not know"""
+        adapters = registry()
+        if name is not None and state["engine"] is not None and (adapters is None or name not in adapters):
+            raise HTTPException(status_code=404, detail=f"Unknown adapter '{name}'")
+
+    def in_pool(fn, pool=executor):
+        """Run a blocking engine call in the bounded pool"""
+        return lambda: asyncio.get_running_loop().run_in_executor(pool, fn)
+
+    async def cancellable(call, cancel_token: CancelToken):
+        """Await call(), cancelling the request's token if the client goes away first"""
+        try:
+            return await call()
+        except asyncio.CancelledError:
+            cancel_token.cancel()
+            raise
+
+    @app.get("/health")
+    async def health():
+        """Liveness: the process and event loop are up"""
+        return {"status": "ok"}
+
+    @app.get("/ready")
+    async def ready():
+        """Readiness: the model is loaded and accepting requests"""
+        if state["engine"] is not None:
+            return {"status": "ready", "pending": state["pending"]}
+        status = "failed" if state["error"] else "loading"
+        return JSONResponse({"status": status, "error": state["error"]}, status_code=503)
+
+    @app.post("/v1/answer")
+    async def answer(request: AnswerRequest):
+        """Answer one question (504 if it does not finish within timeout_seconds)"""
+        start_time = time.perf_counter()
+        check_adapter(request.adapter)
+        engine = state["engine"]
+        cancel_token = CancelToken(request.timeout_seconds)
+        # Queued engines only wait in the calling thread; generate runs on their own workers
+        pool = waiters if hasattr(engine, "submit") else executor
+        answer_text, _ = await admit(lambda: cancellable(in_pool(
+            lambda: engine.answer_question(
+                request.question, request.context, request.language, request.max_length, request.adapter,
+                cancel_token
+            ),
+            pool
+        ), cancel_token))
+        result = _result(answer_text, request.context, request.language, request.adapter)
+        result["latency_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        return result
+
+    @app.post("/v1/answer/batch")
+    async def answer_batch(request: BatchRequest):
+        """Answer many questions in batched generate calls"""
+        if len(request.items) > max_batch_items:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {max_batch_items} items")
+
+        start_time = time.perf_counter()
+        check_adapter(request.adapter)
+        # A MicroBatcher only batches single questions; use its engine directly
+        engine = state["engine"]
+        if not hasattr(engine, "answer_batch"):
+            engine = engine.inference_engine
+        items = request.items
+        cancel_token = CancelToken(request.timeout_seconds)
+        answers = await admit(lambda: cancellable(in_pool(
+            lambda: engine.answer_batch(
+                [item.question for item in items],
+                [item.context for item in items],
+                [item.language for item in items],
+                max_length=request.max_length,
+                adapter=request.adapter,
+                cancel_tokens=[cancel_token] * len(items)
+            )
+        ), cancel_token))
+
+        results = []
+        for item, (answer_text, _) in zip(items, answers):
+            try:
+                results.append(_result(answer_text, item.context, item.language, request.adapter))
+            except HTTPException as e:
+                results.append({"error": e.detail, "language": item.language})
+        return {
+            "results": results,
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 2)
+        }
+
+    def runtime_registry():
+        """Registry that accepts runtime loads (409 when the engine cannot take them)"""
+        if state["engine"] is None:
+            raise HTTPException(status_code=503, detail="Model is not loaded yet")
+        adapters = registry()
+        if adapters is None:
+            raise HTTPException(status_code=409, detail="The loaded model cannot serve extra LoRA adapters")
+        from .prefork import PreforkServer
+
+        if isinstance(state["engine"], PreforkServer):
+            # Forked workers hold their own copy of the adapter set
+            raise HTTPException(status_code=409, detail="Adapters cannot change at runtime with pre-fork workers")
+        return adapters
+
+    @app.get("/v1/adapters")
+    async def list_adapters():
+        """Registered adapters with residency, usage and memory"""
+        if state["engine"] is None:
+            raise HTTPException(status_code=503, detail="Model is not loaded yet")
+        adapters = registry()
+        return adapters.get_stats() if adapters is not None else {"adapters": {}}
+
+    @app.post("/v1/adapters")
+    async def load_adapter(request: AdapterLoad):
+        """Register an adapter directory (and load it unless preload is false)"""
+        adapters = runtime_registry()
+        if request.name == adapters.default_adapter:
+            raise HTTPException(status_code=422, detail="The default adapter cannot be replaced")
+        try:
+            await in_pool(lambda: adapters.register(request.name, request.path, preload=request.preload))()
+        except Exception as e:
+            if request.name in adapters:
+                adapters.unload(request.name, forget=True)
+            raise HTTPException(status_code=422, detail=f"Could not load adapter: {type(e).__name__}: {e}")
+        return adapters.get_stats()["adapters"][request.name]
+
+    @app.delete("/v1/adapters/{name}")
+    async def unload_adapter(name: str, forget: bool = False):
+        """Free an adapter's weights (forget=true also unregisters it)"""
+        adapters = runtime_registry()
+        check_adapter(name)
+        if name == adapters.default_adapter:
+            raise HTTPException(status_code=422, detail="The default adapter cannot be unloaded")
+        resident = await in_pool(lambda: adapters.unload(name, forget=forget))()
+        return {"name": name, "was_resident": resident, "forgotten": forget}
+
+    if metrics is not None:
+        @app.get("/metrics", response_class=PlainTextResponse)
+        async def prometheus():
+            """Prometheus text exposition of the inference metrics"""
+            return metrics.render_prometheus()
+
+    return app
+
+
+def build_engine_factory(
+    model_path: Optional[str] = None,
+    base_model: Optional[str] = None,
+    backend: str = "torch",
+    precision: str = "fp32",
+    tiny: bool = False,
+    max_batch_size: int = 8,
+    max_wait_ms: float = 10,
+    num_workers: int = MAX_WORKERS,
+    hooks: list = None,
+    prefork_workers: int = 0,
+    threads_per_worker: int = 1,
+    adapters: Optional[Dict[str, str]] = None,
+    max_resident_adapters: int = 4,
+    cache_size: int = 1024,
+    cache_ttl_seconds: Optional[float] = None,
+    constrained_decoding: bool = False,
+    cascade: bool = False,
+    cascade_min_score: Optional[float] = None,
+    torch_compile: bool = False
+) -> Callable[[], object]:
+    """
+    Factory loading the model and wrapping it the way app.py does
+
+    Args:
+        model_path: Model directory for ModelLoader
+        base_model: Base model the adapter is applied to
+        backend: "torch" or "onnx"
+        precision: "fp32", "bf16" or "int8"
+        tiny: Serve a tiny random mBART instead (for local testing)
+        max_batch_size: Micro-batch size for single questions (1 disables)
+        max_wait_ms: Micro-batch fill window
+        num_workers: Micro-batching worker threads
+        hooks: InferenceHooks passed to QAInference
+        prefork_workers: Serve from this many forked processes instead
+            (app.prefork); call the factory before starting any threads
+        threads_per_worker: torch threads per forked worker
+        adapters: Extra LoRA adapters {name: path} selectable per request
+        max_resident_adapters: Extra adapters kept loaded at once (LRU)
+        cache_size: Cached answers for repeated requests (0 disables)
+        cache_ttl_seconds: Expire cached answers after this long (None = never)
+        constrained_decoding: Only generate spans of the context
+        cascade: Greedy first, beam search only for ungrounded/low-score answers
+        cascade_min_score: Greedy acceptance threshold (None = the engine default)
+        torch_compile: torch.compile the model, padded to length buckets (app.compiled)
+
+    Returns:
+        Callable returning the serving engine
+    """
+
+    def factory():
+        from .batching import MicroBatcher
+        from .cache import AnswerCache
+        from .inference import CASCADE_MIN_SCORE, QAInference
+        from .model_loader import ModelLoader
+
+        path = model_path
+        if tiny:
+            import tempfile
+            from .tiny_model import build_tiny_model
+
+            path = tempfile.mkdtemp(prefix="tiny_mbart_")
+            build_tiny_model(save_path=path)
+
+        loader = ModelLoader(
+            model_path=path,
+            base_model=base_model,
+            precision=precision,
+            backend=backend,
+            adapters=adapters,
+            max_resident_adapters=max_resident_adapters,
+            torch_compile=torch_compile
+        )
+        model, tokenizer = loader.load()
+        engine = QAInference(
+            model,
+            tokenizer,
+            loader.device,
+            cache=AnswerCache(cache_size, ttl_seconds=cache_ttl_seconds) if cache_size else None,
+            constrained_decoding=constrained_decoding,
+            cascade=cascade,
+            cascade_min_score=CASCADE_MIN_SCORE if cascade_min_score is None else cascade_min_score,
+            hooks=hooks,
+            adapters=loader.adapters
+        )
+        if prefork_workers:
+            from .prefork import PreforkServer
+
+            engine = PreforkServer(
+                engine,
+                num_workers=prefork_workers,
+                threads_per_worker=threads_per_worker,
+                max_batch_size=max_batch_size
+            ).start()
+        elif max_batch_size > 1:
+            engine = MicroBatcher(
+                engine,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                num_workers=num_workers
+            ).start()
+        return engine
+
+    return factory
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve the QA model over a JSON HTTP API")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--backend", default="torch", choices=("torch", "onnx"))
+    parser.add_argument("--precision", default="fp32", choices=("fp32", "bf16", "int8"))
+    parser.add_argument("--tiny", action="store_true", help="Serve a tiny random mBART (for testing)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Threads running generate")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING, help="Admitted requests before 503")
+    parser.add_argument("--max-batch-size", type=int, default=8, help="Micro-batch size (1 disables)")
+    parser.add_argument("--max-wait-ms", type=float, default=10, help="Micro-batch fill window")
+    parser.add_argument("--prefork-workers", type=int, default=0,
+                        help="Serve from this many forked processes sharing the weights (0 = in-process)")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="torch threads per forked worker")
+    parser.add_argument("--adapter", action="append", default=[], metavar="NAME=PATH",
+                        help="Extra LoRA adapter selectable per request (repeatable)")
+    parser.add_argument("--max-resident-adapters", type=int, default=4, help="Extra adapters kept loaded (LRU)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cached answers (0 disables)")
+    parser.add_argument("--cache-ttl", type=float, default=None, help="Expire cached answers after N seconds")
+    parser.add_argument("--constrained-decoding", action="store_true", help="Only generate spans of the context")
+    parser.add_argument("--cascade", action="store_true", help="Greedy first, beam search on demand")
+    parser.add_argument("--cascade-min-score", type=float, default=None, help="Greedy acceptance threshold")
+    parser.add_argument("--torch-compile", action="store_true", help="torch.compile with length-bucket padding")
+    parser.add_argument("--max-body-kb", type=int, default=MAX_BODY_BYTES // 1024)
+    parser.add_argument("--max-batch-items", type=int, default=MAX_BATCH_ITEMS)
+    parser.add_argument("--keep-alive", type=int, default=KEEP_ALIVE_SECONDS, help="Idle keep-alive seconds")
+    parser.add_argument("--no-metrics", action="store_true", help="Disable /metrics")
+    args = parser.parse_args()
+
+    import uvicorn
+    from .metrics import MetricsCollector
+
+    metrics = None if args.no_metrics else MetricsCollector()
+    engine_factory = build_engine_factory(
+        model_path=args.model_path,
+        base_model=args.base_model,
+        backend=args.backend,
+        precision=args.precision,
+        tiny=args.tiny,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        num_workers=args.workers,
+        hooks=[metrics] if metrics else None,
+        prefork_workers=args.prefork_workers,
+        threads_per_worker=args.threads_per_worker,
+        adapters=dict(spec.split("=", 1) for spec in args.adapter),
+        max_resident_adapters=args.max_resident_adapters,
+        cache_size=args.cache_size,
+        cache_ttl_seconds=args.cache_ttl,
+        constrained_decoding=args.constrained_decoding,
+        cascade=args.cascade,
+        cascade_min_score=args.cascade_min_score,
+        torch_compile=args.torch_compile
+    )
+    if args.prefork_workers:
+        # Fork before uvicorn starts its threads
+        engine = engine_factory()
+        engine_factory = lambda: engine
+
+    app = create_app(
+        engine_factory,
+        max_workers=args.workers,
+        max_pending=args.max_pending,
+        max_body_bytes=args.max_body_kb * 1024,
+        max_batch_items=args.max_batch_items,
+        metrics=metrics
+    )
+
+    print(f"🚀 Serving on http://{args.host}:{args.port} (health: /health, ready: /ready)")
+    uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=args.keep_alive, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Serving Artifact Module
+Merges the LoRA adapter into the base weights and writes a single
+safetensors bundle that ModelLoader can memory-map offline
+
+Usage:
+    python -m app.artifact models/multilingual_model models/merged_model
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict
+
+import torch
+from peft import PeftModel
+
+from .model_loader import ARTIFACT_MANIFEST, BASE_MODEL, ModelLoader
+
+
+def build_serving_artifact(
+    model_path: str,
+    output_path: str,
+    base_model: str = None
+) -> Dict:
+    """
+    Merge a LoRA adapter into its base model and save it for serving
+
+    Args:
+        model_path: Directory with the LoRA adapter and tokenizer
+        output_path: Directory to write the merged artifact to
+        base_model: Base model the adapter was trained on
+
+    Returns:
+        Manifest dictionary that was written next to the weights
+    """
+    start_time = time.perf_counter()
+
+    loader = ModelLoader(model_path=model_path, base_model=base_model)
+    loader.device = torch.device("cpu")
+    model, tokenizer = loader.load()
+
+    print("⏳ Merging LoRA weights into the base model...")
+    if isinstance(model, PeftModel):
+        model = model.merge_and_unload()
+    print("✅ LoRA weights merged")
+
+    output = Path(output_path)
+    output.mkdir(parents=True, exist_ok=True)
+
+    print(f"💾 Writing safetensors bundle to: {output}")
+    model.save_pretrained(output, safe_serialization=True)
+    tokenizer.save_pretrained(output)
+
+    manifest = {
+        "format": "merged",
+        "base_model": loader.base_model,
+        "adapter_path": str(model_path),
+        "parameters": model.num_parameters(),
+        "build_seconds": round(time.perf_counter() - start_time, 2),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    with open(output / ARTIFACT_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"✅ Serving artifact ready ({manifest['build_seconds']}s)")
+    return manifest
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Build a merged, memory-mappable serving artifact")
+    parser.add_argument("model_path", help="Directory with the LoRA adapter and tokenizer")
+    parser.add_argument("output_path", help="Directory to write the merged artifact to")
+    parser.add_argument("--base-model", default=BASE_MODEL, help="Base model the adapter was trained on")
+    args = parser.parse_args()
+
+    build_serving_artifact(args.model_path, args.output_path, args.base_model)
+
+
+if __name__ == "__main__":
+    main()
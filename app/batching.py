@@ -0,0 +1,305 @@
+"""
+Micro-Batching Module
+Collects concurrent requests and answers them in batched generate calls
+"""
+
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Tuple
+
+from .cancellation import CancelToken
+
+
+class _PendingRequest:
+    """A queued request waiting for its answer"""
+
+    __slots__ = ("question", "context", "language", "max_length", "adapter", "cancel_token", "enqueued_at", "future")
+
+    def __init__(
+        self,
+        question: str,
+        context: str,
+        language: str,
+        max_length: int,
+        adapter: str = None,
+        cancel_token: CancelToken = None
+    ):
+        self.question = question
+        self.context = context
+        self.language = language
+        self.max_length = max_length
+        self.adapter = adapter
+        self.cancel_token = cancel_token
+        self.enqueued_at = time.perf_counter()
+        self.future = Future()
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler in front of QAInference
+
+    Requests arriving within a short window are grouped by language,
+    max_length and LoRA adapter, padded into a single batched generate call and the answers
+    are fanned back to the waiting callers. Exposes the same
+    answer_question signature as QAInference, so it can be passed anywhere
+    an inference engine is expected (e.g. create_interface). With several
+    workers, batches run in parallel against the same shared model.
+    """
+
+    def __init__(
+        self,
+        inference_engine,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        stats_window: int = 1000,
+        num_workers: int = 1
+    ):
+        """
+        Initialize MicroBatcher
+
+        Args:
+            inference_engine: QAInference instance
+            max_batch_size: Maximum number of requests per generate call
+            max_wait_ms: Maximum time to wait for a batch to fill up
+            stats_window: Number of recent requests kept for wait percentiles
+            num_workers: Worker threads collecting and answering batches
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        self.inference_engine = inference_engine
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.num_workers = num_workers
+
+        self._queue = queue.Queue()
+        self._workers = []
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+
+        self._requests = 0
+        self._batches = 0
+        self._batch_sizes = Counter()
+        self._queue_waits = deque(maxlen=stats_window)
+        self._rejected = Counter()
+
+    def start(self):
+        """Start the background batching workers"""
+        if any(worker.is_alive() for worker in self._workers):
+            return self
+
+        self._stop_event.clear()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"qa-micro-batcher-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers after draining already queued requests"""
+        self._stop_event.set()
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+        self._workers = []
+
+    def answer_question(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        adapter: str = None,
+        cancel_token: CancelToken = None
+    ) -> Tuple[str, str]:
+        """
+        Queue a question and block until its batch has been answered
+
+        Args:
+            question: Question text
+            context: Context/passage text
+            language: "English" or "German"
+            max_length: Maximum answer length
+            adapter: Registered LoRA adapter (None = default)
+            cancel_token: Deadline/cancellation; expired requests are
+                dropped from the queue instead of being generated
+
+        Returns:
+            Tuple of (answer, response_info)
+        """
+        if not question.strip() or not context.strip():
+            return "⚠️ Please provide both a question and context!", ""
+
+        def generate():
+            return self.submit(question, context, language, max_length, adapter, cancel_token).result()
+
+        engine = self.inference_engine
+        key = None
+        if engine.cache is not None:
+            key = engine.cache_key(question, context, language, max_length, adapter=adapter)
+        return engine.respond(generate, context, language, adapter, cancel_token, key)
+
+    def answer_long_context(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        **kwargs
+    ) -> Tuple[str, str]:
+        """Sliding-window requests are already batched; delegate to the engine"""
+        return self.inference_engine.answer_long_context(question, context, language, **kwargs)
+
+    def answer_questions(
+        self,
+        questions: List[str],
+        context: str,
+        language: str = "English",
+        **kwargs
+    ) -> List[Dict[str, str]]:
+        """Multi-question requests are already batched; delegate to the engine"""
+        return self.inference_engine.answer_questions(questions, context, language, **kwargs)
+
+    def stream_answer(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        **kwargs
+    ) -> Iterator[Tuple[str, str]]:
+        """Streaming decodes one request token by token; delegate to the engine"""
+        return self.inference_engine.stream_answer(question, context, language, **kwargs)
+
+    def submit(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        adapter: str = None,
+        cancel_token: CancelToken = None
+    ) -> Future:
+        """
+        Queue a question without blocking
+
+        Returns:
+            Future resolving to the answer text (or raising the generate
+            error, or RequestAborted when the request was cancelled or expired)
+        """
+        if not self._workers:
+            self.start()
+
+        request = _PendingRequest(question, context, language, max_length, adapter, cancel_token)
+        self._queue.put(request)
+        return request.future
+
+    def get_stats(self) -> Dict:
+        """
+        Get batch-size and queue-wait statistics
+
+        Returns:
+            Dictionary of scheduler statistics
+        """
+        with self._stats_lock:
+            waits = sorted(self._queue_waits)
+            sizes = dict(sorted(self._batch_sizes.items()))
+            requests = self._requests
+            batches = self._batches
+            rejected = dict(self._rejected)
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p / 100 * len(waits)))]
+
+        return {
+            "requests": requests,
+            "batches": batches,
+            "avg_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "max_batch_size_seen": max(sizes) if sizes else 0,
+            "batch_size_histogram": sizes,
+            "queue_wait_ms": {
+                "avg": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "p50": round(percentile(50), 2),
+                "p95": round(percentile(95), 2),
+                "max": round(waits[-1], 2) if waits else 0.0
+            },
+            "queue_depth": self._queue.qsize(),
+            "expired_in_queue": rejected.get("expired", 0),
+            "cancelled_in_queue": rejected.get("cancelled", 0),
+            "workers": self.num_workers
+        }
+
+    def _collect_batch(self) -> List[_PendingRequest]:
+        """Block for the first request, then fill the batch until the window closes"""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Worker loop"""
+        while not (self._stop_event.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._process(batch)
+
+    def _process(self, batch: List[_PendingRequest]):
+        """Answer one collected batch, one generate call per language/max_length/adapter group"""
+        started = time.perf_counter()
+
+        groups = {}
+        for request in batch:
+            # Requests whose deadline passed (or whose caller left) while queued are not generated
+            error = request.cancel_token.error() if request.cancel_token is not None else None
+            if error is not None:
+                with self._stats_lock:
+                    self._rejected[error.reason] += 1
+                request.future.set_exception(error)
+                continue
+            groups.setdefault((request.language, request.max_length, request.adapter), []).append(request)
+
+        with self._stats_lock:
+            for request in batch:
+                self._queue_waits.append((started - request.enqueued_at) * 1000)
+
+        for (language, max_length, adapter), requests in groups.items():
+            with self._stats_lock:
+                self._requests += len(requests)
+                self._batches += 1
+                self._batch_sizes[len(requests)] += 1
+
+            try:
+                answers = self.inference_engine.generate_answers(
+                    [r.question for r in requests],
+                    [r.context for r in requests],
+                    language,
+                    max_length,
+                    adapter=adapter,
+                    cancel_tokens=[r.cancel_token for r in requests]
+                )
+            except Exception as e:
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+
+            for request, answer in zip(requests, answers):
+                request.future.set_result(answer)
@@ -0,0 +1,331 @@
+"""
+Benchmark Module
+Reproducible latency, throughput, cold-start and memory benchmarks for the
+inference path, against the real model or a tiny random stand-in
+
+Usage:
+    python -m app.benchmark --tiny --output bench.json
+    python -m app.benchmark models/multilingual_model --output new.json --baseline old.json
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+import torch
+import transformers
+
+from .inference import QAInference
+from .model_loader import ModelLoader
+from .precision import PRECISION_CHECK_SAMPLES
+from .utils import get_memory_usage
+
+
+# Default scenario grid
+BATCH_SIZES = (1, 4, 8)
+BEAM_COUNTS = (1, 4)
+CONTEXT_LENGTHS = (64, 256)  # words
+LANGUAGES = ("English", "German")
+
+# Relative change that counts as a regression when comparing runs
+REGRESSION_THRESHOLD = 0.10
+
+
+def make_workload(language: str, context_words: int, count: int, seed: int = 0) -> List[Dict]:
+    """
+    Build deterministic question/context pairs of a given context length
+
+    Contexts are assembled from the sample passages of that language, so
+    token statistics are realistic and identical across runs.
+
+    Args:
+        language: "English" or "German"
+        context_words: Approximate context length in words
+        count: Number of items
+        seed: Shuffle seed
+
+    Returns:
+        List of items with question, context and language
+    """
+    samples = [s for s in PRECISION_CHECK_SAMPLES if s["language"] == language]
+    words = " ".join(s["context"] for s in samples).split()
+    rng = random.Random(f"{seed}-{language}-{context_words}")
+
+    items = []
+    for i in range(count):
+        sample = samples[i % len(samples)]
+        filler = [words[rng.randrange(len(words))] for _ in range(max(0, context_words - len(sample["context"].split())))]
+        # Every item is distinct so no layer can serve it from a cache
+        context = f"{sample['context']} {' '.join(filler)} ({i})"
+        items.append({"question": sample["question"], "context": context, "language": language})
+    return items
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def run_scenario(
+    inference: QAInference,
+    language: str,
+    context_words: int,
+    batch_size: int,
+    requests: int,
+    warmup: int = 1,
+    seed: int = 0
+) -> Dict:
+    """
+    Time answer_question (batch size 1) or answer_batch calls
+
+    Args:
+        inference: QAInference configured with the scenario's beam count
+        language: Request language
+        context_words: Context length in words
+        batch_size: Items per call
+        requests: Number of timed calls
+        warmup: Untimed calls before measuring
+        seed: Workload seed
+
+    Returns:
+        Latency percentiles per call, throughput and error count
+    """
+    items = make_workload(language, context_words, (warmup + requests) * batch_size, seed)
+    calls = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def call(batch):
+        if batch_size == 1:
+            return [inference.answer_question(batch[0]["question"], batch[0]["context"], language)]
+        return inference.answer_batch(
+            [item["question"] for item in batch],
+            [item["context"] for item in batch],
+            language,
+            batch_size=batch_size
+        )
+
+    for batch in calls[:warmup]:
+        call(batch)
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for batch in calls[warmup:]:
+        start = time.perf_counter()
+        results = call(batch)
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += sum(answer.startswith("❌ Error") for answer, _ in results)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "throughput_items_per_s": round(requests * batch_size / elapsed, 2),
+        "errors": errors,
+        "rss_mb": get_memory_usage()["rss_mb"]
+    }
+
+
+def run_benchmark(
+    model_path: str = None,
+    tiny: bool = False,
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    beam_counts: Sequence[int] = BEAM_COUNTS,
+    context_lengths: Sequence[int] = CONTEXT_LENGTHS,
+    languages: Sequence[str] = LANGUAGES,
+    requests: int = 10,
+    warmup: int = 1,
+    seed: int = 0,
+    threads: int = None
+) -> Dict:
+    """
+    Run the full benchmark grid
+
+    Args:
+        model_path: Model directory for ModelLoader (ignored with tiny)
+        tiny: Benchmark a tiny randomly-initialized mBART instead
+        batch_sizes: Items per call
+        beam_counts: Beam search widths
+        context_lengths: Context lengths in words
+        languages: Request languages
+        requests: Timed calls per scenario
+        warmup: Untimed calls per scenario
+        seed: Seed for weights (tiny) and workloads
+        threads: torch intra-op threads (None = torch default)
+
+    Returns:
+        JSON-serializable results with environment, cold start, scenarios
+        and peak RSS
+    """
+    torch.manual_seed(seed)
+    if threads:
+        torch.set_num_threads(threads)
+
+    if tiny:
+        from .tiny_model import build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(seed=seed, save_path=model_path)
+
+    # Cold start: the same ModelLoader.load path the app uses
+    loader = ModelLoader(model_path=model_path)
+    model, tokenizer = loader.load()
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "transformers": transformers.__version__,
+            "platform": platform.platform(),
+            "torch_threads": torch.get_num_threads(),
+            "device": str(loader.device)
+        },
+        "config": {
+            "model": "tiny" if tiny else model_path,
+            "requests": requests,
+            "warmup": warmup,
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "cold_start": loader.load_stats,
+        "scenarios": {}
+    }
+
+    grid = itertools.product(languages, context_lengths, beam_counts, batch_sizes)
+    for language, context_words, num_beams, batch_size in grid:
+        name = f"{language}/ctx{context_words}/beams{num_beams}/batch{batch_size}"
+        print(f"⏳ {name}")
+        inference = QAInference(model, tokenizer, loader.device, num_beams=num_beams)
+        scenario = run_scenario(inference, language, context_words, batch_size, requests, warmup, seed)
+        scenario.update({
+            "language": language,
+            "context_words": context_words,
+            "num_beams": num_beams,
+            "batch_size": batch_size
+        })
+        results["scenarios"][name] = scenario
+
+    results["peak_rss_mb"] = get_memory_usage()["peak_rss_mb"]
+    return results
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[Dict]:
+    """
+    Flag metrics that got worse by more than threshold (relative)
+
+    Args:
+        baseline: Earlier run_benchmark results
+        current: New run_benchmark results
+        threshold: Allowed relative change, e.g. 0.10 for 10%
+
+    Returns:
+        One entry per regression with the metric, both values and the change
+    """
+    checks = [("cold_start", "load_seconds", baseline.get("cold_start") or {}, current.get("cold_start") or {}, True)]
+    for name, scenario in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            checks.append((name, metric, previous, scenario, True))
+        checks.append((name, "throughput_items_per_s", previous, scenario, False))
+    checks.append(("memory", "peak_rss_mb", baseline, current, True))
+
+    regressions = []
+    for name, metric, old, new, lower_is_better in checks:
+        if not old.get(metric) or new.get(metric) is None:
+            continue
+        change = (new[metric] - old[metric]) / old[metric]
+        if (change if lower_is_better else -change) > threshold:
+            regressions.append({
+                "scenario": name,
+                "metric": metric,
+                "baseline": old[metric],
+                "current": new[metric],
+                "change": round(change, 4)
+            })
+    return regressions
+
+
+def print_results(results: Dict, regressions: List[Dict] = None):
+    """Print benchmark results as a table"""
+    print("\n" + "=" * 80)
+    print("⏱️ BENCHMARK")
+    print("=" * 80)
+    cold_start = results["cold_start"]
+    print(f"Cold start: {cold_start['load_seconds']}s | Peak RSS: {results['peak_rss_mb']} MB")
+    print(f"\n{'Scenario':<36} {'p50':>8} {'p95':>8} {'p99':>8} {'Items/s':>9}")
+    for name, scenario in results["scenarios"].items():
+        print(f"{name:<36} {scenario['p50_ms']:>6.1f}ms {scenario['p95_ms']:>6.1f}ms "
+              f"{scenario['p99_ms']:>6.1f}ms {scenario['throughput_items_per_s']:>9.2f}")
+
+    if regressions is None:
+        return
+    if not regressions:
+        print("\n✅ No regressions against the baseline")
+        return
+    print(f"\n⚠️ {len(regressions)} regression(s) against the baseline:")
+    for regression in regressions:
+        print(f"   {regression['scenario']} {regression['metric']}: "
+              f"{regression['baseline']} → {regression['current']} ({regression['change']:+.1%})")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the QA inference path")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--tiny", action="store_true", help="Use a tiny random mBART instead of model_path")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=list(BATCH_SIZES))
+    parser.add_argument("--beams", nargs="+", type=int, default=list(BEAM_COUNTS))
+    parser.add_argument("--context-lengths", nargs="+", type=int, default=list(CONTEXT_LENGTHS))
+    parser.add_argument("--languages", nargs="+", default=list(LANGUAGES), choices=LANGUAGES)
+    parser.add_argument("--requests", type=int, default=10, help="Timed calls per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed calls per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative change flagged as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        model_path=args.model_path,
+        tiny=args.tiny,
+        batch_sizes=args.batch_sizes,
+        beam_counts=args.beams,
+        context_lengths=args.context_lengths,
+        languages=args.languages,
+        requests=args.requests,
+        warmup=args.warmup,
+        seed=args.seed,
+        threads=args.threads
+    )
+
+    regressions = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), results, args.threshold)
+        results["regressions"] = regressions
+
+    print_results(results, regressions)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Results written to: {args.output}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Answer Cache Module
+Bounded in-memory answer cache with single-flight request coalescing
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+
+from .cancellation import RequestTimeout
+
+
+class AnswerCache:
+    """
+    LRU answer cache with optional TTL and memory cap
+
+    Concurrent requests for the same key share a single computation
+    (single-flight): the first caller runs the generate call, later callers
+    wait for its result instead of starting their own. Failed computations
+    are never cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        max_memory_mb: Optional[float] = None
+    ):
+        """
+        Initialize AnswerCache
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl_seconds: Expire entries after this many seconds (None = never)
+            max_memory_mb: Approximate memory cap for keys and answers
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+
+        self._entries = OrderedDict()  # key -> (value, stored_at, size)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def make_key(
+        question: str,
+        context: str,
+        language: str,
+        max_length: int,
+        **decoding
+    ) -> str:
+        """
+        Build a cache key from the request and its decoding settings
+
+        Args:
+            question: Question text
+            context: Context/passage text
+            language: "English" or "German"
+            max_length: Maximum answer length
+            **decoding: Decoding settings that affect the answer (num_beams, ...)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [question, context, language, max_length, sorted(decoding.items())],
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        """Store a value, evicting least recently used entries as needed"""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], str], timeout: Optional[float] = None) -> str:
+        """
+        Return the cached value or compute it once for all concurrent callers
+
+        Args:
+            key: Cache key from make_key
+            compute: Zero-argument callable producing the value
+            timeout: Longest time a caller waits for another caller's
+                computation of the same key (None = until it finishes)
+
+        Returns:
+            Cached or freshly computed value
+
+        Raises:
+            RequestTimeout: The wait for another caller's computation timed out
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self._hits += 1
+                return value
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                owner = False
+            else:
+                self._misses += 1
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeout:
+                raise RequestTimeout() from None
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, value)
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache counters for sizing
+
+        Returns:
+            Dictionary with hit/miss/eviction counts and current size
+        """
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self._memory_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": round((self._hits + self._coalesced) / lookups, 4) if lookups else 0.0
+            }
+
+    def _lookup(self, key: str):
+        """Find a live entry and mark it recently used (lock must be held)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, stored_at, size = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._memory_bytes -= size
+            self._expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: str):
+        """Insert an entry and enforce the size limits (lock must be held)"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[2]
+
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        self._entries[key] = (value, time.monotonic(), size)
+        self._memory_bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes)
+        ):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._evictions += 1
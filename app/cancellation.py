@@ -0,0 +1,148 @@
+"""
+Cancellation Module
+Per-request deadlines and cancellation tokens, checked before a request
+starts and between decode steps
+"""
+
+import threading
+import time
+from typing import Optional, Sequence
+
+
+class RequestAborted(Exception):
+    """A request was stopped before it produced an answer"""
+
+    reason = "aborted"
+    message = "🚫 Aborted: the request was stopped before it finished"
+
+    def __init__(self, message: str = None):
+        super().__init__(message or self.message)
+        self.message = message or self.message
+
+
+class RequestTimeout(RequestAborted):
+    """The request passed its deadline (while queued or while generating)"""
+
+    reason = "expired"
+    message = "⏱️ Timeout: the request passed its deadline and was stopped"
+
+
+class RequestCancelled(RequestAborted):
+    """The caller abandoned the request"""
+
+    reason = "cancelled"
+    message = "🚫 Cancelled: the request was abandoned before it finished"
+
+
+# Answer text of an aborted request -> exception it stands for
+ABORT_MESSAGES = {error.message: error for error in (RequestTimeout, RequestCancelled)}
+
+
+class CancelToken:
+    """
+    Deadline and cancellation flag shared by a caller and the engine
+
+    The caller sets a timeout and/or calls cancel(); the engine checks
+    done before starting the request and between decode steps, and stops
+    early once it is set. Deadlines use time.monotonic(), which is
+    comparable across forked worker processes.
+    """
+
+    def __init__(self, timeout: float = None, deadline: float = None):
+        """
+        Args:
+            timeout: Seconds from now until the request expires (None = never)
+            deadline: Absolute time.monotonic() deadline (overrides timeout)
+        """
+        if deadline is None and timeout is not None:
+            deadline = time.monotonic() + timeout
+        self.deadline = deadline
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Mark the request as abandoned"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def done(self) -> bool:
+        """The request should stop (cancelled or past its deadline)"""
+        return self.cancelled or self.expired
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline (None without one)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def error(self) -> Optional[RequestAborted]:
+        """The exception describing why the request stopped, or None while it may run"""
+        if self.cancelled:
+            return RequestCancelled()
+        if self.expired:
+            return RequestTimeout()
+        return None
+
+
+def aborted(tokens: Sequence[Optional[CancelToken]]) -> Optional[RequestAborted]:
+    """
+    Check whether a group of requests sharing one generate call should stop
+
+    A group stops only when every request in it is done, so live requests
+    are never cut short by an abandoned neighbour.
+
+    Args:
+        tokens: Token per request (None = the request has no deadline)
+
+    Returns:
+        RequestTimeout if any request expired, RequestCancelled if all were
+        cancelled, None if the group should keep running
+    """
+    if not tokens or any(token is None or not token.done for token in tokens):
+        return None
+    if any(not token.cancelled for token in tokens):
+        return RequestTimeout()
+    return RequestCancelled()
+
+
+def abort_from_answer(answer) -> Optional[RequestAborted]:
+    """The exception an aborted answer text stands for (None for real answers)"""
+    error = ABORT_MESSAGES.get(answer) if isinstance(answer, str) else None
+    return error() if error else None
+
+
+def get_or_compute(cache, key: str, compute, cancel_token: CancelToken = None):
+    """
+    AnswerCache.get_or_compute that does not inherit another caller's abort
+
+    Concurrent identical requests share one computation. A caller waiting
+    for another caller's computation gives up at its own deadline. If that
+    computation belonged to a caller whose deadline passed, the others
+    would receive its RequestAborted; a caller whose own token is still
+    live computes the answer itself instead.
+
+    Args:
+        cache: AnswerCache
+        key: Cache key
+        compute: Zero-argument callable producing the answer
+        cancel_token: Token of this caller (None = no deadline)
+
+    Returns:
+        Cached or freshly computed answer
+    """
+    def remaining():
+        return cancel_token.remaining() if cancel_token is not None else None
+
+    try:
+        return cache.get_or_compute(key, compute, timeout=remaining())
+    except RequestAborted:
+        if cancel_token is not None and cancel_token.done:
+            raise
+        return cache.get_or_compute(key, compute, timeout=remaining())
@@ -0,0 +1,165 @@
+"""
+Cascade Tuning Module
+Sweeps the greedy-acceptance threshold of cascade decoding and reports
+escalation rate, latency and accuracy for each value
+
+Usage:
+    python -m app.cascade models/multilingual_model --budget-ms 150
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Sequence
+
+from .inference import QAInference
+from .model_loader import ModelLoader
+from .precision import PRECISION_CHECK_SAMPLES
+from .utils import exact_match_score, f1_score, is_grounded
+
+
+# Candidate minimum mean token log-probabilities for accepting greedy answers
+DEFAULT_THRESHOLDS = (-0.1, -0.25, -0.5, -1.0, -2.0, -4.0)
+
+
+def decode_tiers(inference: QAInference, samples: List[Dict], max_length: int = 64) -> List[Dict]:
+    """
+    Decode every sample once greedily and once with beam search
+
+    Args:
+        inference: QAInference instance
+        samples: Items with question, context, language and answer
+        max_length: Maximum answer length
+
+    Returns:
+        Per-sample greedy/beam answers, greedy score and latency of each tier
+    """
+    tiers = []
+    for sample in samples:
+        result = {}
+        for tier, num_beams in (("greedy", 1), ("beam", inference.num_beams)):
+            start = time.perf_counter()
+            answers, scores = inference.score_candidates(
+                [sample["question"]], [sample["context"]], sample["language"], num_beams, max_length
+            )
+            result[f"{tier}_ms"] = (time.perf_counter() - start) * 1000
+            result[f"{tier}_answer"] = answers[0]
+            result[f"{tier}_score"] = scores[0]
+        tiers.append(result)
+
+    return tiers
+
+
+def sweep_thresholds(
+    model,
+    tokenizer,
+    device,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    samples: List[Dict] = None,
+    latency_budget_ms: float = None
+) -> Dict:
+    """
+    Simulate cascade decoding for each threshold from one pass per tier
+
+    Args:
+        model: Loaded model
+        tokenizer: Loaded tokenizer
+        device: Torch device
+        thresholds: cascade_min_score values to evaluate
+        samples: QA items (defaults to the precision check samples)
+        latency_budget_ms: Recommend the most accurate threshold whose
+            average latency fits this budget
+
+    Returns:
+        Report with the beam-only baseline, one row per threshold and the
+        recommended threshold
+    """
+    samples = samples or PRECISION_CHECK_SAMPLES
+    inference = QAInference(model, tokenizer, device)
+
+    # Untimed warm-up of both tiers
+    decode_tiers(inference, samples[:1])
+    tiers = decode_tiers(inference, samples)
+
+    def score(answers, latencies):
+        return {
+            "exact_match": round(sum(exact_match_score(a, s["answer"]) for a, s in zip(answers, samples)) / len(samples), 4),
+            "f1": round(sum(f1_score(a, s["answer"]) for a, s in zip(answers, samples)) / len(samples), 4),
+            "avg_latency_ms": round(sum(latencies) / len(latencies), 2)
+        }
+
+    report = {
+        "beam_only": score([t["beam_answer"] for t in tiers], [t["beam_ms"] for t in tiers]),
+        "thresholds": {}
+    }
+
+    for threshold in thresholds:
+        answers, latencies, escalated = [], [], 0
+        for tier, sample in zip(tiers, samples):
+            accepted = is_grounded(tier["greedy_answer"], sample["context"]) and tier["greedy_score"] >= threshold
+            answers.append(tier["greedy_answer"] if accepted else tier["beam_answer"])
+            latencies.append(tier["greedy_ms"] + (0 if accepted else tier["beam_ms"]))
+            escalated += not accepted
+
+        row = score(answers, latencies)
+        row["escalation_rate"] = round(escalated / len(samples), 4)
+        row["speedup"] = round(report["beam_only"]["avg_latency_ms"] / row["avg_latency_ms"], 2)
+        report["thresholds"][threshold] = row
+
+    within_budget = [
+        threshold for threshold, row in report["thresholds"].items()
+        if latency_budget_ms is None or row["avg_latency_ms"] <= latency_budget_ms
+    ]
+    report["recommended_min_score"] = max(
+        within_budget,
+        key=lambda t: (report["thresholds"][t]["f1"], t),
+        default=None
+    )
+    return report
+
+
+def print_report(report: Dict):
+    """Print a threshold sweep as a table"""
+    print("\n" + "=" * 80)
+    print("🪜 CASCADE DECODING")
+    print("=" * 80)
+    print(f"{'Min score':>10} {'Escalated':>10} {'EM':>6} {'F1':>6} {'Latency':>10} {'Speedup':>8}")
+    baseline = report["beam_only"]
+    print(f"{'beam only':>10} {1:>10.2f} {baseline['exact_match']:>6.3f} {baseline['f1']:>6.3f} "
+          f"{baseline['avg_latency_ms']:>8.1f}ms {1:>7.2f}x")
+    for threshold, row in report["thresholds"].items():
+        print(f"{threshold:>10} {row['escalation_rate']:>10.2f} {row['exact_match']:>6.3f} {row['f1']:>6.3f} "
+              f"{row['avg_latency_ms']:>8.1f}ms {row['speedup']:>7.2f}x")
+
+    if report["recommended_min_score"] is None:
+        print("\n⚠️ No threshold fits the latency budget")
+    else:
+        print(f"\n✅ Recommended cascade_min_score: {report['recommended_min_score']}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Tune the cascade decoding threshold")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--thresholds", nargs="+", type=float, default=list(DEFAULT_THRESHOLDS))
+    parser.add_argument("--budget-ms", type=float, default=None, help="Average latency budget per request")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    loader = ModelLoader(model_path=args.model_path, base_model=args.base_model)
+    model, tokenizer = loader.load()
+
+    report = sweep_thresholds(
+        model, tokenizer, loader.device, args.thresholds, latency_budget_ms=args.budget_ms
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
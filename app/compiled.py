@@ -0,0 +1,331 @@
+"""
+Compiled Inference Module
+Opt-in torch.compile of the mBART encoder and decoder, with inputs padded
+to a fixed set of length buckets so compiled graphs are reused instead of
+recompiled for every input length
+
+Usage:
+    python -m app.compiled models/multilingual_model --buckets 32 64 128 256
+    python -m app.compiled --tiny --backend eager
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from typing import Dict, Sequence
+
+import torch
+
+from .inference import LANGUAGE_CODES, MAX_INPUT_LENGTH, NUM_BEAMS, PAD_HOOK, pad_token_ids
+
+
+# Padded input lengths; the largest must cover MAX_INPUT_LENGTH
+LENGTH_BUCKETS = (32, 64, 128, 256)
+
+# torch.compile backend ("inductor" generates fused CPU kernels; "eager" only traces)
+COMPILE_BACKEND = "inductor"
+
+# The encoder and decoder forwards share one transformers wrapper function, and
+# dynamo's per-function recompile limit (default 8) counts the graphs of both.
+# Past the limit it silently runs eager, so it is raised to this many per bucket
+# (about 11 are used: 2 encoder and 9 decoder graphs).
+RECOMPILE_LIMIT_PER_BUCKET = 16
+
+# Batch size 1 is always specialized; batch size 2 compiles the graph with a
+# dynamic batch dimension used by every larger micro-batch
+WARMUP_BATCH_SIZES = (1, 2)
+
+# Decode steps per warm-up call: the first step, the first cached step and the
+# step where the growing cache length becomes dynamic each get their own graph
+WARMUP_NEW_TOKENS = 4
+
+# Timed calls per bucket after warm-up
+STEADY_STATE_RUNS = 3
+
+WARMUP_TEXT = "question: What is it? context: It is a warm-up input for the compiled model."
+
+
+def check_buckets(length_buckets: Sequence[int]) -> tuple:
+    """
+    Validate length buckets
+
+    Args:
+        length_buckets: Padded input lengths
+
+    Returns:
+        Sorted, de-duplicated buckets
+
+    Raises:
+        ValueError: No buckets, a non-positive bucket, or none covering MAX_INPUT_LENGTH
+    """
+    buckets = tuple(sorted(set(length_buckets or ())))
+    if not buckets or buckets[0] < 3:
+        raise ValueError(f"Length buckets must be at least 3 tokens, got {list(length_buckets or ())}")
+    if buckets[-1] < MAX_INPUT_LENGTH:
+        raise ValueError(f"The largest length bucket must cover MAX_INPUT_LENGTH ({MAX_INPUT_LENGTH})")
+    return buckets
+
+
+class _GraphCounter:
+    """torch.compile backend that counts the graphs it compiles"""
+
+    def __init__(self, backend: str):
+        self.backend = torch._dynamo.lookup_backend(backend)
+        self.graphs = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, graph_module, example_inputs):
+        with self._lock:
+            self.graphs += 1
+        return self.backend(graph_module, example_inputs)
+
+
+class CompiledModel:
+    """
+    torch.compile state of a loaded model
+
+    Compiles the encoder and decoder forwards in place, so generate(),
+    saving and the model's other methods are unchanged. The compiled
+    graphs are only reused for inputs padded to the length buckets, so
+    compile() also sets pad_inputs as the model's pad hook
+    (app.inference.PAD_HOOK): every QAInference serving the model then
+    pads to the buckets. revert() removes both.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        device,
+        backend: str = COMPILE_BACKEND,
+        length_buckets: Sequence[int] = LENGTH_BUCKETS,
+        num_beams: int = NUM_BEAMS
+    ):
+        """
+        Args:
+            model: Loaded torch model (optionally wrapped by PEFT)
+            tokenizer: Loaded tokenizer
+            device: Torch device
+            backend: torch.compile backend
+            length_buckets: Padded input lengths
+            num_beams: Beam width served (warmed up next to greedy)
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.backend = backend
+        self.length_buckets = check_buckets(length_buckets)
+        self.num_beams = num_beams
+        self.counters = {}
+        self._saved_limit = None
+        self.warmup_report = None
+        self._warm_graphs = 0
+
+        base = model.get_base_model() if hasattr(model, "get_base_model") else model
+        self.modules = {"encoder": base.get_encoder(), "decoder": base.get_decoder()}
+
+    def compile(self):
+        """Compile the encoder and decoder forwards and install the bucket pad hook"""
+        config = torch._dynamo.config
+        # Named cache_size_limit before torch 2.6
+        limit = "recompile_limit" if hasattr(config, "recompile_limit") else "cache_size_limit"
+        if self._saved_limit is None:
+            self._saved_limit = (limit, getattr(config, limit))
+        setattr(config, limit, max(getattr(config, limit), RECOMPILE_LIMIT_PER_BUCKET * len(self.length_buckets)))
+        for name, module in self.modules.items():
+            self.counters[name] = _GraphCounter(self.backend)
+            module.forward = torch.compile(module.forward, backend=self.counters[name])
+        setattr(self.model, PAD_HOOK, self.pad_inputs)
+
+    def revert(self):
+        """Go back to eager execution, unpadded inputs and the previous dynamo limit"""
+        for module in self.modules.values():
+            module.__dict__.pop("forward", None)
+        self.model.__dict__.pop(PAD_HOOK, None)
+        if self._saved_limit is not None:
+            setattr(torch._dynamo.config, *self._saved_limit)
+            self._saved_limit = None
+        self.counters = {}
+
+    def pad_inputs(self, encoded, pad_id: int, device):
+        """
+        Pad hook: right-pad to the next length bucket and mark the width
+        static, so a compiled encoder keeps one graph per bucket (the batch
+        dimension may still become dynamic). Inputs longer than the largest
+        bucket keep their own width.
+        """
+        width = max(len(ids) for ids in encoded)
+        width = next((bucket for bucket in self.length_buckets if bucket >= width), width)
+        input_ids, attention_mask = pad_token_ids(encoded, pad_id, device, width)
+        torch._dynamo.mark_static(input_ids, 1)
+        torch._dynamo.mark_static(attention_mask, 1)
+        return input_ids, attention_mask
+
+    def graph_counts(self) -> Dict[str, int]:
+        """Graphs compiled so far per module"""
+        return {name: counter.graphs for name, counter in self.counters.items()}
+
+    def warm_up(self) -> Dict:
+        """
+        Compile every bucket ahead of the first request and time it afterwards
+
+        Returns:
+            Per-bucket warm-up seconds, steady-state latency and graphs
+            compiled, plus the totals
+        """
+        buckets = {}
+        start = time.perf_counter()
+        for bucket in self.length_buckets:
+            graphs_before = sum(self.graph_counts().values())
+            bucket_start = time.perf_counter()
+            for batch_size in WARMUP_BATCH_SIZES:
+                for num_beams in sorted({1, self.num_beams}):
+                    self.generate(bucket, batch_size, num_beams)
+            buckets[bucket] = {
+                "warmup_seconds": round(time.perf_counter() - bucket_start, 2),
+                "latency_ms": self.time_bucket(bucket),
+                "graphs": sum(self.graph_counts().values()) - graphs_before
+            }
+
+        self._warm_graphs = sum(self.graph_counts().values())
+        self.warmup_report = {
+            "backend": self.backend,
+            "warmup_seconds": round(time.perf_counter() - start, 2),
+            "buckets": buckets,
+            "graphs": self.graph_counts()
+        }
+        return self.warmup_report
+
+    def generate(self, bucket: int, batch_size: int = 1, num_beams: int = None):
+        """Run one generate call on a synthetic input padded to a bucket"""
+        filler = self.tokenizer(WARMUP_TEXT, add_special_tokens=False)["input_ids"]
+        lang_code = self.tokenizer.convert_tokens_to_ids(LANGUAGE_CODES["English"])
+        ids = [lang_code] + [filler[i % len(filler)] for i in range(bucket - 2)] + [self.tokenizer.eos_token_id]
+        # Shorter items pad the batch, as in a real micro-batch
+        encoded = [ids] + [ids[:max(3, len(ids) // 2)]] * (batch_size - 1)
+        input_ids, attention_mask = self.pad_inputs(encoded, self.tokenizer.pad_token_id, self.device)
+
+        with torch.no_grad():
+            return self.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                num_beams=num_beams or self.num_beams,
+                min_new_tokens=WARMUP_NEW_TOKENS,
+                max_new_tokens=WARMUP_NEW_TOKENS,
+                forced_bos_token_id=lang_code
+            )
+
+    def time_bucket(self, bucket: int, runs: int = STEADY_STATE_RUNS) -> float:
+        """Average latency (ms) of a single-request generate call at a bucket"""
+        start = time.perf_counter()
+        for _ in range(runs):
+            self.generate(bucket)
+        return round(1000 * (time.perf_counter() - start) / runs, 2)
+
+    def get_stats(self) -> Dict:
+        """
+        Get compile statistics
+
+        Returns:
+            Backend, buckets, warm-up report, graphs per module and the
+            recompiles since warm-up (should stay 0 in steady state)
+        """
+        graphs = self.graph_counts()
+        return {
+            "backend": self.backend,
+            "length_buckets": list(self.length_buckets),
+            "warmup": self.warmup_report,
+            "graphs": graphs,
+            "recompiles_after_warmup": sum(graphs.values()) - self._warm_graphs if self.warmup_report else None
+        }
+
+
+def compare_with_eager(
+    model,
+    tokenizer,
+    device,
+    backend: str = COMPILE_BACKEND,
+    length_buckets: Sequence[int] = LENGTH_BUCKETS
+) -> Dict:
+    """
+    Time each bucket in eager mode, then compile, warm up and time it again
+
+    Args:
+        model: Loaded (eager) torch model; compiled in place
+        tokenizer: Loaded tokenizer
+        device: Torch device
+        backend: torch.compile backend
+        length_buckets: Padded input lengths
+
+    Returns:
+        Warm-up report with eager latency and speedup per bucket
+    """
+    compiled = CompiledModel(model, tokenizer, device, backend=backend, length_buckets=length_buckets)
+    eager_ms = {}
+    for bucket in compiled.length_buckets:
+        compiled.generate(bucket)
+        eager_ms[bucket] = compiled.time_bucket(bucket)
+
+    compiled.compile()
+    report = compiled.warm_up()
+    for bucket, result in report["buckets"].items():
+        result["eager_latency_ms"] = eager_ms[bucket]
+        result["speedup"] = round(eager_ms[bucket] / max(result["latency_ms"], 1e-6), 2)
+
+    # Repeat every bucket once more: steady state should not compile anything
+    for bucket in compiled.length_buckets:
+        compiled.generate(bucket)
+    report["recompiles_after_warmup"] = compiled.get_stats()["recompiles_after_warmup"]
+    return report
+
+
+def print_report(report: Dict):
+    """Print a compile report as a table"""
+    print("\n" + "=" * 80)
+    print(f"🔥 TORCH.COMPILE ({report['backend']})")
+    print("=" * 80)
+    print(f"{'Bucket':>6} {'Warm-up':>9} {'Graphs':>7} {'Eager':>10} {'Compiled':>10} {'Speedup':>8}")
+    for bucket, result in report["buckets"].items():
+        print(f"{bucket:>6} {result['warmup_seconds']:>8.1f}s {result['graphs']:>7} "
+              f"{result['eager_latency_ms']:>8.1f}ms {result['latency_ms']:>8.1f}ms {result['speedup']:>7.2f}x")
+    print(f"\n⏱️ Total warm-up: {report['warmup_seconds']}s")
+    print(f"🧩 Graphs: {', '.join(f'{name} {count}' for name, count in report['graphs'].items())}")
+    print(f"🔁 Recompiles after warm-up: {report['recompiles_after_warmup']}")
+
+
+def main():
+    """Command line entry point"""
+    from .model_loader import ModelLoader
+
+    parser = argparse.ArgumentParser(description="Warm up a torch.compile'd model per length bucket and compare with eager")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--buckets", type=int, nargs="+", default=list(LENGTH_BUCKETS))
+    parser.add_argument("--backend", default=COMPILE_BACKEND, help="torch.compile backend")
+    parser.add_argument("--tiny", action="store_true", help="Use a randomly initialized tiny model (smoke test)")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    model_path = args.model_path
+    if args.tiny:
+        from .tiny_model import build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(save_path=model_path)
+
+    loader = ModelLoader(model_path=model_path, base_model=args.base_model)
+    model, tokenizer = loader.load()
+
+    report = compare_with_eager(model, tokenizer, loader.device, args.backend, args.buckets)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
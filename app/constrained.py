@@ -0,0 +1,200 @@
+"""
+Constrained Decoding Module
+Restricts generation to token spans of the context, so every extractive
+answer is a substring of its passage
+
+Usage:
+    python -m app.constrained models/multilingual_model --output constrained_report.json
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+
+class ContextSpanIndex:
+    """
+    Token trie over every span of a tokenized context
+
+    Nodes are created lazily: the end positions matching a generated prefix
+    are derived from the positions of its parent, so a step costs time
+    proportional to the number of matches rather than the context length.
+    """
+
+    def __init__(self, token_ids: Sequence[int]):
+        """
+        Initialize ContextSpanIndex
+
+        Args:
+            token_ids: Context token ids (without special tokens)
+        """
+        self.token_ids = list(token_ids)
+
+        starts = defaultdict(list)
+        for position, token in enumerate(self.token_ids):
+            starts[token].append(position)
+        self._starts = dict(starts)
+
+        # prefix -> context positions where a match of that prefix ends
+        self._ends: Dict[Tuple[int, ...], List[int]] = {}
+
+    def next_tokens(self, prefix: Tuple[int, ...]) -> List[int]:
+        """
+        Tokens that extend prefix to a longer span of the context
+
+        Args:
+            prefix: Tokens generated so far
+
+        Returns:
+            Allowed next tokens (empty if prefix is not a span or cannot grow)
+        """
+        if not prefix:
+            return list(self._starts)
+
+        last = len(self.token_ids) - 1
+        return list({self.token_ids[end + 1] for end in self._match(prefix) if end < last})
+
+    def _match(self, prefix: Tuple[int, ...]) -> List[int]:
+        ends = self._ends.get(prefix)
+        if ends is not None:
+            return ends
+
+        if len(prefix) == 1:
+            ends = self._starts.get(prefix[0], [])
+        else:
+            token = prefix[-1]
+            ends = [
+                end + 1 for end in self._match(prefix[:-1])
+                if end + 1 < len(self.token_ids) and self.token_ids[end + 1] == token
+            ]
+        self._ends[prefix] = ends
+        return ends
+
+
+class ContextConstraint:
+    """
+    prefix_allowed_tokens_fn for model.generate
+
+    Decoder sequences look like [decoder_start, lang_code, answer..., eos].
+    The first answer token must start a context span, every later token must
+    continue it, and EOS is allowed once at least one token was generated.
+    When no longer span exists only EOS remains, which ends the beam early.
+    """
+
+    def __init__(
+        self,
+        context_token_ids: Sequence[Sequence[int]],
+        lang_code: int,
+        eos_token_id: int,
+        prompt_length: int = 2
+    ):
+        """
+        Initialize ContextConstraint
+
+        Args:
+            context_token_ids: Context token ids, one list per batch item
+            lang_code: Forced language BOS token
+            eos_token_id: End of sequence token
+            prompt_length: Decoder tokens before the answer (start + lang_code)
+        """
+        # Items sharing a context share one index (and its memoized matches)
+        shared = {}
+        for ids in context_token_ids:
+            key = tuple(ids)
+            if key not in shared:
+                shared[key] = ContextSpanIndex(ids)
+        self.indexes = [shared[tuple(ids)] for ids in context_token_ids]
+        self.lang_code = lang_code
+        self.eos_token_id = eos_token_id
+        self.prompt_length = prompt_length
+
+    def __call__(self, batch_id: int, input_ids) -> List[int]:
+        ids = input_ids.tolist()
+        if len(ids) < self.prompt_length:
+            return [self.lang_code]
+
+        prefix = tuple(ids[self.prompt_length:])
+        allowed = self.indexes[batch_id].next_tokens(prefix)
+        if prefix or not allowed:
+            allowed.append(self.eos_token_id)
+        return allowed
+
+
+def compare_decoding(model, tokenizer, device, samples: List[Dict] = None) -> Dict[str, Dict]:
+    """
+    Answer a sample set with unconstrained and context-constrained decoding
+
+    Args:
+        model: Loaded model
+        tokenizer: Loaded tokenizer
+        device: Torch device
+        samples: QA items (defaults to the precision check samples)
+
+    Returns:
+        Report per mode with EM/F1, answer length, extractive rate and speedup
+    """
+    from .inference import QAInference
+    from .precision import PRECISION_CHECK_SAMPLES, run_samples
+
+    samples = samples or PRECISION_CHECK_SAMPLES
+
+    report = {}
+    for mode, constrained in (("unconstrained", False), ("constrained", True)):
+        print(f"⏳ Decoding {mode}...")
+        inference = QAInference(model, tokenizer, device, constrained_decoding=constrained)
+        result = run_samples(inference, samples)
+        predictions = result["predictions"]
+
+        result["avg_answer_tokens"] = sum(
+            len(ids) for ids in tokenizer(predictions, add_special_tokens=False)["input_ids"]
+        ) / len(samples)
+        result["extractive_rate"] = sum(
+            bool(p.strip()) and p.strip() in s["context"] for p, s in zip(predictions, samples)
+        ) / len(samples)
+        result["speedup"] = report["unconstrained"]["avg_latency_ms"] / result["avg_latency_ms"] if report else 1.0
+
+        report[mode] = {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in result.items()
+        }
+
+    return report
+
+
+def print_report(report: Dict[str, Dict]):
+    """Print a decoding comparison as a table"""
+    print("\n" + "=" * 80)
+    print("🔒 CONTEXT-CONSTRAINED DECODING")
+    print("=" * 80)
+    print(f"{'Mode':<14} {'EM':>6} {'F1':>6} {'Extractive':>11} {'Tokens':>7} {'Latency':>10} {'Speedup':>8}")
+    for mode, result in report.items():
+        print(f"{mode:<14} {result['exact_match']:>6.3f} {result['f1']:>6.3f} "
+              f"{result['extractive_rate']:>11.2f} {result['avg_answer_tokens']:>7.1f} "
+              f"{result['avg_latency_ms']:>8.1f}ms {result['speedup']:>7.2f}x")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Compare unconstrained and context-constrained decoding")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    from .model_loader import ModelLoader
+
+    loader = ModelLoader(model_path=args.model_path, base_model=args.base_model)
+    model, tokenizer = loader.load()
+
+    report = compare_decoding(model, tokenizer, loader.device)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
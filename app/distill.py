@@ -0,0 +1,429 @@
+"""
+Distillation Module
+Builds a shallow-decoder student (same encoder, a few decoder layers copied
+from the teacher), trains it on the teacher's answers and saves it as a
+serving artifact that ModelLoader loads as a drop-in
+
+Usage:
+    python -m app.distill models/multilingual_model models/distilled_model --train data/squad_train.json --eval data/squad_dev.json
+    python -m app.distill --tiny --output distill_report.json
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import torch
+
+from .inference import MAX_INPUT_LENGTH, QAInference
+from .model_loader import ARTIFACT_MANIFEST, BASE_MODEL, ModelLoader
+from .precision import PRECISION_CHECK_SAMPLES, model_size_mb, run_samples
+from .utils import exact_match_score, f1_score
+
+
+# Decoder layers kept in the student
+STUDENT_DECODER_LAYERS = 3
+
+# Weight of the cross-entropy on teacher answers (the rest is logit distillation)
+CE_WEIGHT = 0.5
+
+# Softmax temperature for logit distillation
+TEMPERATURE = 2.0
+
+
+def select_layers(teacher_layers: int, student_layers: int) -> List[int]:
+    """
+    Evenly spaced teacher decoder layers to initialize the student from
+
+    The first and last layers are always included (e.g. 12 → 3 keeps
+    layers 0, 6 and 11), which keeps the input and output representations
+    the rest of the model expects.
+
+    Args:
+        teacher_layers: Decoder layers of the teacher
+        student_layers: Decoder layers of the student
+
+    Returns:
+        Teacher layer indices in order
+    """
+    if not 1 <= student_layers <= teacher_layers:
+        raise ValueError(f"student_layers must be between 1 and {teacher_layers}")
+    if student_layers == 1:
+        return [teacher_layers - 1]
+    return [round(i * (teacher_layers - 1) / (student_layers - 1)) for i in range(student_layers)]
+
+
+def build_student(teacher, decoder_layers: int = STUDENT_DECODER_LAYERS, layer_map: Sequence[int] = None):
+    """
+    Copy the teacher and keep only some of its decoder layers
+
+    Args:
+        teacher: Merged (non-PEFT) MBartForConditionalGeneration
+        decoder_layers: Decoder layers of the student
+        layer_map: Teacher layer per student layer (default: select_layers)
+
+    Returns:
+        Student model sharing no tensors with the teacher
+    """
+    layer_map = list(layer_map or select_layers(teacher.config.decoder_layers, decoder_layers))
+    student = copy.deepcopy(teacher)
+    layers = student.model.decoder.layers
+    student.model.decoder.layers = torch.nn.ModuleList([layers[i] for i in layer_map])
+
+    # Attention modules index the KV cache by layer
+    for index, layer in enumerate(student.model.decoder.layers):
+        for module in layer.modules():
+            if hasattr(module, "layer_idx"):
+                module.layer_idx = index
+
+    student.config.decoder_layers = len(layer_map)
+    return student
+
+
+def load_items(paths: Sequence[str], language: str = "English", limit: int = None) -> List[Dict]:
+    """
+    Read QA items (JSONL or SQuAD/XQuAD JSON) with their first gold answer
+
+    Args:
+        paths: Data files
+        language: Language of items that do not name one
+        limit: Maximum items per file
+
+    Returns:
+        Items with question, context, language and answer ("" if none)
+    """
+    from .offline import iter_items
+
+    items = []
+    for path in paths:
+        for item in itertools.islice(iter_items(path, language), limit):
+            items.append(dict(item, answer=item["answers"][0] if item["answers"] else ""))
+    return items
+
+
+def _training_batches(teacher_engine, items: List[Dict], answers: List[str], batch_size: int,
+                      max_length: int, max_input_length: int, seed: int):
+    """Padded (input_ids, attention_mask, decoder_input_ids, labels) batches in shuffled order"""
+    tokenizer = teacher_engine.tokenizer
+    pad_id = tokenizer.pad_token_id
+    eos_id = tokenizer.eos_token_id
+
+    inputs = teacher_engine.encode_inputs(
+        [item["question"] for item in items],
+        [item["context"] for item in items],
+        [item["language"] for item in items],
+        max_input_length
+    )
+    # Target format of generate: [decoder start] [language code] answer </s>;
+    # every input starts with its language code
+    answer_ids = tokenizer(answers, add_special_tokens=False)["input_ids"]
+    targets = [
+        [input_ids[0]] + ids[:max_length - 3] + [eos_id]
+        for input_ids, ids in zip(inputs, answer_ids)
+    ]
+
+    order = list(range(len(items)))
+    random.Random(seed).shuffle(order)
+    for start in range(0, len(order), batch_size):
+        members = order[start:start + batch_size]
+        width = max(len(inputs[i]) for i in members)
+        target_width = max(len(targets[i]) for i in members)
+        yield (
+            torch.tensor([inputs[i] + [pad_id] * (width - len(inputs[i])) for i in members]),
+            torch.tensor([[1] * len(inputs[i]) + [0] * (width - len(inputs[i])) for i in members]),
+            torch.tensor([[eos_id] + targets[i][:-1] + [pad_id] * (target_width - len(targets[i])) for i in members]),
+            torch.tensor([targets[i] + [-100] * (target_width - len(targets[i])) for i in members])
+        )
+
+
+def distill(
+    teacher,
+    tokenizer,
+    student,
+    items: List[Dict],
+    epochs: int = 3,
+    batch_size: int = 8,
+    learning_rate: float = 1e-4,
+    ce_weight: float = CE_WEIGHT,
+    temperature: float = TEMPERATURE,
+    max_length: int = 64,
+    max_input_length: int = MAX_INPUT_LENGTH,
+    freeze_encoder: bool = True,
+    seed: int = 0
+) -> Dict:
+    """
+    Train the student on the teacher's answers (sequence-level distillation)
+    and on the teacher's token distributions (logit distillation)
+
+    The teacher answers every training item once with the serving decoding
+    settings; those answers are the student's targets. At each step the
+    loss is ce_weight x cross-entropy on the teacher answer plus
+    (1 - ce_weight) x KL divergence to the teacher's softened logits.
+
+    Args:
+        teacher: Merged teacher model
+        tokenizer: Shared tokenizer
+        student: Student from build_student (trained in place)
+        items: Training items with question, context and language
+        epochs: Passes over the items
+        batch_size: Items per optimizer step
+        learning_rate: AdamW learning rate
+        ce_weight: Weight of the cross-entropy term
+        temperature: Softmax temperature of the distillation term
+        max_length: Maximum answer length (teacher decoding and targets)
+        max_input_length: Token limit of the model input
+        freeze_encoder: Keep the encoder and shared embeddings identical
+            to the teacher and train only the decoder
+        seed: Shuffling seed
+
+    Returns:
+        Training statistics (loss per epoch, seconds, trainable parameters)
+    """
+    device = next(teacher.parameters()).device
+    teacher_engine = QAInference(teacher, tokenizer, device)
+
+    print(f"⏳ Teacher answering {len(items):,} training items...")
+    answers = [
+        answer for answer, _ in teacher_engine.answer_batch(
+            [item["question"] for item in items],
+            [item["context"] for item in items],
+            [item["language"] for item in items],
+            max_length=max_length,
+            max_input_length=max_input_length
+        )
+    ]
+    answers = ["" if answer.startswith(("❌", "⚠️")) else answer for answer in answers]
+
+    for parameter in student.parameters():
+        parameter.requires_grad = not freeze_encoder
+    if freeze_encoder:
+        shared = student.get_input_embeddings().weight
+        for parameter in student.model.decoder.parameters():
+            if parameter is not shared:
+                parameter.requires_grad = True
+    trainable = [parameter for parameter in student.parameters() if parameter.requires_grad]
+    optimizer = torch.optim.AdamW(trainable, lr=learning_rate)
+
+    start_time = time.perf_counter()
+    epoch_losses = []
+    student.train()
+    for epoch in range(epochs):
+        losses = []
+        for input_ids, attention_mask, decoder_input_ids, labels in _training_batches(
+            teacher_engine, items, answers, batch_size, max_length, max_input_length, seed + epoch
+        ):
+            input_ids, attention_mask = input_ids.to(device), attention_mask.to(device)
+            decoder_input_ids, labels = decoder_input_ids.to(device), labels.to(device)
+            mask = labels != -100
+
+            logits = student(
+                input_ids=input_ids, attention_mask=attention_mask, decoder_input_ids=decoder_input_ids
+            ).logits
+            loss = ce_weight * torch.nn.functional.cross_entropy(logits[mask], labels[mask])
+
+            if ce_weight < 1:
+                with torch.no_grad():
+                    teacher_logits = teacher(
+                        input_ids=input_ids, attention_mask=attention_mask, decoder_input_ids=decoder_input_ids
+                    ).logits
+                loss = loss + (1 - ce_weight) * temperature ** 2 * torch.nn.functional.kl_div(
+                    (logits[mask] / temperature).log_softmax(dim=-1),
+                    (teacher_logits[mask] / temperature).log_softmax(dim=-1),
+                    log_target=True,
+                    reduction="batchmean"
+                )
+
+            optimizer.zero_grad()
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(trainable, 1.0)
+            optimizer.step()
+            losses.append(loss.item())
+
+        epoch_losses.append(round(sum(losses) / len(losses), 4))
+        print(f"📉 Epoch {epoch + 1}/{epochs}: loss {epoch_losses[-1]}")
+    student.eval()
+
+    return {
+        "items": len(items),
+        "epochs": epochs,
+        "loss_per_epoch": epoch_losses,
+        "train_seconds": round(time.perf_counter() - start_time, 2),
+        "trainable_parameters": sum(parameter.numel() for parameter in trainable)
+    }
+
+
+def build_distilled_model(
+    model_path: str,
+    output_path: str,
+    train_items: List[Dict],
+    eval_items: List[Dict] = None,
+    base_model: str = None,
+    decoder_layers: int = STUDENT_DECODER_LAYERS,
+    **train_kwargs
+) -> Dict:
+    """
+    Distill a shallow-decoder student, save it and compare it to the teacher
+
+    Args:
+        model_path: Teacher (LoRA adapter or merged artifact directory)
+        output_path: Directory for the student artifact
+        train_items: Training items (gold answers are not needed)
+        eval_items: Items with gold answers for EM/F1 (defaults to the
+            precision check samples)
+        base_model: Base model the teacher adapter was trained on
+        decoder_layers: Decoder layers of the student
+        **train_kwargs: Passed to distill (epochs, batch_size, ...)
+
+    Returns:
+        Report with training statistics and teacher/student EM, F1,
+        agreement, latency and size
+    """
+    from peft import PeftModel
+
+    eval_items = eval_items or PRECISION_CHECK_SAMPLES
+
+    loader = ModelLoader(model_path=model_path, base_model=base_model)
+    teacher, tokenizer = loader.load()
+    if isinstance(teacher, PeftModel):
+        teacher = teacher.merge_and_unload()
+
+    layer_map = select_layers(teacher.config.decoder_layers, decoder_layers)
+    print(f"🎓 Student decoder: teacher layers {layer_map} of {teacher.config.decoder_layers}")
+    student = build_student(teacher, layer_map=layer_map)
+    training = distill(teacher, tokenizer, student, train_items, **train_kwargs)
+
+    output = Path(output_path)
+    output.mkdir(parents=True, exist_ok=True)
+    student.save_pretrained(output, safe_serialization=True)
+    tokenizer.save_pretrained(output)
+    manifest = {
+        "format": "distilled",
+        "base_model": loader.base_model,
+        "teacher_path": str(model_path),
+        "decoder_layers": len(layer_map),
+        "teacher_decoder_layers": teacher.config.decoder_layers,
+        "layer_map": layer_map,
+        "training": training,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    with open(output / ARTIFACT_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    del student
+
+    print("⏳ Comparing teacher and student...")
+    teacher_result = run_samples(QAInference(teacher, tokenizer, loader.device), eval_items)
+    teacher_result["model_size_mb"] = model_size_mb(teacher)
+    del teacher
+
+    # Evaluate the saved artifact the way serving loads it
+    student_loader = ModelLoader(model_path=output_path)
+    student, student_tokenizer = student_loader.load()
+    student_result = run_samples(QAInference(student, student_tokenizer, student_loader.device), eval_items)
+    student_result["model_size_mb"] = model_size_mb(student)
+
+    pairs = list(zip(student_result["predictions"], teacher_result["predictions"]))
+    student_result["agreement_em"] = sum(exact_match_score(s, t) for s, t in pairs) / len(pairs)
+    student_result["agreement_f1"] = sum(f1_score(s, t) for s, t in pairs) / len(pairs)
+    student_result["speedup"] = teacher_result["avg_latency_ms"] / student_result["avg_latency_ms"]
+
+    def rounded(result):
+        return {key: round(value, 4) if isinstance(value, float) else value for key, value in result.items()}
+
+    return {
+        "output_path": str(output_path),
+        "layer_map": layer_map,
+        "training": training,
+        "eval_items": len(eval_items),
+        "teacher": rounded(teacher_result),
+        "student": rounded(student_result)
+    }
+
+
+def print_report(report: Dict):
+    """Print a distillation report as a table"""
+    teacher, student = report["teacher"], report["student"]
+    training = report["training"]
+    print("\n" + "=" * 80)
+    print("🎓 SHALLOW-DECODER DISTILLATION")
+    print("=" * 80)
+    print(f"Student decoder layers: {report['layer_map']} | {training['items']:,} items x {training['epochs']} epochs "
+          f"in {training['train_seconds']}s | loss {training['loss_per_epoch'][0]} → {training['loss_per_epoch'][-1]}")
+    print(f"\n{'Model':<9} {'EM':>6} {'F1':>6} {'Latency':>10} {'Speedup':>8} {'Size MB':>9}")
+    for name, result in (("Teacher", teacher), ("Student", student)):
+        print(f"{name:<9} {result['exact_match']:>6.3f} {result['f1']:>6.3f} {result['avg_latency_ms']:>8.1f}ms "
+              f"{result.get('speedup', 1.0):>7.2f}x {result['model_size_mb']:>9.1f}")
+    print(f"\nStudent vs teacher answers: EM {student['agreement_em']:.3f} | F1 {student['agreement_f1']:.3f} "
+          f"({report['eval_items']} eval items)")
+    print(f"💾 Student artifact: {report['output_path']} (load with ModelLoader(model_path=...))")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Distill a shallow-decoder student from the QA model")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model",
+                        help="Teacher: LoRA adapter or merged artifact directory")
+    parser.add_argument("output_path", nargs="?", default="models/distilled_model")
+    parser.add_argument("--train", nargs="+", default=[], help="Training data (JSONL or SQuAD/XQuAD JSON)")
+    parser.add_argument("--eval", nargs="+", default=[], help="Evaluation data with gold answers")
+    parser.add_argument("--language", default="English", choices=("English", "German"),
+                        help="Language of items that do not name one")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum items per data file")
+    parser.add_argument("--base-model", default=BASE_MODEL, help="Base model the teacher adapter was trained on")
+    parser.add_argument("--decoder-layers", type=int, default=STUDENT_DECODER_LAYERS)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--learning-rate", type=float, default=None, help="Default: 1e-4 (1e-3 with --tiny)")
+    parser.add_argument("--ce-weight", type=float, default=CE_WEIGHT,
+                        help="Cross-entropy weight (1 disables logit distillation)")
+    parser.add_argument("--temperature", type=float, default=TEMPERATURE)
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--train-encoder", action="store_true", help="Also update the encoder and embeddings")
+    parser.add_argument("--tiny", action="store_true", help="Distill a tiny random 4-layer mBART on CPU")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    model_path, output_path = args.model_path, args.output_path
+    train_items = load_items(args.train, args.language, args.limit)
+    eval_items = load_items(args.eval, args.language, args.limit) or None
+    learning_rate = args.learning_rate or (1e-3 if args.tiny else 1e-4)
+    if args.tiny:
+        from .tiny_model import build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(layers=4, save_path=model_path)
+        output_path = tempfile.mkdtemp(prefix="tiny_student_")
+        train_items = train_items or [dict(item, id=str(i)) for i, item in enumerate(PRECISION_CHECK_SAMPLES)]
+    if not train_items:
+        parser.error("--train is required (or use --tiny)")
+
+    report = build_distilled_model(
+        model_path,
+        output_path,
+        train_items,
+        eval_items,
+        base_model=args.base_model,
+        decoder_layers=args.decoder_layers,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=learning_rate,
+        ce_weight=args.ce_weight,
+        temperature=args.temperature,
+        max_length=args.max_length,
+        freeze_encoder=not args.train_encoder
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Evaluation Module
+Batched evaluation over SQuAD/XQuAD-style files with EM, F1, BLEU and ROUGE,
+process-parallel scoring and a per-item prediction cache
+
+Usage:
+    python -m app.evaluation --english squad_dev.json --german xquad.de.json
+    python -m app.evaluation models/merged_model --german xquad.de.json --precision int8
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .utils import EVAL_RESULTS_PATH, exact_match_score, f1_score
+
+
+# Prediction/score cache next to the results by default
+EVAL_CACHE_PATH = "results/eval_cache.jsonl"
+
+# Items generated (and sent to the scoring pool) at a time
+CHUNK_SIZE = 256
+
+# Per-item metrics averaged per language (BLEU is computed over the corpus)
+ITEM_METRICS = ("exact_match", "f1", "rouge1", "rouge2", "rougeL")
+
+_rouge_scorer = None
+
+
+def _score_items(pairs: List[Tuple[str, List[str]]]) -> List[Dict[str, float]]:
+    """
+    Score predictions against their references (runs in a worker process)
+
+    Each metric takes the best score over the references, as in the
+    official SQuAD evaluation.
+    """
+    global _rouge_scorer
+    if _rouge_scorer is None:
+        from rouge_score import rouge_scorer
+
+        _rouge_scorer = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"])
+
+    scores = []
+    for prediction, references in pairs:
+        rouge = _rouge_scorer.score_multi(references, prediction)
+        scores.append({
+            "exact_match": max(exact_match_score(prediction, reference) for reference in references),
+            "f1": max(f1_score(prediction, reference) for reference in references),
+            **{name: score.fmeasure for name, score in rouge.items()}
+        })
+    return scores
+
+
+def corpus_bleu(predictions: Sequence[str], references: Sequence[List[str]]) -> float:
+    """
+    Corpus BLEU (sacrebleu, 0-100) with a variable number of references per item
+
+    Args:
+        predictions: One prediction per item
+        references: Reference answers per item
+
+    Returns:
+        BLEU score
+    """
+    import sacrebleu
+
+    width = max((len(refs) for refs in references), default=1)
+    streams = [[refs[i] if i < len(refs) else None for refs in references] for i in range(width)]
+    return sacrebleu.corpus_bleu(list(predictions), streams).score
+
+
+def content_hash(*parts) -> str:
+    """Stable hash of JSON-serializable parts"""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def load_cache(cache_path: str) -> Dict[str, Dict]:
+    """
+    Load the prediction cache (append-only JSONL; the last record per key wins)
+
+    Args:
+        cache_path: Cache file (missing = empty cache)
+
+    Returns:
+        Prediction key -> {prediction, references_key, scores}
+    """
+    cache = {}
+    if not os.path.exists(cache_path):
+        return cache
+    with open(cache_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial line from an interrupted run
+            cache[record.pop("key")] = record
+    return cache
+
+
+def _chunks(items: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def evaluate_datasets(
+    inference,
+    datasets: Sequence[Tuple[str, str]],
+    model_id: str,
+    cache_path: str = EVAL_CACHE_PATH,
+    max_length: int = 64,
+    batch_size: int = 16,
+    chunk_size: int = CHUNK_SIZE,
+    processes: Optional[int] = None,
+    limit: Optional[int] = None
+) -> Dict:
+    """
+    Evaluate the model on SQuAD/XQuAD-style files
+
+    Items are streamed through answer_batch chunk by chunk. Scoring of a
+    chunk runs in a process pool while the next chunk is generated.
+    Predictions are cached under a hash of the model id, decoding settings,
+    question, context and language; scores additionally depend on the
+    references, so a rerun only generates and scores items that changed.
+
+    Args:
+        inference: QAInference instance
+        datasets: (path, language) pairs, JSONL or SQuAD-format JSON
+        model_id: Identifies the model/adapter/precision in cache keys
+        cache_path: Prediction cache (None disables caching)
+        max_length: Maximum answer length
+        batch_size: Items per generate call
+        chunk_size: Items per generation/scoring round
+        processes: Scoring processes (None = CPU count, 1 = in-process)
+        limit: Evaluate at most this many items per file
+
+    Returns:
+        Results with per-language metrics (same keys as PERFORMANCE_DATA)
+        and generation/scoring/cache statistics
+    """
+    from .offline import iter_items
+
+    settings = {
+        "max_length": max_length,
+        "num_beams": inference.num_beams,
+        "constrained": inference.constrained_decoding,
+        "cascade_min_score": inference.cascade_min_score if inference.cascade else None
+    }
+    cache = load_cache(cache_path) if cache_path else {}
+    if cache_path:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    cache_file = open(cache_path, "a", encoding="utf-8") if cache_path else None
+
+    processes = processes or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+
+    per_language: Dict[str, Dict] = {}
+    stats = {"items": 0, "generated": 0, "scored": 0, "unscored": 0, "errors": 0,
+             "generate_seconds": 0.0, "score_wait_seconds": 0.0}
+    pending: List[Tuple[Future, List[Tuple[Dict, str, str, str]]]] = []
+
+    def record(item, prediction, scores):
+        totals = per_language.setdefault(item["language"], {
+            "items": 0, "predictions": [], "references": [], **{name: 0.0 for name in ITEM_METRICS}
+        })
+        totals["items"] += 1
+        totals["predictions"].append(prediction)
+        totals["references"].append(item["answers"])
+        for name in ITEM_METRICS:
+            totals[name] += scores[name]
+
+    def collect(future: Future, entries):
+        start = time.perf_counter()
+        scores_list = future.result()
+        stats["score_wait_seconds"] += time.perf_counter() - start
+        for (item, key, references_key, prediction), scores in zip(entries, scores_list):
+            record(item, prediction, scores)
+            if cache_file is not None:
+                cache[key] = {"prediction": prediction, "references_key": references_key, "scores": scores}
+                cache_file.write(json.dumps({"key": key, **cache[key]}, ensure_ascii=False) + "\n")
+
+    try:
+        for path, language in datasets:
+            items = itertools.islice(iter_items(path, language), limit)
+            for chunk in _chunks(items, chunk_size):
+                stats["items"] += len(chunk)
+                keyed = []
+                for item in chunk:
+                    if not item["answers"]:
+                        stats["unscored"] += 1
+                        continue
+                    key = content_hash(model_id, settings, item["question"], item["context"], item["language"])
+                    keyed.append((item, key, content_hash(item["answers"])))
+
+                # Generate predictions that are not cached
+                missing = [entry for entry in keyed if entry[1] not in cache]
+                predictions = {}
+                if missing:
+                    start = time.perf_counter()
+                    answers = inference.answer_batch(
+                        [item["question"] for item, _, _ in missing],
+                        [item["context"] for item, _, _ in missing],
+                        [item["language"] for item, _, _ in missing],
+                        max_length=max_length,
+                        batch_size=batch_size
+                    )
+                    stats["generate_seconds"] += time.perf_counter() - start
+                    stats["generated"] += len(missing)
+                    for (_, key, _), (answer, _) in zip(missing, answers):
+                        predictions[key] = answer
+
+                # Reuse cached scores when the references are unchanged
+                to_score = []
+                for item, key, references_key in keyed:
+                    if key in predictions:
+                        prediction = predictions[key]
+                    elif cache[key]["references_key"] == references_key:
+                        record(item, cache[key]["prediction"], cache[key]["scores"])
+                        continue
+                    else:
+                        prediction = cache[key]["prediction"]
+                    if prediction.startswith(("❌", "⚠️")):
+                        # Failed generations score zero and are retried next run
+                        stats["errors"] += 1
+                        record(item, "", dict.fromkeys(ITEM_METRICS, 0.0))
+                        continue
+                    to_score.append((item, key, references_key, prediction))
+
+                if to_score:
+                    stats["scored"] += len(to_score)
+                    pairs = [(prediction, item["answers"]) for item, _, _, prediction in to_score]
+                    if pool is None:
+                        future = Future()
+                        future.set_result(_score_items(pairs))
+                    else:
+                        future = pool.submit(_score_items, pairs)
+                    pending.append((future, to_score))
+
+                # Collect finished scoring rounds without waiting on the rest
+                while pending and pending[0][0].done():
+                    collect(*pending.pop(0))
+
+        for future, entries in pending:
+            collect(future, entries)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if cache_file is not None:
+            cache_file.close()
+
+    languages = {}
+    for language, totals in per_language.items():
+        count = totals["items"]
+        exact_match = totals["exact_match"] / count
+        f1 = totals["f1"] / count
+        languages[language] = {
+            "BLEU": round(corpus_bleu(totals["predictions"], totals["references"]), 2),
+            "ROUGE-1": round(totals["rouge1"] / count, 4),
+            "ROUGE-2": round(totals["rouge2"] / count, 4),
+            "ROUGE-L": round(totals["rougeL"] / count, 4),
+            "Exact Match": round(exact_match, 4),
+            "F1 Score": round(f1, 4),
+            "Avg (EM+F1)": round((exact_match + f1) / 2, 4),
+            "Items": count
+        }
+
+    stats["cache_hits"] = stats["items"] - stats["unscored"] - stats["generated"]
+    stats["generate_seconds"] = round(stats["generate_seconds"], 2)
+    stats["score_wait_seconds"] = round(stats["score_wait_seconds"], 2)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "model": model_id,
+        "datasets": [{"path": path, "language": language} for path, language in datasets],
+        "languages": languages,
+        "stats": stats
+    }
+
+
+def print_report(results: Dict):
+    """Print evaluation results as a table"""
+    print("\n" + "=" * 80)
+    print("📊 EVALUATION")
+    print("=" * 80)
+    print(f"{'Language':<10} {'Items':>7} {'EM':>7} {'F1':>7} {'BLEU':>7} {'R-1':>7} {'R-2':>7} {'R-L':>7}")
+    for language, metrics in results["languages"].items():
+        print(f"{language:<10} {metrics['Items']:>7} {metrics['Exact Match']:>7.4f} {metrics['F1 Score']:>7.4f} "
+              f"{metrics['BLEU']:>7.2f} {metrics['ROUGE-1']:>7.4f} {metrics['ROUGE-2']:>7.4f} {metrics['ROUGE-L']:>7.4f}")
+
+    stats = results["stats"]
+    print(f"\n🗄️ {stats['cache_hits']} cached, {stats['generated']} generated, {stats['scored']} scored, "
+          f"{stats['errors']} errors, {stats['unscored']} without references")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Evaluate the QA model on SQuAD/XQuAD-style files")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--backend", default="torch", choices=("torch", "onnx"))
+    parser.add_argument("--precision", default="fp32", choices=("fp32", "bf16", "int8"))
+    parser.add_argument("--tiny", action="store_true", help="Evaluate a tiny random mBART (for testing)")
+    parser.add_argument("--english", nargs="*", default=[], help="English evaluation files")
+    parser.add_argument("--german", nargs="*", default=[], help="German evaluation files")
+    parser.add_argument("--num-beams", type=int, default=4)
+    parser.add_argument("--constrained", action="store_true", help="Use context-constrained decoding")
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=None, help="Scoring processes (default: CPU count)")
+    parser.add_argument("--limit", type=int, default=None, help="Evaluate at most this many items per file")
+    parser.add_argument("--cache", default=EVAL_CACHE_PATH, help="Prediction cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Regenerate and rescore every item")
+    parser.add_argument("--output", default=EVAL_RESULTS_PATH,
+                        help="Results file (loaded by the Performance Metrics tab)")
+    args = parser.parse_args()
+
+    datasets = [(path, "English") for path in args.english] + [(path, "German") for path in args.german]
+    if not datasets:
+        parser.error("pass at least one --english or --german file")
+
+    from .inference import QAInference
+    from .model_loader import ModelLoader
+
+    model_path = args.model_path
+    if args.tiny:
+        import tempfile
+        from .tiny_model import build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(save_path=model_path)
+
+    loader = ModelLoader(
+        model_path=model_path,
+        base_model=args.base_model,
+        precision=args.precision,
+        backend=args.backend
+    )
+    model, tokenizer = loader.load()
+    inference = QAInference(
+        model, tokenizer, loader.device,
+        num_beams=args.num_beams,
+        constrained_decoding=args.constrained
+    )
+
+    results = evaluate_datasets(
+        inference,
+        datasets,
+        model_id="tiny" if args.tiny else f"{os.path.abspath(args.model_path)}|{loader.base_model}|{args.backend}|{args.precision}",
+        cache_path=None if args.no_cache else args.cache,
+        max_length=args.max_length,
+        batch_size=args.batch_size,
+        processes=args.processes,
+        limit=args.limit
+    )
+    print_report(results)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,146 @@ Inference Module
 Handles question answering predictions
 """
 
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
 import torch
-from typing import Tuple
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from .cancellation import CancelToken, RequestAborted, aborted, get_or_compute
+from .constrained import ContextConstraint
+from .metrics import InferenceHooks
+from .utils import is_grounded
+
+
+# mBART-50 language codes for the supported UI languages
+LANGUAGE_CODES = {
+    "English": "en_XX",
+    "German": "de_DE"
+}
+
+# Token limit for the combined "question: ... context: ..." input
+MAX_INPUT_LENGTH = 256
+
+# Beam search width used for generation
+NUM_BEAMS = 4
+
+# Cascade decoding: minimum mean token log-probability for accepting a greedy answer
+CASCADE_MIN_SCORE = -1.0
+
+# Model attribute holding a padding function that replaces the default
+# right-padding (set by app.compiled.CompiledModel.compile for length buckets)
+PAD_HOOK = "qa_pad_inputs"
+
+
+def pad_token_ids(
+    encoded: List[List[int]],
+    pad_id: int,
+    device,
+    width: int = None
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Right-pad token id lists into input_ids and attention_mask tensors
+
+    Args:
+        encoded: Token id lists
+        pad_id: Padding token id
+        device: Torch device of the tensors
+        width: Padded length (None = the longest list)
+
+    Returns:
+        Tuple of (input_ids, attention_mask)
+    """
+    width = width or max(len(ids) for ids in encoded)
+    input_ids = torch.tensor(
+        [ids + [pad_id] * (width - len(ids)) for ids in encoded],
+        dtype=torch.long,
+        device=device
+    )
+    attention_mask = torch.tensor(
+        [[1] * len(ids) + [0] * (width - len(ids)) for ids in encoded],
+        dtype=torch.long,
+        device=device
+    )
+    return input_ids, attention_mask
+
+
+class _TokenStream:
+    """
+    Streamer for model.generate that hands generated token ids to the
+    thread consuming the answer
+    """
+    
+    def __init__(self):
+        self.error = None
+        self._queue = queue.Queue()
+        self._prompt = True
+    
+    def put(self, value):
+        # The first call carries the decoder start token, not generated tokens
+        if self._prompt:
+            self._prompt = False
+            return
+        self._queue.put(value.reshape(-1).tolist())
+    
+    def end(self):
+        self._queue.put(None)
+    
+    def fail(self, error: BaseException):
+        self.error = error
+        self._queue.put(None)
+    
+    def __iter__(self) -> Iterator[List[int]]:
+        while True:
+            token_ids = self._queue.get()
+            if token_ids is None:
+                return
+            yield token_ids
+
+
+class _DeadlineCriteria:
+    """
+    Stopping criterion for model.generate: ends the call between decode
+    steps once every request in the batch is cancelled or past its deadline
+    """
+    
+    def __init__(self, cancel_tokens: Sequence[CancelToken]):
+        self.cancel_tokens = cancel_tokens
+        self.triggered = False
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        stop = aborted(self.cancel_tokens) is not None
+        self.triggered = self.triggered or stop
+        return torch.full((input_ids.shape[0],), stop, dtype=torch.bool, device=input_ids.device)
 
 
 class QAInference:
-    """Handles question answering inference"""
+    """
+    Handles question answering inference
+    
+    Thread-safe: per-language settings are resolved once at construction
+    and passed to every generate call, so the shared model and tokenizer
+    are never mutated and several threads can answer concurrently.
+    Switching to a non-default LoRA adapter is the exception; the
+    AdapterRegistry serializes those generate calls.
+    """
     
-    def __init__(self, model, tokenizer, device):
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        device,
+        cache=None,
+        constrained_decoding: bool = False,
+        cascade: bool = False,
+        cascade_min_score: float = CASCADE_MIN_SCORE,
+        num_beams: int = NUM_BEAMS,
+        hooks: Sequence[InferenceHooks] = None,
+        adapters=None
+    ):
         """
         Initialize QA Inference
         
@@ -18,17 +150,52 @@ class QAInference:
             model: Loaded model
             tokenizer: Loaded tokenizer
             device: Torch device
+            cache: Optional AnswerCache for repeated requests
+            constrained_decoding: Only generate token spans of the context
+                (see app.constrained), so answers are always extractive
+            cascade: Decode greedily first and escalate to beam search only
+                when the greedy answer fails the grounding test or scores
+                below cascade_min_score
+            cascade_min_score: Minimum mean token log-probability of an
+                accepted greedy answer
+            num_beams: Beam search width (1 = greedy)
+            hooks: InferenceHooks receiving per-stage timings and counters
+                (e.g. app.metrics.MetricsCollector)
+            adapters: Optional AdapterRegistry (app.adapters) with extra LoRA
+                adapters that requests can select by name
         """
         self.model = model
         self.tokenizer = tokenizer
         self.device = device
+        self.cache = cache
+        self.constrained_decoding = constrained_decoding
+        self.cascade = cascade
+        self.cascade_min_score = cascade_min_score
+        self.num_beams = num_beams
+        self.hooks = list(hooks or [])
+        self.adapters = adapters
+        
+        # Cascade counters and per-tier generate latencies
+        self._cascade_lock = threading.Lock()
+        self._cascade_items = 0
+        self._cascade_escalated = 0
+        self._tier_latencies = {"greedy": deque(maxlen=1000), "beam": deque(maxlen=1000)}
+        
+        # Per-language state, built once and only read afterwards
+        self.language_code_ids = {
+            language: tokenizer.convert_tokens_to_ids(code)
+            for language, code in LANGUAGE_CODES.items()
+        }
+        self.model.eval()
         
     def answer_question(
         self, 
         question: str, 
         context: str, 
         language: str = "English",
-        max_length: int = 64
+        max_length: int = 64,
+        adapter: str = None,
+        cancel_token: CancelToken = None
     ) -> Tuple[str, str]:
         """
         Generate answer for given question and context
@@ -38,6 +205,10 @@ class QAInference:
             context: Context/passage text
             language: "English" or "German"
             max_length: Maximum answer length
+            adapter: Registered LoRA adapter to answer with (None = default)
+            cancel_token: Deadline/cancellation checked before and during
+                generation; an aborted request returns the timeout (or
+                cancellation) message instead of an answer
             
         Returns:
             Tuple of (answer, response_info)
@@ -45,57 +216,1007 @@ class QAInference:
         if not question.strip() or not context.strip():
             return "⚠️ Please provide both a question and context!", ""
         
+        def generate():
+            return self.generate_answers(
+                [question], [context], language, max_length, adapter=adapter,
+                cancel_tokens=[cancel_token] if cancel_token else None
+            )[0]
+        
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(question, context, language, max_length, adapter=adapter)
+        return self.respond(generate, context, language, adapter, cancel_token, key)
+    
+    def respond(
+        self,
+        generate: Callable[[], str],
+        context: str,
+        language: str = "English",
+        adapter: str = None,
+        cancel_token: CancelToken = None,
+        cache_key: str = None
+    ) -> Tuple[str, str]:
+        """
+        Answer one request with a generate callable: cache, hooks and errors
+        
+        Shared by answer_question and the engines in front of it
+        (MicroBatcher, PreforkServer), whose generate callables wait for
+        their queued request instead of generating in place.
+        
+        Args:
+            generate: Zero-argument callable returning the answer text
+            context: Context/passage text (for the response details)
+            language: "English" or "German"
+            adapter: LoRA adapter the answer comes from (None = default)
+            cancel_token: Deadline of a caller waiting for an identical
+                request in flight (see app.cancellation.get_or_compute)
+            cache_key: Key from cache_key() to answer from the cache with
+                single-flight (None = always generate)
+            
+        Returns:
+            Tuple of (answer, response_info); the timeout, cancellation or
+            error message and "" when the request did not produce an answer
+        """
+        start_time = time.perf_counter()
         try:
-            # Configure language
-            if language == "English":
-                self.tokenizer.src_lang = "en_XX"
-                self.tokenizer.tgt_lang = "en_XX"
-                lang_code = self.tokenizer.lang_code_to_id["en_XX"]
+            if self.cache is not None and cache_key is not None:
+                answer = get_or_compute(self.cache, cache_key, generate, cancel_token)
             else:
-                self.tokenizer.src_lang = "de_DE"
-                self.tokenizer.tgt_lang = "de_DE"
-                lang_code = self.tokenizer.lang_code_to_id["de_DE"]
-            
-            self.model.config.forced_bos_token_id = lang_code
-            
-            # Prepare input
-            input_text = f"question: {question} context: {context}"
-            inputs = self.tokenizer(
-                input_text,
-                max_length=256,
-                truncation=True,
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # Generate answer
-            self.model.eval()
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_length=max_length,
-                    num_beams=4,
-                    early_stopping=True,
-                    forced_bos_token_id=lang_code
+                answer = generate()
+            return answer, self.build_response_info(answer, context, language, self.adapter_details(adapter))
+            
+        except RequestAborted as e:
+            self.notify("on_abort", e.reason, language)
+            return e.message, ""
+        except Exception as e:
+            self.notify("on_error", e, language)
+            return f"❌ Error: {str(e)}", ""
+        finally:
+            self.notify("on_request", language, time.perf_counter() - start_time)
+    
+    def stream_answer(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        adapter: str = None,
+        cancel_token: CancelToken = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Generate an answer token by token
+        
+        Beam search only knows its answer at the end, so streaming decodes
+        greedily (with context constraints when enabled). Generation runs on
+        a helper thread; every new token yields the partial answer. The time
+        until the first answer text appears is reported to the hooks as the
+        "first_token" stage, the whole request as "request" as usual.
+        Closing the generator early (the client went away) cancels the
+        generate call at its next decode step.
+        
+        Args:
+            question: Question text
+            context: Context/passage text
+            language: "English" or "German"
+            max_length: Maximum answer length
+            adapter: Registered LoRA adapter to answer with (None = default)
+            cancel_token: Deadline/cancellation checked between decode steps
+            
+        Yields:
+            (partial answer, "") while generating, then (answer, response_info)
+        """
+        if not question.strip() or not context.strip():
+            yield "⚠️ Please provide both a question and context!", ""
+            return
+        
+        start_time = time.perf_counter()
+        cancel_token = cancel_token or CancelToken()
+        try:
+            key = None
+            if self.cache is not None:
+                key = self.cache_key(question, context, language, max_length, adapter=adapter, greedy=True)
+                answer = self.cache.get(key)
+                if answer is not None:
+                    self.notify("on_stage", "first_token", time.perf_counter() - start_time)
+                    yield answer, self.build_response_info(answer, context, language, self.adapter_details(adapter))
+                    return
+            
+            encoded = self._encode([self._format_input(question, context)], [language], MAX_INPUT_LENGTH)
+            streamer = _TokenStream()
+            generated = []
+            
+            def generate():
+                # end() in finally: a backend that never drives the streamer must not leave the consumer waiting
+                try:
+                    answers, _ = self._generate_batch(
+                        encoded, self._language_code_id(language), max_length, 1, False, [context], adapter,
+                        cancel_tokens=[cancel_token], streamer=streamer
+                    )
+                    generated.extend(answers)
+                except Exception as e:
+                    streamer.fail(e)
+                finally:
+                    streamer.end()
+            
+            worker = threading.Thread(target=generate, name="qa-stream", daemon=True)
+            worker.start()
+            
+            token_ids = []
+            answer = ""
+            for new_ids in streamer:
+                token_ids.extend(new_ids)
+                partial = self.tokenizer.decode(token_ids, skip_special_tokens=True)
+                if partial == answer:
+                    continue
+                if not answer:
+                    self.notify("on_stage", "first_token", time.perf_counter() - start_time)
+                answer = partial
+                yield answer, ""
+            worker.join()
+            if streamer.error is not None:
+                raise streamer.error
+            
+            # Without streamed tokens the answer arrives here in one chunk
+            if generated[0] and not answer:
+                self.notify("on_stage", "first_token", time.perf_counter() - start_time)
+            answer = generated[0]
+            
+            if self.cache is not None:
+                self.cache.put(key, answer)
+            yield answer, self.build_response_info(answer, context, language, self.adapter_details(adapter))
+            
+        except GeneratorExit:
+            cancel_token.cancel()
+            raise
+        except RequestAborted as e:
+            self.notify("on_abort", e.reason, language)
+            yield e.message, ""
+        except Exception as e:
+            self.notify("on_error", e, language)
+            yield f"❌ Error: {str(e)}", ""
+        finally:
+            self.notify("on_request", language, time.perf_counter() - start_time)
+    
+    def answer_batch(
+        self,
+        questions: List[str],
+        contexts: List[str],
+        languages: Union[str, List[str]] = "English",
+        max_length: int = 64,
+        batch_size: int = 16,
+        max_input_length: int = MAX_INPUT_LENGTH,
+        adapter: str = None,
+        cancel_tokens: Sequence[CancelToken] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Answer a list of questions with length-bucketed batched generation
+        
+        All inputs are tokenized in one tokenizer call, sorted by language and
+        token length so each generate batch holds similarly sized inputs
+        (minimal padding), and results are restored to input order.
+        
+        Args:
+            questions: Question texts
+            contexts: Context texts (same length as questions)
+            languages: One language for all items or one per item
+            max_length: Maximum answer length
+            batch_size: Maximum items per generate call
+            max_input_length: Token limit for "question: ... context: ..."
+            adapter: Registered LoRA adapter for every item (None = default)
+            cancel_tokens: Token per item; items already done are rejected
+                and a generate batch stops once all of its items are done
+            
+        Returns:
+            List of (answer, response_info) tuples in input order
+        """
+        if len(questions) != len(contexts):
+            raise ValueError("questions and contexts must have the same length")
+        if cancel_tokens is not None and len(cancel_tokens) != len(questions):
+            raise ValueError("cancel_tokens must match the number of questions")
+        if isinstance(languages, str):
+            languages = [languages] * len(questions)
+        elif len(languages) != len(questions):
+            raise ValueError("languages must be a string or match the number of questions")
+        
+        start_time = time.perf_counter()
+        results = [None] * len(questions)
+        valid = []
+        keys = {}
+        for i, (question, context) in enumerate(zip(questions, contexts)):
+            if not question.strip() or not context.strip():
+                results[i] = ("⚠️ Please provide both a question and context!", "")
+                continue
+            
+            error = cancel_tokens[i].error() if cancel_tokens and cancel_tokens[i] else None
+            if error is not None:
+                self.notify("on_abort", error.reason, languages[i])
+                results[i] = (error.message, "")
+                continue
+            
+            if self.cache is not None:
+                keys[i] = self.cache_key(
+                    question, context, languages[i], max_length, max_input_length, adapter
                 )
+                answer = self.cache.get(keys[i])
+                if answer is not None:
+                    results[i] = (answer, self.build_response_info(
+                        answer, context, languages[i], self.adapter_details(adapter)
+                    ))
+                    continue
             
-            answer = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            valid.append(i)
+        
+        if not valid:
+            return self._record_batch(results, languages, start_time)
+        
+        try:
+            encoded = self._encode(
+                [self._format_input(questions[i], contexts[i]) for i in valid],
+                [languages[i] for i in valid],
+                max_input_length
+            )
+        except Exception as e:
+            for i in valid:
+                self.notify("on_error", e, languages[i])
+                results[i] = (f"❌ Error: {str(e)}", "")
+            return self._record_batch(results, languages, start_time)
+        
+        # Bucket by language, then token length, so padding waste stays small
+        order = sorted(
+            range(len(valid)),
+            key=lambda k: (languages[valid[k]], len(encoded[k]))
+        )
+        
+        batches = []
+        for k in order:
+            language = languages[valid[k]]
+            if batches and batches[-1][0] == language and len(batches[-1][1]) < batch_size:
+                batches[-1][1].append(k)
+            else:
+                batches.append((language, [k]))
+        
+        for language, members in batches:
+            try:
+                answers = self._generate_from_ids(
+                    [encoded[k] for k in members],
+                    language,
+                    max_length,
+                    contexts=[contexts[valid[k]] for k in members],
+                    adapter=adapter,
+                    cancel_tokens=[cancel_tokens[valid[k]] for k in members] if cancel_tokens else None
+                )
+            except RequestAborted as e:
+                for k in members:
+                    self.notify("on_abort", e.reason, language)
+                    results[valid[k]] = (e.message, "")
+                continue
+            except Exception as e:
+                for k in members:
+                    self.notify("on_error", e, language)
+                    results[valid[k]] = (f"❌ Error: {str(e)}", "")
+                continue
             
-            # Calculate confidence
-            confidence = self._calculate_confidence(answer, context)
+            for k, answer in zip(members, answers):
+                i = valid[k]
+                if self.cache is not None:
+                    self.cache.put(keys[i], answer)
+                results[i] = (
+                    answer,
+                    self.build_response_info(answer, contexts[i], languages[i], self.adapter_details(adapter))
+                )
+        
+        return self._record_batch(results, languages, start_time)
+    
+    def _record_batch(self, results: List[Tuple[str, str]], languages: List[str], start_time: float):
+        """Report every answered batch item to the hooks and return the results"""
+        elapsed = time.perf_counter() - start_time
+        for (answer, _), language in zip(results, languages):
+            if not answer.startswith("⚠️"):
+                self.notify("on_request", language, elapsed)
+        return results
+    
+    def answer_long_context(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        window_size: int = MAX_INPUT_LENGTH,
+        stride: int = 64,
+        batch_size: int = 16,
+        cancel_token: CancelToken = None
+    ) -> Tuple[str, str]:
+        """
+        Answer over a long context using overlapping token windows
+        
+        The context is split into windows that each fit window_size tokens
+        together with the question. All windows are decoded in batches and
+        the best candidate is chosen by preferring answers found in their
+        window (the grounding check) and then the highest beam score.
+        
+        Args:
+            question: Question text
+            context: Context/passage text of any length
+            language: "English" or "German"
+            max_length: Maximum answer length
+            window_size: Token limit for each "question: ... context: ..." input
+            stride: Number of context tokens shared by consecutive windows
+            batch_size: Maximum windows per generate call
+            cancel_token: Deadline/cancellation checked before and during
+                every window batch; an aborted request returns the timeout
+                (or cancellation) message instead of an answer
             
-            # Format response info
-            response_info = f"""
+        Returns:
+            Tuple of (answer, response_info)
+        """
+        if not question.strip() or not context.strip():
+            return "⚠️ Please provide both a question and context!", ""
+        
+        start_time = time.perf_counter()
+        try:
+            windows = self._split_windows(question, context, language, window_size, stride)
+            
+            answers, scores = [], []
+            for start in range(0, len(windows), batch_size):
+                batch = windows[start:start + batch_size]
+                batch_answers, batch_scores = self._generate_from_ids(
+                    [ids for ids, _ in batch],
+                    language,
+                    max_length,
+                    return_scores=True,
+                    contexts=[text for _, text in batch],
+                    cancel_tokens=[cancel_token] * len(batch) if cancel_token else None
+                )
+                answers.extend(batch_answers)
+                scores.extend(batch_scores)
+            
+            def rank(i):
+                answer = answers[i].strip()
+                grounded = is_grounded(answer, windows[i][1])
+                return grounded, bool(answer), scores[i]
+            
+            best = max(range(len(windows)), key=rank)
+            answer = answers[best]
+            details = {
+                "Windows Evaluated": len(windows),
+                "Best Window": best + 1
+            }
+            return answer, self.build_response_info(answer, context, language, details)
+            
+        except RequestAborted as e:
+            self.notify("on_abort", e.reason, language)
+            return e.message, ""
+        except Exception as e:
+            self.notify("on_error", e, language)
+            return f"❌ Error: {str(e)}", ""
+        finally:
+            self.notify("on_request", language, time.perf_counter() - start_time)
+    
+    def _split_windows(
+        self,
+        question: str,
+        context: str,
+        language: str,
+        window_size: int,
+        stride: int
+    ) -> List[Tuple[List[int], str]]:
+        """
+        Build overlapping model inputs covering the whole context
+        
+        Args:
+            question: Question text
+            context: Context/passage text
+            language: "English" or "German"
+            window_size: Token limit for each model input
+            stride: Context tokens shared by consecutive windows
+            
+        Returns:
+            List of (input_ids, window_text) pairs in context order
+        """
+        with self._timed("tokenize"):
+            question_ids, prefix_ids, context_ids = self.tokenizer(
+                [f"question: {question}", "context:", context],
+                add_special_tokens=False
+            )["input_ids"]
+        
+        span = window_size - 2 - len(question_ids) - len(prefix_ids)
+        if span <= stride:
+            raise ValueError(
+                f"window_size={window_size} leaves {span} context tokens per window; "
+                f"increase it or use a stride below {span}"
+            )
+        
+        lang_code = self._language_code_id(language)
+        eos_id = self.tokenizer.eos_token_id
+        
+        windows = []
+        start = 0
+        while True:
+            window_ids = context_ids[start:start + span]
+            windows.append((
+                [lang_code] + question_ids + prefix_ids + window_ids + [eos_id],
+                self.tokenizer.decode(window_ids, skip_special_tokens=True)
+            ))
+            if start + span >= len(context_ids):
+                break
+            start += span - stride
+        
+        self.notify("on_encode", len(windows), sum(len(ids) for ids, _ in windows), 0)
+        return windows
+    
+    def answer_questions(
+        self,
+        questions: List[str],
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        max_input_length: int = MAX_INPUT_LENGTH,
+        cancel_token: CancelToken = None
+    ) -> List[Dict[str, str]]:
+        """
+        Answer several questions about one context in a single batched generation
+        
+        The context is tokenized once and its token ids are reused to
+        assemble every "question: ... context: ..." input.
+        
+        Args:
+            questions: Question texts (blank entries are skipped)
+            context: Context/passage text shared by all questions
+            language: "English" or "German"
+            max_length: Maximum answer length
+            max_input_length: Token limit for each model input
+            cancel_token: Deadline/cancellation checked before and during
+                the batched generation
+            
+        Returns:
+            One row per question with "Question", "Answer" and "Confidence"
+            (a failed or aborted generation gives every uncached question
+            the error or timeout message as answer and no confidence)
+        """
+        questions = [question.strip() for question in questions if question.strip()]
+        if not questions or not context.strip():
+            return []
+        
+        start_time = time.perf_counter()
+        try:
+            answers, failed = self._answer_shared_context(
+                questions, context, language, max_length, max_input_length, cancel_token
+            )
+            with self._timed("confidence"):
+                return [
+                    {
+                        "Question": question,
+                        "Answer": answers[question],
+                        "Confidence": (
+                            "" if question in failed else self._calculate_confidence(answers[question], context)
+                        )
+                    }
+                    for question in questions
+                ]
+        finally:
+            self.notify("on_request", language, time.perf_counter() - start_time)
+    
+    def _answer_shared_context(
+        self,
+        questions: List[str],
+        context: str,
+        language: str,
+        max_length: int,
+        max_input_length: int,
+        cancel_token: CancelToken = None
+    ) -> Tuple[Dict[str, str], set]:
+        """
+        Answer unique questions about one context, from the cache or one batched generation
+        
+        Returns:
+            Answer per question and the questions whose generation failed
+            or was aborted
+        """
+        answers = {}
+        pending = []
+        keys = {}
+        for question in dict.fromkeys(questions):
+            if self.cache is not None:
+                keys[question] = self.cache_key(
+                    question, context, language, max_length, max_input_length
+                )
+                answer = self.cache.get(keys[question])
+                if answer is not None:
+                    answers[question] = answer
+                    continue
+            pending.append(question)
+        
+        if not pending:
+            return answers, set()
+        
+        try:
+            # Tokenize the shared context once, questions in one call
+            with self._timed("tokenize"):
+                context_ids = self.tokenizer(
+                    f"context: {context}", add_special_tokens=False
+                )["input_ids"]
+                question_ids = self.tokenizer(
+                    [f"question: {question}" for question in pending],
+                    add_special_tokens=False
+                )["input_ids"]
+            
+            lang_code = self._language_code_id(language)
+            eos_id = self.tokenizer.eos_token_id
+            encoded = [
+                [lang_code] + (ids + context_ids)[:max_input_length - 2] + [eos_id]
+                for ids in question_ids
+            ]
+            self.notify(
+                "on_encode",
+                len(encoded),
+                sum(len(ids) for ids in encoded),
+                sum(len(ids) + len(context_ids) > max_input_length - 2 for ids in question_ids)
+            )
+            
+            generated = self._generate_from_ids(
+                encoded, language, max_length, contexts=[context] * len(encoded),
+                cancel_tokens=[cancel_token] * len(encoded) if cancel_token else None
+            )
+        except RequestAborted as e:
+            self.notify("on_abort", e.reason, language)
+            answers.update((question, e.message) for question in pending)
+            return answers, set(pending)
+        except Exception as e:
+            self.notify("on_error", e, language)
+            answers.update((question, f"❌ Error: {str(e)}") for question in pending)
+            return answers, set(pending)
+        
+        for question, answer in zip(pending, generated):
+            answers[question] = answer
+            if self.cache is not None:
+                self.cache.put(keys[question], answer)
+        return answers, set()
+    
+    def generate_answers(
+        self,
+        questions: List[str],
+        contexts: List[str],
+        language: str = "English",
+        max_length: int = 64,
+        max_input_length: int = MAX_INPUT_LENGTH,
+        adapter: str = None,
+        cancel_tokens: Sequence[CancelToken] = None
+    ) -> List[str]:
+        """
+        Run one padded, batched generate call for same-language inputs
+        
+        Args:
+            questions: Question texts
+            contexts: Context texts (same length as questions)
+            language: "English" or "German"
+            max_length: Maximum answer length
+            max_input_length: Token limit for "question: ... context: ..."
+            adapter: Registered LoRA adapter (None = default)
+            cancel_tokens: Token per input (see _generate_batch)
+            
+        Returns:
+            Decoded answers in input order
+            
+        Raises:
+            RequestAborted: Every input was cancelled or expired
+        """
+        input_texts = [
+            self._format_input(question, context)
+            for question, context in zip(questions, contexts)
+        ]
+        encoded = self._encode(input_texts, [language] * len(input_texts), max_input_length)
+        return self._generate_from_ids(
+            encoded, language, max_length, contexts=contexts, adapter=adapter, cancel_tokens=cancel_tokens
+        )
+    
+    def encode_inputs(
+        self,
+        questions: List[str],
+        contexts: List[str],
+        languages: Sequence[str],
+        max_input_length: int = MAX_INPUT_LENGTH
+    ) -> List[List[int]]:
+        """
+        Token ids of the model inputs, as generation sees them
+        
+        Args:
+            questions: Question texts
+            contexts: Context texts (same length as questions)
+            languages: Language of each input
+            max_input_length: Token limit for "question: ... context: ..."
+            
+        Returns:
+            One id list per input: [language code] question and context </s>
+        """
+        input_texts = [self._format_input(question, context) for question, context in zip(questions, contexts)]
+        return self._encode(input_texts, list(languages), max_input_length)
+    
+    def score_candidates(
+        self,
+        questions: List[str],
+        contexts: List[str],
+        language: str = "English",
+        num_beams: int = None,
+        max_length: int = 64
+    ) -> Tuple[List[str], List[float]]:
+        """
+        Answer same-language inputs with one generate call at a given beam
+        width and score the answers, bypassing the cache and the cascade
+        
+        Args:
+            questions: Question texts
+            contexts: Context texts (same length as questions)
+            language: "English" or "German"
+            num_beams: Beam width (None = the engine's; 1 = greedy)
+            max_length: Maximum answer length
+            
+        Returns:
+            Answers and their length-normalized scores (the beam score, or
+            the mean token log-probability for greedy)
+        """
+        encoded = self.encode_inputs(questions, contexts, [language] * len(questions))
+        return self._generate_batch(
+            encoded, self._language_code_id(language), max_length, num_beams or self.num_beams, True, contexts
+        )
+    
+    def cache_key(
+        self,
+        question: str,
+        context: str,
+        language: str,
+        max_length: int,
+        max_input_length: int = MAX_INPUT_LENGTH,
+        adapter: str = None,
+        greedy: bool = False
+    ) -> str:
+        """
+        Build the answer cache key, including the decoding settings
+        
+        Args:
+            question: Question text
+            context: Context/passage text
+            language: "English" or "German"
+            max_length: Maximum answer length
+            max_input_length: Token limit for the model input
+            adapter: LoRA adapter the answer comes from (None = default)
+            greedy: Key for a greedy answer (streaming) instead of the
+                configured beam search / cascade
+            
+        Returns:
+            Cache key string
+        """
+        return self.cache.make_key(
+            question,
+            context,
+            language,
+            max_length,
+            num_beams=1 if greedy else self.num_beams,
+            early_stopping=True,
+            max_input_length=max_input_length,
+            constrained=self.constrained_decoding,
+            cascade_min_score=self.cascade_min_score if self.cascade and not greedy else None,
+            adapter=adapter
+        )
+    
+    def notify(self, event: str, *args):
+        """Call an InferenceHooks event on every registered hook"""
+        for hook in self.hooks:
+            getattr(hook, event)(*args)
+    
+    def adapter_details(self, adapter: str = None) -> Dict[str, str]:
+        """Response detail line naming a non-default adapter"""
+        return {"Adapter": adapter} if adapter else None
+    
+    def _use_adapter(self, adapter: str = None):
+        """Context activating a registered adapter around one generate call"""
+        if self.adapters is not None:
+            return self.adapters.use(adapter)
+        if adapter is not None:
+            raise ValueError(f"Unknown adapter '{adapter}' (no adapters registered)")
+        return nullcontext()
+    
+    @contextmanager
+    def _timed(self, stage: str):
+        """Time a block and report it to the hooks as a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.hooks:
+                self.notify("on_stage", stage, time.perf_counter() - start)
+    
+    def _language_code_id(self, language: str) -> int:
+        """Token id of the mBART language code (unknown languages fall back to German)"""
+        return self.language_code_ids.get(language, self.language_code_ids["German"])
+    
+    @staticmethod
+    def _format_input(question: str, context: str) -> str:
+        """Build the model input text for a question/context pair"""
+        return f"question: {question} context: {context}"
+    
+    def _encode(
+        self,
+        input_texts: List[str],
+        languages: List[str],
+        max_input_length: int
+    ) -> List[List[int]]:
+        """
+        Tokenize a list of inputs in a single tokenizer call
+        
+        Special tokens are added by hand in the mBART-50 source format
+        ([lang_code] tokens </s>) so items of different languages can share
+        one call without touching the shared tokenizer state.
+        
+        Args:
+            input_texts: Formatted model inputs
+            languages: Language per input
+            max_input_length: Token limit including special tokens
+            
+        Returns:
+            Token id lists (unpadded)
+        """
+        with self._timed("tokenize"):
+            token_ids = self.tokenizer(input_texts, add_special_tokens=False)["input_ids"]
+        eos_id = self.tokenizer.eos_token_id
+        
+        encoded = []
+        for ids, language in zip(token_ids, languages):
+            lang_code = self._language_code_id(language)
+            encoded.append([lang_code] + ids[:max_input_length - 2] + [eos_id])
+        
+        self.notify(
+            "on_encode",
+            len(encoded),
+            sum(len(ids) for ids in encoded),
+            sum(len(ids) > max_input_length - 2 for ids in token_ids)
+        )
+        return encoded
+    
+    def _pad_inputs(self, encoded: List[List[int]]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Right-pad token id lists to the longest one, or with the model's
+        pad hook (PAD_HOOK) when one is set
+        """
+        pad_hook = getattr(self.model, PAD_HOOK, None)
+        if pad_hook is not None:
+            return pad_hook(encoded, self.tokenizer.pad_token_id, self.device)
+        return pad_token_ids(encoded, self.tokenizer.pad_token_id, self.device)
+    
+    def _generate_from_ids(
+        self,
+        encoded: List[List[int]],
+        language: str = "English",
+        max_length: int = 64,
+        return_scores: bool = False,
+        contexts: Sequence[str] = None,
+        adapter: str = None,
+        cancel_tokens: Sequence[CancelToken] = None
+    ) -> Union[List[str], Tuple[List[str], List[float]]]:
+        """
+        Run batched generation for pre-tokenized inputs
+        
+        One beam search call, or with cascade enabled a greedy call plus
+        a beam search call for the items that failed the checks.
+        
+        Args:
+            encoded: Token id lists, all in the same language
+            language: "English" or "German"
+            max_length: Maximum answer length
+            return_scores: Also return the length-normalized beam scores
+            contexts: Context text of each input, used by constrained decoding
+            adapter: Registered LoRA adapter (None = default)
+            cancel_tokens: Token per input (see _generate_batch)
+            
+        Returns:
+            Decoded answers in input order (and their sequence scores)
+        """
+        # Forced BOS is passed per call, never set on the shared model/tokenizer
+        lang_code = self._language_code_id(language)
+        
+        if not self.cascade or contexts is None:
+            answers, scores = self._generate_batch(
+                encoded, lang_code, max_length, self.num_beams, return_scores, contexts, adapter, cancel_tokens
+            )
+            return (answers, scores) if return_scores else answers
+        
+        # Cascade: greedy for everyone, beam search for answers that fail the checks
+        start = time.perf_counter()
+        answers, scores = self._generate_batch(
+            encoded, lang_code, max_length, 1, True, contexts, adapter, cancel_tokens
+        )
+        greedy_ms = (time.perf_counter() - start) * 1000
+        
+        escalate = [
+            i for i, (answer, score, context) in enumerate(zip(answers, scores, contexts))
+            if not (is_grounded(answer, context) and score >= self.cascade_min_score)
+        ]
+        
+        beam_ms = None
+        if escalate:
+            start = time.perf_counter()
+            beam_answers, beam_scores = self._generate_batch(
+                [encoded[i] for i in escalate],
+                lang_code,
+                max_length,
+                self.num_beams,
+                return_scores,
+                [contexts[i] for i in escalate],
+                adapter,
+                [cancel_tokens[i] for i in escalate] if cancel_tokens else None
+            )
+            beam_ms = (time.perf_counter() - start) * 1000
+            for k, i in enumerate(escalate):
+                answers[i] = beam_answers[k]
+                if return_scores:
+                    scores[i] = beam_scores[k]
+        
+        with self._cascade_lock:
+            self._cascade_items += len(encoded)
+            self._cascade_escalated += len(escalate)
+            self._tier_latencies["greedy"].append(greedy_ms)
+            if beam_ms is not None:
+                self._tier_latencies["beam"].append(beam_ms)
+        
+        return (answers, scores) if return_scores else answers
+    
+    def _generate_batch(
+        self,
+        encoded: List[List[int]],
+        lang_code: int,
+        max_length: int,
+        num_beams: int,
+        return_scores: bool,
+        contexts: Sequence[str] = None,
+        adapter: str = None,
+        cancel_tokens: Sequence[CancelToken] = None,
+        streamer=None
+    ) -> Tuple[List[str], List[float]]:
+        """
+        Pad inputs and run one generate call with the given beam width
+        
+        With a cancel token for every input, the call is skipped if all of
+        them are already done and stopped between decode steps once they
+        all are. A streamer (greedy, single input only) receives the token
+        ids as they are generated.
+        
+        Returns:
+            Decoded answers and, if return_scores, length-normalized scores
+            (the beam score, or the mean token log-probability for greedy)
+            
+        Raises:
+            RequestAborted: The inputs were cancelled or expired
+        """
+        deadline_criteria = None
+        if cancel_tokens and all(token is not None for token in cancel_tokens):
+            error = aborted(cancel_tokens)
+            if error is not None:
+                raise error
+            deadline_criteria = _DeadlineCriteria(cancel_tokens)
+        
+        # Prepare input
+        pad_id = self.tokenizer.pad_token_id
+        input_ids, attention_mask = self._pad_inputs(encoded)
+        
+        # Restrict each item to spans of its own context
+        generate_kwargs = {"streamer": streamer} if streamer is not None else {}
+        if deadline_criteria is not None:
+            generate_kwargs["stopping_criteria"] = [deadline_criteria]
+        if self.constrained_decoding and contexts is not None:
+            unique = list(dict.fromkeys(contexts))
+            context_ids = dict(zip(unique, self.tokenizer(unique, add_special_tokens=False)["input_ids"]))
+            generate_kwargs["prefix_allowed_tokens_fn"] = ContextConstraint(
+                [context_ids[context] for context in contexts],
+                lang_code,
+                self.tokenizer.eos_token_id
+            )
+        
+        # Generate answers
+        with self._use_adapter(adapter), self._timed("generate"), torch.no_grad():
+            outputs = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_length=max_length,
+                num_beams=num_beams,
+                early_stopping=True,
+                forced_bos_token_id=lang_code,
+                output_scores=return_scores,
+                return_dict_in_generate=return_scores,
+                **generate_kwargs
+            )
+        
+        # Partial answers of a stopped call are discarded
+        if deadline_criteria is not None and deadline_criteria.triggered:
+            raise aborted(cancel_tokens)
+        
+        sequences = outputs.sequences if return_scores else outputs
+        if self.hooks:
+            # Generated tokens exclude the decoder start and the forced BOS
+            self.notify("on_generate", len(encoded), num_beams, int((sequences[:, 2:] != pad_id).sum()))
+        
+        with self._timed("decode"):
+            answers = self.tokenizer.batch_decode(sequences, skip_special_tokens=True)
+        if not return_scores:
+            return answers, None
+        
+        if num_beams > 1:
+            return answers, outputs.sequences_scores.tolist()
+        
+        # Greedy: mean log-probability of the answer tokens (step 0 is the forced BOS)
+        if len(outputs.scores) < 2:
+            return answers, [0.0] * len(answers)
+        log_probs = torch.stack(outputs.scores[1:], dim=1).float().log_softmax(dim=-1)
+        tokens = outputs.sequences[:, 2:2 + log_probs.shape[1]]
+        token_log_probs = log_probs.gather(-1, tokens.unsqueeze(-1)).squeeze(-1)
+        generated = tokens != self.tokenizer.pad_token_id
+        total = torch.where(generated, token_log_probs, torch.zeros_like(token_log_probs)).sum(dim=-1)
+        return answers, (total / generated.sum(dim=-1).clamp(min=1)).tolist()
+    
+    def get_cascade_stats(self) -> Dict:
+        """
+        Get cascade escalation and per-tier latency statistics
+        
+        Returns:
+            Dictionary with item counts, escalation rate and generate-call
+            latency percentiles for the greedy and beam tiers
+        """
+        with self._cascade_lock:
+            items = self._cascade_items
+            escalated = self._cascade_escalated
+            tiers = {tier: sorted(values) for tier, values in self._tier_latencies.items()}
+        
+        def summary(values):
+            if not values:
+                return {"calls": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0}
+            return {
+                "calls": len(values),
+                "avg": round(sum(values) / len(values), 2),
+                "p50": round(values[int(0.50 * (len(values) - 1))], 2),
+                "p95": round(values[int(0.95 * (len(values) - 1))], 2)
+            }
+        
+        return {
+            "enabled": self.cascade,
+            "min_score": self.cascade_min_score,
+            "items": items,
+            "accepted_greedy": items - escalated,
+            "escalated": escalated,
+            "escalation_rate": round(escalated / items, 4) if items else 0.0,
+            "latency_ms": {tier: summary(values) for tier, values in tiers.items()}
+        }
+    
+    def build_response_info(
+        self,
+        answer: str,
+        context: str,
+        language: str,
+        details: Dict[str, object] = None
+    ) -> str:
+        """
+        Build the markdown response details shown next to an answer
+        
+        Args:
+            answer: Generated answer
+            context: Input context
+            language: Language used
+            details: Optional extra "name: value" lines to append
+            
+        Returns:
+            Markdown string with answer details
+        """
+        # Calculate confidence
+        with self._timed("confidence"):
+            confidence = self._calculate_confidence(answer, context)
+        
+        extra = "".join(f"- **{name}**: {value}\n" for name, value in (details or {}).items())
+        
+        # Format response info
+        return f"""
 ### 📊 Response Details
 - **Language**: {language}
 - **Answer Length**: {len(answer.split())} words
 - **Confidence**: {confidence}
 - **Model**: mBART-large-50 + LoRA
-            """
-            
-            return answer, response_info
-            
-        except Exception as e:
-            return f"❌ Error: {str(e)}", ""
+{extra}            """
     
     def _calculate_confidence(self, answer: str, context: str) -> str:
         """
@@ -110,7 +1231,7 @@ class QAInference:
         """
         if len(answer.split()) < 2:
             return "Low"
-        elif answer.lower() in context.lower():
+        elif is_grounded(answer, context):
             return "High"
         else:
             return "Medium"
\ No newline at end of file
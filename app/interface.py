@@ -4,7 +4,11 @@ Defines the web interface layout and interactions
 """
 
 import gradio as gr
-from .utils import create_performance_chart, create_metrics_table, get_example
+from .cancellation import CancelToken
+from .utils import (
+    create_performance_chart, create_metrics_table, create_answers_table, get_example,
+    create_latency_chart, create_live_metrics_table, load_performance_data, create_passages_table
+)
 
 
 # Custom CSS
@@ -23,12 +27,33 @@ CUSTOM_CSS = """
 """
 
 
-def create_interface(inference_engine):
+def create_interface(
+    inference_engine,
+    concurrency_limit: int = 1,
+    metrics=None,
+    retriever=None,
+    stream: bool = True,
+    request_timeout: float = None
+):
     """
     Create Gradio interface
     
     Args:
-        inference_engine: QAInference instance
+        inference_engine: QAInference (or MicroBatcher) instance
+        concurrency_limit: Number of "Get Answer" events processed at once.
+            QAInference is thread-safe, so this can exceed 1; raise it
+            together with a MicroBatcher so concurrent clicks can be
+            grouped into one batch.
+        metrics: Optional MetricsCollector shown as a live latency panel
+        retriever: Optional CorpusQA; adds a tab answering questions
+            against its passage index instead of a pasted context
+        stream: Show "Get Answer" answers token by token (greedy decoding)
+            when the engine supports stream_answer; otherwise the answer
+            appears once the full beam search has finished
+        request_timeout: Seconds a "Get Answer" (also long-context) or
+            multi-question request may take before it is stopped with a
+            timeout message (None = no limit). Streamed
+            requests are also cancelled when the browser disconnects.
         
     Returns:
         Gradio Blocks interface
@@ -79,6 +104,12 @@ def create_interface(inference_engine):
                             lines=6
                         )
                         
+                        long_context_mode = gr.Checkbox(
+                            value=False,
+                            label="📜 Long context mode",
+                            info="Scan the whole context in overlapping windows instead of truncating it"
+                        )
+                        
                         with gr.Row():
                             submit_btn = gr.Button("🔍 Get Answer", variant="primary", size="lg")
                             clear_btn = gr.Button("🗑️ Clear", variant="secondary")
@@ -101,10 +132,28 @@ def create_interface(inference_engine):
                         response_details = gr.Markdown("")
                 
                 # Button actions
+                streaming = stream and hasattr(inference_engine, "stream_answer")
+                
+                def ask(question, context, language, long_context):
+                    cancel_token = CancelToken(request_timeout)
+                    if long_context:
+                        yield inference_engine.answer_long_context(
+                            question, context, language, cancel_token=cancel_token
+                        )
+                    elif streaming:
+                        yield from inference_engine.stream_answer(
+                            question, context, language, cancel_token=cancel_token
+                        )
+                    else:
+                        yield inference_engine.answer_question(
+                            question, context, language, cancel_token=cancel_token
+                        )
+                
                 submit_btn.click(
-                    fn=inference_engine.answer_question,
-                    inputs=[question_input, context_input, language_choice],
-                    outputs=[answer_output, response_details]
+                    fn=ask,
+                    inputs=[question_input, context_input, language_choice, long_context_mode],
+                    outputs=[answer_output, response_details],
+                    concurrency_limit=concurrency_limit
                 )
                 
                 clear_btn.click(
@@ -118,27 +167,167 @@ def create_interface(inference_engine):
                     outputs=[question_input, context_input]
                 )
             
-            # Tab 2: Performance Metrics
+            # Tab 2: Multiple Questions
+            with gr.Tab("📚 Multiple Questions"):
+                
+                gr.Markdown("""### Ask several questions about the same passage
+The context is processed once and all questions are answered together in a single batch.
+                """)
+                
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        multi_language = gr.Radio(
+                            choices=["English", "German"],
+                            value="English",
+                            label="🌐 Select Language"
+                        )
+                        
+                        multi_context = gr.Textbox(
+                            label="📄 Context",
+                            placeholder="Provide the context/passage containing the answers...",
+                            lines=8
+                        )
+                        
+                        multi_questions = gr.Textbox(
+                            label="📝 Questions (one per line)",
+                            placeholder="What is ...?\nWhen was ...?",
+                            lines=6
+                        )
+                        
+                        multi_submit_btn = gr.Button("🔍 Answer All", variant="primary")
+                    
+                    with gr.Column(scale=1):
+                        gr.Markdown("### 🎯 Answers")
+                        multi_answers = gr.Dataframe(
+                            headers=["Question", "Answer", "Confidence"],
+                            label="Answers by Question",
+                            interactive=False,
+                            wrap=True
+                        )
+                
+                def answer_all(context, questions, language):
+                    results = inference_engine.answer_questions(
+                        questions.splitlines(), context, language,
+                        cancel_token=CancelToken(request_timeout)
+                    )
+                    return create_answers_table(results)
+                
+                multi_submit_btn.click(
+                    fn=answer_all,
+                    inputs=[multi_context, multi_questions, multi_language],
+                    outputs=[multi_answers]
+                )
+            
+            # Tab 3: Corpus Search (only with a passage index)
+            if retriever is not None:
+                with gr.Tab("🔎 Search Corpus"):
+                    
+                    gr.Markdown("""### Ask a question against the indexed document collection
+A BM25 index finds the best-matching passages; only those are read by the model and the best answer is shown with its source.
+                    """)
+                    
+                    with gr.Row():
+                        with gr.Column(scale=1):
+                            corpus_language = gr.Radio(
+                                choices=["English", "German"],
+                                value="English",
+                                label="🌐 Select Language"
+                            )
+                            
+                            corpus_question = gr.Textbox(
+                                label="📝 Question",
+                                placeholder="Enter your question here...",
+                                lines=2
+                            )
+                            
+                            corpus_top_k = gr.Slider(
+                                minimum=1,
+                                maximum=20,
+                                value=retriever.top_k,
+                                step=1,
+                                label="📑 Passages to read"
+                            )
+                            
+                            corpus_submit_btn = gr.Button("🔍 Search & Answer", variant="primary")
+                            
+                            index_stats = retriever.index.get_stats()
+                            gr.Markdown(
+                                f"*Index: {index_stats['documents']:,} documents, "
+                                f"{index_stats['passages']:,} passages, {index_stats['size_mb']} MB*"
+                            )
+                        
+                        with gr.Column(scale=1):
+                            gr.Markdown("### 🎯 Answer")
+                            corpus_answer = gr.Textbox(
+                                label="Model Answer",
+                                lines=3,
+                                interactive=False
+                            )
+                            corpus_details = gr.Markdown("")
+                            corpus_source = gr.Textbox(
+                                label="📄 Source Passage",
+                                lines=5,
+                                interactive=False
+                            )
+                    
+                    corpus_passages = gr.Dataframe(
+                        headers=["Rank", "Document", "BM25 Score", "Answer", "Passage"],
+                        label="Retrieved Passages",
+                        interactive=False,
+                        wrap=True
+                    )
+                    
+                    def search_corpus(question, language, top_k):
+                        result = retriever.answer(question, language, top_k=int(top_k))
+                        source = result["source"]["text"] if result["source"] else ""
+                        return (
+                            result["answer"],
+                            result["info"],
+                            source,
+                            create_passages_table(result["candidates"])
+                        )
+                    
+                    corpus_submit_btn.click(
+                        fn=search_corpus,
+                        inputs=[corpus_question, corpus_language, corpus_top_k],
+                        outputs=[corpus_answer, corpus_details, corpus_source, corpus_passages],
+                        concurrency_limit=concurrency_limit
+                    )
+            
+            # Tab 4: Performance Metrics
             with gr.Tab("📊 Performance Metrics"):
                 gr.Markdown("""
                 ### Model Performance Analysis
                 Evaluation results on SQuAD (English) and XQuAD (German) test sets
                 """)
                 
+                performance_data, performance_source = load_performance_data()
+                source_md = gr.Markdown(f"*Source: {performance_source}*")
+                
                 performance_plot = gr.Plot(
-                    value=create_performance_chart(),
+                    value=create_performance_chart(performance_data),
                     label="Performance Comparison"
                 )
                 
                 gr.Markdown("### 📋 Detailed Metrics Table")
-                metrics_df = create_metrics_table()
+                metrics_df = create_metrics_table(performance_data)
                 metrics_table = gr.Dataframe(
                     value=metrics_df,
                     label="Performance Metrics by Language"
                 )
+                reload_results_btn = gr.Button("🔄 Reload Evaluation Results", variant="secondary")
+                
+                def reload_results():
+                    data, source = load_performance_data()
+                    return f"*Source: {source}*", create_performance_chart(data), create_metrics_table(data)
+                
+                reload_results_btn.click(
+                    fn=reload_results,
+                    outputs=[source_md, performance_plot, metrics_table]
+                )
                 
                 gr.Markdown("""
-                ### 🔑 Key Insights
+                ### 🔑 Key Insights (training-time evaluation)
                 
                 ✅ **German Performance**: 107.2% of English performance (Avg EM+F1)
                 - BLEU: 43.12 vs 37.79 (+5.33 points)
@@ -154,8 +343,31 @@ def create_interface(inference_engine):
                 - German Training: ~950 samples from XQuAD
                 - Total Training Time: ~2.5 hours on T4 GPU
                 """)
+                
+                if metrics is not None:
+                    gr.Markdown("### ⏱️ Live Inference Latency")
+                    
+                    latency_plot = gr.Plot(
+                        value=create_latency_chart(metrics.latency_history()),
+                        label="Latency by Stage"
+                    )
+                    latency_table = gr.Dataframe(
+                        value=create_live_metrics_table(metrics.snapshot()),
+                        label="Stage Latency Percentiles"
+                    )
+                    refresh_btn = gr.Button("🔄 Refresh", variant="secondary")
+                    
+                    def refresh_latency():
+                        return (
+                            create_latency_chart(metrics.latency_history()),
+                            create_live_metrics_table(metrics.snapshot())
+                        )
+                    
+                    refresh_btn.click(fn=refresh_latency, outputs=[latency_plot, latency_table])
+                    if hasattr(gr, "Timer"):
+                        gr.Timer(5.0).tick(fn=refresh_latency, outputs=[latency_plot, latency_table])
             
-            # Tab 3: About
+            # Tab 5: About
             with gr.Tab("ℹ️ About"):
                 gr.Markdown("""
                 # Multilingual Question Answering System
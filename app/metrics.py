@@ -0,0 +1,239 @@
+"""
+Metrics Module
+Per-stage latency timers and request counters for the inference path,
+exported in Prometheus text format
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+
+# Stages timed by QAInference ("request" is the end-to-end latency). Streamed
+# answers also report "first_token", the time until the first answer text.
+STAGES = ("tokenize", "generate", "decode", "confidence", "request")
+
+
+class InferenceHooks:
+    """
+    Hook interface called by QAInference
+
+    Every method is a no-op; subclass and override the events you need.
+    Hooks run on the inference threads, so they must be thread-safe and
+    cheap.
+    """
+
+    def on_stage(self, stage: str, seconds: float):
+        """A timed stage (tokenize, generate, decode, confidence) finished"""
+
+    def on_encode(self, items: int, tokens_in: int, truncated: int):
+        """Inputs were tokenized; truncated counts inputs cut to the token limit"""
+
+    def on_generate(self, items: int, num_beams: int, tokens_out: int):
+        """A generate call finished"""
+
+    def on_request(self, language: str, seconds: float):
+        """A request was answered (successfully or not)"""
+
+    def on_error(self, error: BaseException, language: str):
+        """A request failed with error"""
+
+    def on_abort(self, reason: str, language: str):
+        """A request was stopped early (reason: "cancelled" or "expired")"""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsCollector(InferenceHooks):
+    """
+    Thread-safe in-memory metrics backed by the hook interface
+
+    Keeps cumulative counters plus a rolling window of recent latencies per
+    stage for percentiles and the live latency panel.
+    """
+
+    def __init__(self, window: int = 500):
+        """
+        Initialize MetricsCollector
+
+        Args:
+            window: Number of recent latencies kept per stage
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._stage_count = Counter()
+        self._stage_seconds = Counter()
+        self._recent = {stage: deque(maxlen=window) for stage in STAGES}
+
+        self._encoded_items = 0
+        self._tokens_in = 0
+        self._tokens_out = 0
+        self._truncations = 0
+        self._generate_calls = Counter()
+        self._requests = Counter()
+        self._errors = Counter()
+        self._aborted = Counter()
+        self.started_at = time.time()
+
+    def on_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self._stage_count[stage] += 1
+            self._stage_seconds[stage] += seconds
+            self._recent.setdefault(stage, deque(maxlen=self.window)).append((time.time(), seconds))
+
+    def on_encode(self, items: int, tokens_in: int, truncated: int):
+        with self._lock:
+            self._encoded_items += items
+            self._tokens_in += tokens_in
+            self._truncations += truncated
+
+    def on_generate(self, items: int, num_beams: int, tokens_out: int):
+        with self._lock:
+            self._generate_calls[num_beams] += 1
+            self._tokens_out += tokens_out
+
+    def on_request(self, language: str, seconds: float):
+        with self._lock:
+            self._requests[language] += 1
+        self.on_stage("request", seconds)
+
+    def on_error(self, error: BaseException, language: str):
+        with self._lock:
+            self._errors[type(error).__name__] += 1
+
+    def on_abort(self, reason: str, language: str):
+        with self._lock:
+            self._aborted[reason] += 1
+
+    def latency_history(self) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        Recent latencies per stage
+
+        Returns:
+            Stage -> list of (unix timestamp, milliseconds)
+        """
+        with self._lock:
+            return {
+                stage: [(at, seconds * 1000) for at, seconds in values]
+                for stage, values in self._recent.items()
+            }
+
+    def snapshot(self) -> Dict:
+        """
+        Current counters and per-stage latency percentiles
+
+        Returns:
+            Dictionary of counters and {stage: {count, avg_ms, p50_ms, p95_ms, p99_ms}}
+        """
+        with self._lock:
+            stages = {}
+            for stage, values in self._recent.items():
+                latencies = sorted(seconds * 1000 for _, seconds in values)
+                count = self._stage_count[stage]
+                stages[stage] = {
+                    "count": count,
+                    "avg_ms": round(self._stage_seconds[stage] * 1000 / count, 2) if count else 0.0,
+                    "p50_ms": round(_percentile(latencies, 0.50), 2),
+                    "p95_ms": round(_percentile(latencies, 0.95), 2),
+                    "p99_ms": round(_percentile(latencies, 0.99), 2)
+                }
+
+            return {
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "requests": dict(self._requests),
+                "errors": dict(self._errors),
+                "aborted": {"cancelled": self._aborted["cancelled"], "expired": self._aborted["expired"]},
+                "encoded_items": self._encoded_items,
+                "tokens_in": self._tokens_in,
+                "tokens_out": self._tokens_out,
+                "truncations": self._truncations,
+                "generate_calls_by_beams": dict(self._generate_calls),
+                "stages": stages
+            }
+
+    def render_prometheus(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format
+
+        Returns:
+            Text suitable for a /metrics endpoint
+        """
+        snapshot = self.snapshot()
+        with self._lock:
+            stage_seconds = dict(self._stage_seconds)
+
+        lines = [
+            "# HELP qa_stage_latency_seconds Latency of each inference stage (quantiles over a rolling window)",
+            "# TYPE qa_stage_latency_seconds summary"
+        ]
+        for stage, stats in snapshot["stages"].items():
+            label = f'stage="{_escape(stage)}"'
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'qa_stage_latency_seconds{{{label},quantile="{quantile}"}} {stats[key] / 1000:.6f}')
+            lines.append(f"qa_stage_latency_seconds_sum{{{label}}} {stage_seconds.get(stage, 0.0):.6f}")
+            lines.append(f"qa_stage_latency_seconds_count{{{label}}} {stats['count']}")
+
+        def counter(name, help_text, values=None, label=None, value=None):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            if values is None:
+                lines.append(f"{name} {value}")
+                return
+            for key, count in sorted(values.items(), key=lambda item: str(item[0])):
+                lines.append(f'{name}{{{label}="{_escape(key)}"}} {count}')
+
+        counter("qa_requests_total", "Answered requests by language", snapshot["requests"], "language")
+        counter("qa_errors_total", "Failed requests by error type", snapshot["errors"], "type")
+        counter("qa_aborted_total", "Requests stopped early (cancelled or past their deadline)",
+                snapshot["aborted"], "reason")
+        counter("qa_generate_calls_total", "generate calls by beam count",
+                snapshot["generate_calls_by_beams"], "num_beams")
+        counter("qa_encoded_items_total", "Tokenized model inputs", value=snapshot["encoded_items"])
+        counter("qa_tokens_in_total", "Input tokens passed to the model", value=snapshot["tokens_in"])
+        counter("qa_tokens_out_total", "Tokens generated by the model", value=snapshot["tokens_out"])
+        counter("qa_truncations_total", "Inputs truncated to the token limit", value=snapshot["truncations"])
+
+        return "\n".join(lines) + "\n"
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def start_metrics_server(collector: MetricsCollector, host: str = "0.0.0.0", port: int = 9100) -> ThreadingHTTPServer:
+    """
+    Serve collector.render_prometheus() at /metrics from a daemon thread
+
+    Args:
+        collector: MetricsCollector to export
+        host: Bind address
+        port: Bind port
+
+    Returns:
+        Running server (call shutdown() to stop it)
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = collector.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="qa-metrics-server", daemon=True).start()
+    return server
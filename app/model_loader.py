@@ -5,59 +5,246 @@ Handles loading mBART + LoRA model from disk
 
 import torch
 import gc
+import json
+import time
 from pathlib import Path
-from transformers import MBart50TokenizerFast, MBartForConditionalGeneration
-from peft import PeftModel
+from typing import Dict, Sequence
+
+from .utils import get_memory_usage
+
+
+BASE_MODEL = "facebook/mbart-large-50-many-to-many-mmt"
+
+# Written by app.artifact next to merged weights
+ARTIFACT_MANIFEST = "serving_artifact.json"
+
+# Supported inference precisions (int8 = dynamic quantization of Linear layers, CPU only)
+PRECISION_MODES = ("fp32", "bf16", "int8")
+
+# Inference backends (onnx = ONNX Runtime export from app.onnx_backend, CPU only)
+BACKENDS = ("torch", "onnx")
+
+
+def is_merged_artifact(model_path: str) -> bool:
+    """
+    Check whether a directory holds a full (merged) model instead of a LoRA adapter
+    
+    Args:
+        model_path: Path to saved model directory
+        
+    Returns:
+        True if the directory has model weights and no adapter config
+    """
+    path = Path(model_path)
+    return (path / "config.json").exists() and not (path / "adapter_config.json").exists()
+
+
+def apply_precision(model, precision: str):
+    """
+    Convert a loaded model to the requested inference precision
+    
+    Args:
+        model: Loaded (fp32) model, optionally wrapped by PEFT
+        precision: One of PRECISION_MODES
+        
+    Returns:
+        Model in the requested precision
+    """
+    if precision not in PRECISION_MODES:
+        raise ValueError(f"Unknown precision '{precision}', choose from {PRECISION_MODES}")
+    
+    if precision == "fp32":
+        return model
+    
+    from peft import PeftModel
+    
+    # Fold LoRA into the base weights so the converted layers are plain Linear
+    if isinstance(model, PeftModel):
+        model = model.merge_and_unload()
+    
+    if precision == "bf16":
+        return model.to(torch.bfloat16)
+    
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
 
 
 class ModelLoader:
     """Handles model and tokenizer loading"""
     
-    def __init__(self, model_path: str = None):
+    def __init__(
+        self,
+        model_path: str = None,
+        base_model: str = None,
+        precision: str = "fp32",
+        backend: str = "torch",
+        adapters: Dict[str, str] = None,
+        max_resident_adapters: int = 4,
+        torch_compile: bool = False,
+        compile_backend: str = "inductor",
+        length_buckets: Sequence[int] = None
+    ):
         """
         Initialize ModelLoader
         
         Args:
-            model_path: Path to saved model directory
+            model_path: Path to saved model directory (LoRA adapter or
+                merged serving artifact from app.artifact)
+            base_model: Base model the adapter is applied to
+            precision: "fp32", "bf16" or "int8" (see app.precision for
+                an accuracy/latency check of each mode)
+            backend: "torch", or "onnx" to run an app.onnx_backend export
+                through ONNX Runtime
+            adapters: Extra LoRA adapters {name: path} served over the same
+                base model next to the one in model_path (see app.adapters)
+            max_resident_adapters: Extra adapters kept loaded at once (LRU)
+            torch_compile: torch.compile the encoder and decoder and warm up
+                every length bucket at load time (see app.compiled); falls
+                back to eager if compiling fails
+            compile_backend: torch.compile backend
+            length_buckets: Padded input lengths (None = app.compiled.LENGTH_BUCKETS);
+                pass loader.length_buckets to QAInference
         """
+        if precision not in PRECISION_MODES:
+            raise ValueError(f"Unknown precision '{precision}', choose from {PRECISION_MODES}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', choose from {BACKENDS}")
+        if backend == "onnx" and precision != "fp32":
+            raise ValueError("The ONNX backend runs the exported fp32 graphs only")
+        if adapters and (backend != "torch" or precision != "fp32"):
+            raise ValueError("Multiple adapters need the torch backend in fp32 (adapters stay unmerged)")
+        if torch_compile and (backend != "torch" or adapters):
+            raise ValueError("torch.compile needs the torch backend without extra adapters")
+        if torch_compile:
+            from .compiled import LENGTH_BUCKETS, check_buckets
+            
+            length_buckets = check_buckets(length_buckets or LENGTH_BUCKETS)
+        
         self.model_path = model_path or "models/multilingual_model"
+        self.base_model = base_model or BASE_MODEL
+        self.precision = precision
+        self.backend = backend
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        if precision == "int8" and self.device.type != "cpu":
+            print("⚠️ int8 dynamic quantization runs on CPU only, using CPU")
+            self.device = torch.device("cpu")
+        if backend == "onnx":
+            self.device = torch.device("cpu")
+        self.adapter_paths = dict(adapters or {})
+        self.max_resident_adapters = max_resident_adapters
+        self.torch_compile = torch_compile
+        self.compile_backend = compile_backend
+        self.requested_buckets = length_buckets
+        # Set once the compiled model is warmed up (stays None in eager mode)
+        self.length_buckets = None
+        self.compiled = None
         self.model = None
         self.tokenizer = None
+        self.adapters = None
+        self.load_stats = None
         
     def load(self):
         """Load model and tokenizer from disk"""
+        # Imported here so importing the package does not pull in transformers/peft
+        from transformers import MBart50TokenizerFast, MBartForConditionalGeneration
+        
         print(f"🔧 Loading model from: {self.model_path}")
         
         # Clear memory
         torch.cuda.empty_cache()
         gc.collect()
         
+        start_time = time.perf_counter()
+        memory_before = get_memory_usage()
+        
         try:
             # Load tokenizer
             print("⏳ Loading tokenizer...")
             self.tokenizer = MBart50TokenizerFast.from_pretrained(self.model_path)
             print("✅ Tokenizer loaded")
             
-            # Load base model
-            print("⏳ Loading base mBART model...")
-            base_model = MBartForConditionalGeneration.from_pretrained(
-                "facebook/mbart-large-50-many-to-many-mmt"
-            )
-            print("✅ Base model loaded")
-            
-            # Load LoRA weights
-            print("⏳ Loading LoRA adapter...")
-            self.model = PeftModel.from_pretrained(base_model, self.model_path)
-            print("✅ LoRA weights loaded")
+            if self.backend == "onnx":
+                # Exported encoder/decoder graphs run by ONNX Runtime
+                from .onnx_backend import OnnxSeq2SeqModel
+                
+                print("⏳ Loading ONNX Runtime sessions...")
+                self.model = OnnxSeq2SeqModel.from_pretrained(self.model_path)
+                print("✅ ONNX model loaded")
+            elif is_merged_artifact(self.model_path):
+                # Merged artifact: memory-map the safetensors weights, no hub access
+                print("⏳ Loading merged serving artifact...")
+                self.model = MBartForConditionalGeneration.from_pretrained(
+                    self.model_path,
+                    low_cpu_mem_usage=True,
+                    local_files_only=True
+                )
+                manifest = Path(self.model_path) / ARTIFACT_MANIFEST
+                if manifest.exists():
+                    with open(manifest) as f:
+                        self.base_model = json.load(f).get("base_model", self.base_model)
+                print("✅ Merged model loaded")
+            else:
+                # Load base model
+                print("⏳ Loading base mBART model...")
+                base_model = MBartForConditionalGeneration.from_pretrained(
+                    self.base_model
+                )
+                print("✅ Base model loaded")
+                
+                # Load LoRA weights
+                from peft import PeftModel
+                
+                print("⏳ Loading LoRA adapter...")
+                self.model = PeftModel.from_pretrained(base_model, self.model_path)
+                print("✅ LoRA weights loaded")
             
             # Move to device
             self.model = self.model.to(self.device)
             self.model.eval()
             
+            if self.precision != "fp32":
+                print(f"⏳ Converting to {self.precision}...")
+                self.model = apply_precision(self.model, self.precision)
+                print(f"✅ Precision: {self.precision}")
+            
+            if self.backend == "torch" and self.precision == "fp32" and not is_merged_artifact(self.model_path):
+                # LoRA stays unmerged, so further adapters can share the base model
+                # (registered ones load lazily on first use)
+                from .adapters import AdapterRegistry
+                
+                self.adapters = AdapterRegistry(self.model, max_resident=self.max_resident_adapters)
+                for name, path in self.adapter_paths.items():
+                    self.adapters.register(name, path)
+                if self.adapter_paths:
+                    print(f"✅ Registered adapters: {', '.join(self.adapter_paths)} "
+                          f"(up to {self.max_resident_adapters} resident)")
+            elif self.adapter_paths:
+                raise ValueError("Extra adapters need a LoRA adapter in model_path, not a merged artifact")
+            
+            if self.torch_compile:
+                self._compile()
+            
+            memory_after = get_memory_usage()
+            self.load_stats = {
+                "load_seconds": round(time.perf_counter() - start_time, 2),
+                "rss_before_mb": memory_before["rss_mb"],
+                "rss_after_mb": memory_after["rss_mb"],
+                "peak_rss_mb": memory_after["peak_rss_mb"],
+                "merged_artifact": is_merged_artifact(self.model_path),
+                "backend": self.backend,
+                "compiled": self.compiled is not None
+            }
+            
             print(f"\n✅ MODEL LOADED SUCCESSFULLY!")
-            print(f"💾 Device: {self.device}")
+            print(f"💾 Device: {self.device} ({self.backend})")
             print(f"📊 Total parameters: {self.model.num_parameters():,}")
+            print(f"⏱️ Startup time: {self.load_stats['load_seconds']}s")
+            if self.compiled is not None:
+                print(f"🔥 Compiled ({self.compile_backend}), warm-up: "
+                      f"{self.compiled.warmup_report['warmup_seconds']}s for buckets {list(self.length_buckets)}")
+            print(f"🧠 RSS: {self.load_stats['rss_before_mb']} MB → {self.load_stats['rss_after_mb']} MB "
+                  f"(peak {self.load_stats['peak_rss_mb']} MB)")
             
             return self.model, self.tokenizer
             
@@ -65,6 +252,33 @@ class ModelLoader:
             print(f"\n❌ ERROR LOADING MODEL: {str(e)}")
             raise
     
+    def _compile(self):
+        """torch.compile the loaded model and warm up each length bucket, or stay eager on failure"""
+        from .compiled import CompiledModel
+        
+        compiled = CompiledModel(
+            self.model,
+            self.tokenizer,
+            self.device,
+            backend=self.compile_backend,
+            length_buckets=self.requested_buckets
+        )
+        try:
+            print(f"⏳ Compiling ({self.compile_backend}) and warming up length buckets {list(compiled.length_buckets)}...")
+            compiled.compile()
+            report = compiled.warm_up()
+        except Exception as e:
+            compiled.revert()
+            print(f"⚠️ torch.compile failed, falling back to eager: {e}")
+            return
+        
+        self.compiled = compiled
+        self.length_buckets = compiled.length_buckets
+        for bucket, result in report["buckets"].items():
+            print(f"   {bucket:>4} tokens: warm-up {result['warmup_seconds']}s, "
+                  f"{result['latency_ms']}ms per call, {result['graphs']} graphs")
+        print("✅ Compiled model ready")
+    
     def get_model_info(self):
         """Get model information"""
         if self.model is None:
@@ -73,6 +287,11 @@ class ModelLoader:
         return {
             "device": str(self.device),
             "parameters": self.model.num_parameters(),
+            "precision": self.precision,
+            "backend": self.backend,
             "model_path": self.model_path,
-            "base_model": "facebook/mbart-large-50-many-to-many-mmt"
+            "base_model": self.base_model,
+            "adapters": self.adapters.names() if self.adapters else None,
+            "compile": self.compiled.get_stats() if self.compiled else None,
+            "load_stats": self.load_stats
         }
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""
+Offline Batch Inference Module
+Streams (question, context) pairs from JSONL or SQuAD/XQuAD JSON through the
+model and writes answers incrementally to JSONL, resuming after a crash
+
+Usage:
+    python -m app.offline questions.jsonl answers.jsonl
+    python -m app.offline xquad.de.json answers_de.jsonl --language German --batch-size 32
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .inference import MAX_INPUT_LENGTH, QAInference
+from .utils import calculate_confidence
+
+
+# Items read, answered and flushed per checkpoint (bounds memory)
+CHUNK_SIZE = 256
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5.0
+
+
+def iter_items(input_path: str, language: str = "English") -> Iterator[Dict]:
+    """
+    Stream QA items from a JSONL file or a SQuAD/XQuAD-format JSON file
+
+    JSONL lines hold "question" and "context", and optionally "id",
+    "language" and gold "answers" (a string or a list of strings). SQuAD
+    files are parsed once; items are then yielded one at a time.
+
+    Args:
+        input_path: .jsonl or SQuAD-format .json file
+        language: Language of items that do not name one
+
+    Yields:
+        Items with id, question, context, language and answers
+    """
+    with open(input_path, encoding="utf-8") as f:
+        # A JSONL file starts with a complete item on its first line
+        try:
+            first = json.loads(f.readline())
+        except json.JSONDecodeError:
+            first = None
+        f.seek(0)
+
+        if not (isinstance(first, dict) and "question" in first):
+            yield from _iter_squad(json.load(f), language)
+            return
+
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            answers = item.get("answers", [])
+            yield {
+                "id": str(item.get("id", line_number)),
+                "question": item["question"],
+                "context": item["context"],
+                "language": item.get("language", language),
+                "answers": [answers] if isinstance(answers, str) else list(answers)
+            }
+
+
+def _iter_squad(document: Dict, language: str) -> Iterator[Dict]:
+    for article in document["data"]:
+        for paragraph in article["paragraphs"]:
+            for qa in paragraph["qas"]:
+                yield {
+                    "id": str(qa["id"]),
+                    "question": qa["question"],
+                    "context": paragraph["context"],
+                    "language": language,
+                    "answers": [answer["text"] for answer in qa.get("answers", [])]
+                }
+
+
+def count_items(input_path: str, language: str = "English") -> int:
+    """Count input items (one extra pass, used for the ETA)"""
+    return sum(1 for _ in iter_items(input_path, language))
+
+
+def checkpoint_path(output_path: str) -> str:
+    """Checkpoint file kept next to the output"""
+    return output_path + ".ckpt"
+
+
+def _load_checkpoint(output_path: str, input_path: str) -> Dict:
+    path = checkpoint_path(output_path)
+    if not os.path.exists(path) or not os.path.exists(output_path):
+        return {"items_done": 0, "output_bytes": 0}
+
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("input") != os.path.abspath(input_path):
+        raise ValueError(f"{path} belongs to {checkpoint.get('input')}, not {input_path}")
+    return checkpoint
+
+
+def _save_checkpoint(output_path: str, checkpoint: Dict):
+    # Write-then-rename so a crash never leaves a half-written checkpoint
+    path = checkpoint_path(output_path)
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+
+def _format_eta(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def run_offline(
+    inference: QAInference,
+    input_path: str,
+    output_path: str,
+    language: str = "English",
+    batch_size: int = 16,
+    chunk_size: int = CHUNK_SIZE,
+    max_length: int = 64,
+    max_input_length: int = MAX_INPUT_LENGTH,
+    resume: bool = True,
+    total: Optional[int] = None
+) -> Dict:
+    """
+    Answer every input item and append the results to a JSONL file
+
+    Items are read and answered chunk by chunk, so memory stays bounded by
+    chunk_size regardless of the input size. After each chunk the output is
+    flushed to disk and a checkpoint records how many items and output bytes
+    are complete; a resumed run truncates anything written after the last
+    checkpoint and skips the completed items.
+
+    Args:
+        inference: QAInference instance
+        input_path: JSONL or SQuAD-format JSON input
+        output_path: JSONL output (one line per item, in input order)
+        language: Language of items that do not name one
+        batch_size: Items per generate call
+        chunk_size: Items per checkpoint
+        max_length: Maximum answer length
+        max_input_length: Token limit per input
+        resume: Continue from the checkpoint instead of starting over
+        total: Total item count for the ETA (None = unknown)
+
+    Returns:
+        Run statistics (items, errors, seconds, items/sec, resumed_from)
+    """
+    checkpoint = _load_checkpoint(output_path, input_path) if resume else {"items_done": 0, "output_bytes": 0}
+    done = checkpoint["items_done"]
+    if done:
+        print(f"↩️ Resuming after {done:,} completed items")
+
+    # Drop results written after the last checkpoint (they will be redone)
+    with open(output_path, "a", encoding="utf-8") as out:
+        out.truncate(checkpoint["output_bytes"])
+
+    items = itertools.islice(iter_items(input_path, language), done, None)
+    start_time = time.perf_counter()
+    last_report = start_time
+    processed = 0
+    errors = 0
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        while True:
+            chunk: List[Dict] = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+
+            answers = inference.answer_batch(
+                [item["question"] for item in chunk],
+                [item["context"] for item in chunk],
+                [item["language"] for item in chunk],
+                max_length=max_length,
+                batch_size=batch_size,
+                max_input_length=max_input_length
+            )
+
+            for item, (answer, _) in zip(chunk, answers):
+                record = {"id": item["id"], "language": item["language"]}
+                if answer.startswith(("❌", "⚠️")):
+                    record["error"] = answer
+                    errors += 1
+                else:
+                    record["answer"] = answer
+                    record["confidence"] = calculate_confidence(answer, item["context"])
+                if item["answers"]:
+                    record["answers"] = item["answers"]
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            out.flush()
+            os.fsync(out.fileno())
+            processed += len(chunk)
+            _save_checkpoint(output_path, {
+                "input": os.path.abspath(input_path),
+                "items_done": done + processed,
+                "output_bytes": out.tell()
+            })
+
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL or len(chunk) < chunk_size:
+                last_report = now
+                rate = processed / (now - start_time)
+                progress = f"{done + processed:,}"
+                if total:
+                    eta = _format_eta((total - done - processed) / rate) if rate else "?"
+                    progress += f"/{total:,} ({(done + processed) / total:.1%}) | ETA {eta}"
+                print(f"⏳ {progress} | {rate:.1f} items/s")
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        "items": done + processed,
+        "processed": processed,
+        "resumed_from": done,
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "items_per_second": round(processed / elapsed, 2) if elapsed else 0.0
+    }
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Answer a JSONL or SQuAD/XQuAD file offline")
+    parser.add_argument("input", help="JSONL (question, context[, id, language, answers]) or SQuAD-format JSON")
+    parser.add_argument("output", help="JSONL output file")
+    parser.add_argument("--model-path", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--backend", default="torch", choices=("torch", "onnx"))
+    parser.add_argument("--precision", default="fp32", choices=("fp32", "bf16", "int8"))
+    parser.add_argument("--tiny", action="store_true", help="Use a tiny random mBART (for testing)")
+    parser.add_argument("--language", default="English", choices=("English", "German"),
+                        help="Language of items that do not name one")
+    parser.add_argument("--batch-size", type=int, default=16, help="Items per generate call")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Items per checkpoint")
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--num-beams", type=int, default=4)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    parser.add_argument("--no-count", action="store_true", help="Skip counting items up front (no ETA)")
+    args = parser.parse_args()
+
+    from .model_loader import ModelLoader
+
+    model_path = args.model_path
+    if args.tiny:
+        import tempfile
+        from .tiny_model import build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(save_path=model_path)
+
+    loader = ModelLoader(
+        model_path=model_path,
+        base_model=args.base_model,
+        precision=args.precision,
+        backend=args.backend
+    )
+    model, tokenizer = loader.load()
+    inference = QAInference(model, tokenizer, loader.device, num_beams=args.num_beams)
+
+    total = None if args.no_count else count_items(args.input, args.language)
+    if total is not None:
+        print(f"📄 {total:,} items in {args.input}")
+
+    stats = run_offline(
+        inference,
+        args.input,
+        args.output,
+        language=args.language,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        max_length=args.max_length,
+        resume=not args.restart,
+        total=total
+    )
+
+    print(f"\n✅ {stats['processed']:,} items answered in {stats['seconds']}s "
+          f"({stats['items_per_second']} items/s), {stats['errors']} errors")
+    print(f"💾 Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,568 @@
+"""
+ONNX Runtime Backend Module
+Exports the mBART encoder and decoder-with-past to ONNX and runs greedy or
+beam search through ONNX Runtime as a drop-in for model.generate
+
+Usage:
+    python -m app.onnx_backend models/merged_model models/onnx_model
+"""
+
+import argparse
+import inspect
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import torch
+from torch import nn
+from transformers import GenerationConfig, MBartConfig
+
+
+ENCODER_FILE = "encoder.onnx"
+DECODER_FILE = "decoder_with_past.onnx"
+ONNX_MANIFEST = "onnx_backend.json"
+
+
+def _split_heads(x: torch.Tensor, num_heads: int) -> torch.Tensor:
+    """[batch, seq, dim] -> [batch, heads, seq, head_dim]"""
+    batch, length, dim = x.shape
+    return x.view(batch, length, num_heads, dim // num_heads).transpose(1, 2)
+
+
+def _merge_heads(x: torch.Tensor) -> torch.Tensor:
+    """[batch, heads, seq, head_dim] -> [batch, seq, dim]"""
+    batch, heads, length, head_dim = x.shape
+    return x.transpose(1, 2).reshape(batch, length, heads * head_dim)
+
+
+def _attend(q: torch.Tensor, k: torch.Tensor, v: torch.Tensor, bias: Optional[torch.Tensor]) -> torch.Tensor:
+    """Scaled dot-product attention on pre-scaled queries"""
+    scores = torch.matmul(q, k.transpose(-1, -2))
+    if bias is not None:
+        scores = scores + bias
+    return torch.matmul(torch.softmax(scores, dim=-1), v)
+
+
+def _embed(stack: nn.Module, input_ids: torch.Tensor, past_length) -> torch.Tensor:
+    """Token + learned position embeddings of an mBART encoder/decoder stack"""
+    embeds = stack.embed_tokens(input_ids)
+    if not hasattr(stack.embed_tokens, "embed_scale"):
+        # Older transformers scale outside the embedding module
+        embeds = embeds * getattr(stack, "embed_scale", 1.0)
+
+    positions = torch.arange(input_ids.shape[1], device=input_ids.device) + past_length
+    positions = positions + stack.embed_positions.offset
+    return stack.layernorm_embedding(embeds + stack.embed_positions.weight[positions])
+
+
+def _padding_bias(attention_mask: torch.Tensor, dtype: torch.dtype) -> torch.Tensor:
+    """[batch, seq] mask -> additive [batch, 1, 1, seq] bias"""
+    return (1.0 - attention_mask[:, None, None, :].to(dtype)) * torch.finfo(dtype).min
+
+
+class _EncoderExport(nn.Module):
+    """Encoder graph: input ids -> cross-attention keys/values of every decoder layer"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.encoder = model.model.encoder
+        self.decoder_layers = model.model.decoder.layers
+        self.num_heads = model.config.encoder_attention_heads
+        self.decoder_heads = model.config.decoder_attention_heads
+
+    def forward(self, input_ids, attention_mask):
+        hidden = _embed(self.encoder, input_ids, 0)
+        bias = _padding_bias(attention_mask, hidden.dtype)
+
+        for layer in self.encoder.layers:
+            residual = hidden
+            x = layer.self_attn_layer_norm(hidden)
+            attn = layer.self_attn
+            x = _attend(
+                _split_heads(attn.q_proj(x) * attn.scaling, self.num_heads),
+                _split_heads(attn.k_proj(x), self.num_heads),
+                _split_heads(attn.v_proj(x), self.num_heads),
+                bias
+            )
+            hidden = residual + attn.out_proj(_merge_heads(x))
+
+            residual = hidden
+            x = layer.final_layer_norm(hidden)
+            hidden = residual + layer.fc2(layer.activation_fn(layer.fc1(x)))
+
+        hidden = self.encoder.layer_norm(hidden)
+
+        cross = []
+        for layer in self.decoder_layers:
+            cross.append(_split_heads(layer.encoder_attn.k_proj(hidden), self.decoder_heads))
+            cross.append(_split_heads(layer.encoder_attn.v_proj(hidden), self.decoder_heads))
+        return tuple(cross)
+
+
+class _DecoderExport(nn.Module):
+    """Decoder graph: one new token + past self-attention cache -> logits and updated cache"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.decoder = model.model.decoder
+        self.lm_head = model.lm_head
+        self.register_buffer("final_logits_bias", model.final_logits_bias.clone())
+        self.num_heads = model.config.decoder_attention_heads
+        self.num_layers = len(self.decoder.layers)
+
+    def forward(self, input_ids, encoder_attention_mask, *cache):
+        past = cache[:2 * self.num_layers]
+        cross = cache[2 * self.num_layers:]
+
+        hidden = _embed(self.decoder, input_ids, past[0].shape[2])
+        cross_bias = _padding_bias(encoder_attention_mask, hidden.dtype)
+
+        presents = []
+        for i, layer in enumerate(self.decoder.layers):
+            residual = hidden
+            x = layer.self_attn_layer_norm(hidden)
+            attn = layer.self_attn
+            key = torch.cat([past[2 * i], _split_heads(attn.k_proj(x), self.num_heads)], dim=2)
+            value = torch.cat([past[2 * i + 1], _split_heads(attn.v_proj(x), self.num_heads)], dim=2)
+            presents.extend([key, value])
+            x = _attend(_split_heads(attn.q_proj(x) * attn.scaling, self.num_heads), key, value, None)
+            hidden = residual + attn.out_proj(_merge_heads(x))
+
+            residual = hidden
+            x = layer.encoder_attn_layer_norm(hidden)
+            attn = layer.encoder_attn
+            x = _attend(
+                _split_heads(attn.q_proj(x) * attn.scaling, self.num_heads),
+                cross[2 * i],
+                cross[2 * i + 1],
+                cross_bias
+            )
+            hidden = residual + attn.out_proj(_merge_heads(x))
+
+            residual = hidden
+            x = layer.final_layer_norm(hidden)
+            hidden = residual + layer.fc2(layer.activation_fn(layer.fc1(x)))
+
+        hidden = self.decoder.layer_norm(hidden)
+        logits = self.lm_head(hidden[:, -1, :]) + self.final_logits_bias[0]
+        return (logits, *presents)
+
+
+def _cache_names(prefix: str, num_layers: int) -> List[str]:
+    names = []
+    for i in range(num_layers):
+        names.extend([f"{prefix}_key_{i}", f"{prefix}_value_{i}"])
+    return names
+
+
+def export_onnx(model, tokenizer, output_path: str, opset_version: int = 17) -> Path:
+    """
+    Export a (merged) mBART model to an ONNX Runtime backend directory
+
+    Args:
+        model: MBartForConditionalGeneration (a PEFT model is merged first)
+        tokenizer: Matching tokenizer, saved next to the graphs
+        output_path: Directory to write encoder/decoder graphs to
+        opset_version: ONNX opset
+
+    Returns:
+        Output directory
+    """
+    from peft import PeftModel
+
+    if isinstance(model, PeftModel):
+        model = model.merge_and_unload()
+    model = model.to("cpu").float().eval()
+
+    output = Path(output_path)
+    output.mkdir(parents=True, exist_ok=True)
+
+    config = model.config
+    num_layers = config.decoder_layers
+    heads = config.decoder_attention_heads
+    head_dim = config.d_model // heads
+
+    # Trace with the TorchScript exporter (dynamic axes, no torch.export constraints)
+    legacy = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+
+    input_ids = torch.tensor([[0, 5, 6, 7, 2], [0, 5, 6, 2, 1]], dtype=torch.long)
+    attention_mask = torch.tensor([[1, 1, 1, 1, 1], [1, 1, 1, 1, 0]], dtype=torch.long)
+
+    print("⏳ Exporting encoder...")
+    encoder = _EncoderExport(model).eval()
+    cross_names = _cache_names("cross", num_layers)
+    with torch.no_grad():
+        cross = encoder(input_ids, attention_mask)
+        torch.onnx.export(
+            encoder,
+            (input_ids, attention_mask),
+            str(output / ENCODER_FILE),
+            input_names=["input_ids", "attention_mask"],
+            output_names=cross_names,
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "source"},
+                "attention_mask": {0: "batch", 1: "source"},
+                **{name: {0: "batch", 2: "source"} for name in cross_names}
+            },
+            opset_version=opset_version,
+            **legacy
+        )
+
+    print("⏳ Exporting decoder with past...")
+    decoder = _DecoderExport(model).eval()
+    past_names = _cache_names("past", num_layers)
+    present_names = _cache_names("present", num_layers)
+    past = [torch.zeros(2, heads, 2, head_dim) for _ in past_names]
+    with torch.no_grad():
+        torch.onnx.export(
+            decoder,
+            (input_ids[:, :1], attention_mask, *past, *cross),
+            str(output / DECODER_FILE),
+            input_names=["input_ids", "encoder_attention_mask"] + past_names + cross_names,
+            output_names=["logits"] + present_names,
+            dynamic_axes={
+                "input_ids": {0: "batch"},
+                "encoder_attention_mask": {0: "batch", 1: "source"},
+                "logits": {0: "batch"},
+                **{name: {0: "batch", 2: "past"} for name in past_names},
+                **{name: {0: "batch", 2: "source"} for name in cross_names},
+                **{name: {0: "batch", 2: "total"} for name in present_names}
+            },
+            opset_version=opset_version,
+            **legacy
+        )
+
+    config.save_pretrained(output)
+    model.generation_config.save_pretrained(output)
+    tokenizer.save_pretrained(output)
+    with open(output / ONNX_MANIFEST, "w") as f:
+        json.dump({"parameters": model.num_parameters(), "opset_version": opset_version}, f, indent=2)
+
+    print(f"✅ ONNX backend written to: {output}")
+    return output
+
+
+@dataclass
+class OnnxGenerateOutput:
+    """Subset of transformers' generate output used by QAInference"""
+
+    sequences: torch.Tensor
+    sequences_scores: Optional[torch.Tensor] = None
+    scores: Optional[Tuple[torch.Tensor, ...]] = None
+
+
+class OnnxSeq2SeqModel:
+    """
+    mBART served through ONNX Runtime with a model.generate compatible API
+
+    Supports greedy and beam search with a self-attention KV cache and the
+    forced BOS/EOS and min-length rules of transformers' generate, so
+    QAInference can use it in place of the PyTorch model.
+    """
+
+    def __init__(self, model_path: str, num_threads: int = None, providers: List[str] = None):
+        """
+        Initialize OnnxSeq2SeqModel
+
+        Args:
+            model_path: Directory written by export_onnx
+            num_threads: ONNX Runtime intra-op threads (None = runtime default)
+            providers: Execution providers (defaults to CPU)
+        """
+        import onnxruntime as ort
+
+        path = Path(model_path)
+        self.config = MBartConfig.from_pretrained(path)
+        self.generation_config = GenerationConfig.from_pretrained(path)
+        self.device = torch.device("cpu")
+
+        manifest = path / ONNX_MANIFEST
+        self._parameters = json.loads(manifest.read_text())["parameters"] if manifest.exists() else 0
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        providers = providers or ["CPUExecutionProvider"]
+        self.encoder = ort.InferenceSession(str(path / ENCODER_FILE), options, providers=providers)
+        self.decoder = ort.InferenceSession(str(path / DECODER_FILE), options, providers=providers)
+
+        self.num_layers = self.config.decoder_layers
+        self.num_heads = self.config.decoder_attention_heads
+        self.head_dim = self.config.d_model // self.num_heads
+        self._past_names = _cache_names("past", self.num_layers)
+        self._cross_names = _cache_names("cross", self.num_layers)
+
+    @classmethod
+    def from_pretrained(cls, model_path: str, **kwargs) -> "OnnxSeq2SeqModel":
+        """Load an exported ONNX backend directory"""
+        return cls(model_path, **kwargs)
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        if torch.device(device).type != "cpu":
+            raise ValueError("The ONNX Runtime backend runs on CPU tensors only")
+        return self
+
+    def num_parameters(self) -> int:
+        return self._parameters
+
+    def generate(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor = None,
+        max_length: int = None,
+        num_beams: int = None,
+        early_stopping=None,
+        forced_bos_token_id: int = None,
+        output_scores: bool = False,
+        return_dict_in_generate: bool = False,
+        prefix_allowed_tokens_fn: Callable = None,
+        stopping_criteria: List[Callable] = None,
+        streamer=None
+    ):
+        """
+        Generate answer token ids like transformers' model.generate
+
+        Args:
+            input_ids: [batch, source] token ids
+            attention_mask: [batch, source] padding mask
+            max_length: Maximum decoder length including the start token
+            num_beams: 1 for greedy search, >1 for beam search
+            early_stopping: Beam search stops once num_beams hypotheses finished
+            forced_bos_token_id: Token forced as the first generated token
+            output_scores: Return length-normalized beam scores (beam search)
+                or the processed logits of every step (greedy search)
+            return_dict_in_generate: Return an OnnxGenerateOutput
+            prefix_allowed_tokens_fn: (batch_id, decoder ids) -> allowed next tokens
+            stopping_criteria: Callables (decoder ids, scores) -> per-row
+                stop flags, checked after every step; the search ends once
+                every row should stop
+            streamer: Receives the decoder start ids and then every new
+                token via put(), and end() when done (greedy search only)
+
+        Returns:
+            Generated ids, or OnnxGenerateOutput when return_dict_in_generate
+
+        Raises:
+            ValueError: A streamer with beam search
+        """
+        gen = self.generation_config
+        max_length = max_length or gen.max_length
+        num_beams = num_beams or gen.num_beams or 1
+        early_stopping = gen.early_stopping if early_stopping is None else early_stopping
+        forced_bos = forced_bos_token_id if forced_bos_token_id is not None else gen.forced_bos_token_id
+        if streamer is not None and num_beams > 1:
+            raise ValueError("A streamer needs greedy search (num_beams=1)")
+
+        input_ids = np.asarray(input_ids.cpu(), dtype=np.int64)
+        if attention_mask is None:
+            attention_mask = np.ones_like(input_ids)
+        else:
+            attention_mask = np.asarray(attention_mask.cpu(), dtype=np.int64)
+
+        cross = self.encoder.run(None, {"input_ids": input_ids, "attention_mask": attention_mask})
+
+        rules = (max_length, forced_bos, prefix_allowed_tokens_fn, stopping_criteria or [])
+        step_scores = sequence_scores = None
+        if num_beams == 1:
+            sequences, step_scores = self._greedy_search(cross, attention_mask, rules, streamer)
+        else:
+            sequences, sequence_scores = self._beam_search(
+                cross, attention_mask, rules, num_beams, early_stopping,
+                1.0 if gen.length_penalty is None else gen.length_penalty
+            )
+
+        sequences = torch.from_numpy(sequences)
+        if not return_dict_in_generate:
+            return sequences
+        if not output_scores:
+            return OnnxGenerateOutput(sequences=sequences)
+        return OnnxGenerateOutput(
+            sequences=sequences,
+            sequences_scores=torch.from_numpy(sequence_scores) if sequence_scores is not None else None,
+            scores=tuple(torch.from_numpy(s) for s in step_scores) if step_scores is not None else None
+        )
+
+    def _decode_step(self, tokens: np.ndarray, encoder_mask: np.ndarray, past: List[np.ndarray], cross: List[np.ndarray]):
+        """Run one decoder step, returning float32 logits and the new cache"""
+        feed = {"input_ids": tokens[:, None].astype(np.int64), "encoder_attention_mask": encoder_mask}
+        feed.update(zip(self._past_names, past))
+        feed.update(zip(self._cross_names, cross))
+        outputs = self.decoder.run(None, feed)
+        return outputs[0].astype(np.float32), outputs[1:]
+
+    def _empty_past(self, rows: int) -> List[np.ndarray]:
+        return [np.zeros((rows, self.num_heads, 0, self.head_dim), dtype=np.float32) for _ in self._past_names]
+
+    def _process(self, scores: np.ndarray, sequences: np.ndarray, rules: tuple, num_beams: int = 1) -> np.ndarray:
+        """Apply the min-length, prefix constraint and forced BOS/EOS rules of generate"""
+        gen = self.generation_config
+        eos = gen.eos_token_id if not isinstance(gen.eos_token_id, list) else gen.eos_token_id[0]
+        max_length, forced_bos, prefix_allowed_tokens_fn, _ = rules
+        cur_len = sequences.shape[1]
+
+        if gen.min_length and cur_len < gen.min_length:
+            scores[:, eos] = -np.inf
+        if prefix_allowed_tokens_fn is not None:
+            mask = np.full_like(scores, -np.inf)
+            for row, sequence in enumerate(sequences):
+                mask[row, prefix_allowed_tokens_fn(row // num_beams, torch.from_numpy(sequence))] = 0
+            constrained = scores + mask
+            # Items whose allowed tokens are all -inf fall back to the bare mask
+            unsatisfiable = np.isneginf(constrained.max(axis=-1)).reshape(-1, num_beams).all(axis=-1)
+            scores = np.where(np.repeat(unsatisfiable, num_beams)[:, None], mask, constrained)
+        if forced_bos is not None and cur_len == 1:
+            scores[:, :] = -np.inf
+            scores[:, forced_bos] = 0
+        if gen.forced_eos_token_id is not None and cur_len == max_length - 1:
+            scores[:, :] = -np.inf
+            scores[:, gen.forced_eos_token_id] = 0
+        return scores
+
+    @staticmethod
+    def _should_stop(sequences: np.ndarray, rules: tuple) -> bool:
+        """True once a stopping criterion asks every row to stop"""
+        input_ids = torch.from_numpy(sequences)
+        return any(bool(criterion(input_ids, None).all()) for criterion in rules[3])
+
+    def _greedy_search(self, cross, encoder_mask, rules, streamer=None):
+        gen = self.generation_config
+        batch = encoder_mask.shape[0]
+        eos, pad = self.config.eos_token_id, self.config.pad_token_id
+        max_length = rules[0]
+
+        sequences = np.full((batch, 1), gen.decoder_start_token_id, dtype=np.int64)
+        unfinished = np.ones(batch, dtype=bool)
+        past = self._empty_past(batch)
+        step_scores = []
+        if streamer is not None:
+            streamer.put(torch.from_numpy(sequences))
+
+        while sequences.shape[1] < max_length and unfinished.any():
+            logits, past = self._decode_step(sequences[:, -1], encoder_mask, past, cross)
+            logits = self._process(logits, sequences, rules)
+            step_scores.append(logits)
+            tokens = np.where(unfinished, logits.argmax(axis=-1), pad)
+            sequences = np.concatenate([sequences, tokens[:, None]], axis=1)
+            unfinished &= tokens != eos
+            if streamer is not None:
+                streamer.put(torch.from_numpy(tokens))
+            if self._should_stop(sequences, rules):
+                break
+
+        if streamer is not None:
+            streamer.end()
+        return sequences, step_scores
+
+    def _beam_search(self, cross, encoder_mask, rules, num_beams, early_stopping, length_penalty):
+        """Vectorized beam search following transformers' implementation"""
+        gen = self.generation_config
+        max_length = rules[0]
+        batch = encoder_mask.shape[0]
+        eos, pad = self.config.eos_token_id, self.config.pad_token_id
+        keep = 2 * num_beams
+        rows = np.arange(batch)[:, None]
+
+        # Expand encoder outputs to one copy per beam
+        cross = [np.repeat(c, num_beams, axis=0) for c in cross]
+        encoder_mask = np.repeat(encoder_mask, num_beams, axis=0)
+        past = self._empty_past(batch * num_beams)
+
+        cur_len = 1
+        running = np.full((batch, num_beams, max_length), pad, dtype=np.int64)
+        running[:, :, 0] = gen.decoder_start_token_id
+        running_scores = np.zeros((batch, num_beams), dtype=np.float32)
+        running_scores[:, 1:] = -1e9
+
+        sequences = running.copy()
+        lengths = np.ones((batch, num_beams), dtype=np.int64)
+        beam_scores = np.full((batch, num_beams), -1e9, dtype=np.float32)
+        finished = np.zeros((batch, num_beams), dtype=bool)
+        improvable = np.ones((batch, 1), dtype=bool)
+        top_mask = np.arange(keep) < num_beams
+
+        while True:
+            logits, past = self._decode_step(running[:, :, cur_len - 1].reshape(-1), encoder_mask, past, cross)
+            log_probs = logits - logits.max(axis=-1, keepdims=True)
+            log_probs = log_probs - np.log(np.exp(log_probs).sum(axis=-1, keepdims=True))
+            log_probs = self._process(log_probs, running[:, :, :cur_len].reshape(-1, cur_len), rules, num_beams)
+            vocab = log_probs.shape[-1]
+
+            accumulated = (log_probs.reshape(batch, num_beams, vocab) + running_scores[:, :, None]).reshape(batch, -1)
+            top_indices = np.argsort(-accumulated, axis=-1, kind="stable")[:, :keep]
+            top_scores = np.take_along_axis(accumulated, top_indices, axis=-1)
+            top_beams = top_indices // vocab
+            top_tokens = top_indices % vocab
+
+            top_sequences = running[rows, top_beams]
+            top_sequences[:, :, cur_len] = top_tokens
+            hits = (top_tokens == eos) | (cur_len + 1 >= max_length)
+
+            # Best unfinished candidates continue
+            continuing = top_scores + hits.astype(np.float32) * -1e9
+            next_indices = np.argsort(-continuing, axis=-1, kind="stable")[:, :num_beams]
+            running = np.take_along_axis(top_sequences, next_indices[:, :, None], axis=1)
+            running_scores = np.take_along_axis(continuing, next_indices, axis=-1)
+            source_beams = np.take_along_axis(top_beams, next_indices, axis=-1)
+
+            # Finished candidates compete with the stored hypotheses
+            just_finished = hits & top_mask[None, :]
+            normalized = top_scores / ((cur_len + 1 - 1) ** length_penalty)
+            if early_stopping is True:
+                normalized = normalized + finished.all(axis=-1, keepdims=True) * -1e9
+            normalized = normalized + (~improvable) * -1e9
+            normalized = normalized + (~just_finished) * -1e9
+
+            merged_scores = np.concatenate([beam_scores, normalized], axis=1)
+            merged_indices = np.argsort(-merged_scores, axis=-1, kind="stable")[:, :num_beams]
+            sequences = np.take_along_axis(
+                np.concatenate([sequences, top_sequences], axis=1), merged_indices[:, :, None], axis=1
+            )
+            lengths = np.take_along_axis(
+                np.concatenate([lengths, np.full((batch, keep), cur_len + 1)], axis=1), merged_indices, axis=1
+            )
+            beam_scores = np.take_along_axis(merged_scores, merged_indices, axis=-1)
+            finished = np.take_along_axis(np.concatenate([finished, just_finished], axis=1), merged_indices, axis=1)
+
+            # Reorder the KV cache to follow the surviving beams
+            order = (rows * num_beams + source_beams).reshape(-1)
+            past = [p[order] for p in past]
+
+            cur_len += 1
+            best_running = running_scores[:, :1] / ((cur_len - 1) ** length_penalty)
+            worst_finished = np.where(finished, beam_scores.min(axis=1, keepdims=True), -1e9)
+            improvable = improvable & (best_running > worst_finished).any(axis=-1, keepdims=True)
+
+            open_beams = not (finished.all() and early_stopping is True)
+            if not (improvable.any() and open_beams and not hits.all()):
+                break
+            if self._should_stop(running[:, :, :cur_len].reshape(-1, cur_len), rules):
+                break
+
+        output_length = int(lengths[:, 0].max())
+        return sequences[:, 0, :output_length], beam_scores[:, 0].astype(np.float32)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export a merged mBART model for the ONNX Runtime backend")
+    parser.add_argument("model_path", help="Merged artifact (app.artifact) or LoRA adapter directory")
+    parser.add_argument("output_path", help="Directory to write the ONNX backend to")
+    parser.add_argument("--base-model", default=None, help="Base model for a LoRA adapter directory")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    from .model_loader import ModelLoader
+
+    loader = ModelLoader(model_path=args.model_path, base_model=args.base_model)
+    loader.device = torch.device("cpu")
+    model, tokenizer = loader.load()
+    export_onnx(model, tokenizer, args.output_path, args.opset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Precision Check Module
+Compares fp32, bf16 and int8 inference on a fixed QA sample set
+
+Usage:
+    python -m app.precision models/multilingual_model --modes fp32 bf16 int8
+"""
+
+import argparse
+import copy
+import json
+import time
+from typing import Dict, List, Sequence
+
+import torch
+
+from .inference import QAInference
+from .model_loader import PRECISION_MODES, ModelLoader, apply_precision
+from .utils import exact_match_score, f1_score, get_memory_usage
+
+
+# Fixed sample set used to measure accuracy drift between precision modes
+PRECISION_CHECK_SAMPLES = [
+    {
+        "question": "What is the capital of France?",
+        "context": "Paris is the capital and most populous city of France. It has an area of 105 square kilometres and a population of 2,165,423 residents.",
+        "language": "English",
+        "answer": "Paris"
+    },
+    {
+        "question": "When was the Eiffel Tower built?",
+        "context": "The Eiffel Tower was constructed from 1887 to 1889 as the entrance arch to the 1889 World's Fair.",
+        "language": "English",
+        "answer": "1887 to 1889"
+    },
+    {
+        "question": "What is the largest planet in our solar system?",
+        "context": "Jupiter is the largest planet in our solar system. It is a gas giant with a mass more than two and a half times that of all the other planets combined.",
+        "language": "English",
+        "answer": "Jupiter"
+    },
+    {
+        "question": "How many residents does Paris have?",
+        "context": "Paris is the capital and most populous city of France. It has an area of 105 square kilometres and a population of 2,165,423 residents.",
+        "language": "English",
+        "answer": "2,165,423"
+    },
+    {
+        "question": "Was ist die Hauptstadt von Deutschland?",
+        "context": "Berlin ist die Hauptstadt und größte Stadt Deutschlands mit etwa 3,7 Millionen Einwohnern.",
+        "language": "German",
+        "answer": "Berlin"
+    },
+    {
+        "question": "Wann wurde der Berliner Fernsehturm gebaut?",
+        "context": "Der Berliner Fernsehturm wurde zwischen 1965 und 1969 erbaut und ist eines der bekanntesten Wahrzeichen Berlins.",
+        "language": "German",
+        "answer": "zwischen 1965 und 1969"
+    },
+    {
+        "question": "Was ist der größte Planet in unserem Sonnensystem?",
+        "context": "Jupiter ist der größte Planet in unserem Sonnensystem. Er ist ein Gasriese mit einer Masse, die mehr als zweieinhalb Mal so groß ist wie die aller anderen Planeten zusammen.",
+        "language": "German",
+        "answer": "Jupiter"
+    },
+    {
+        "question": "Wie viele Einwohner hat Berlin?",
+        "context": "Berlin ist die Hauptstadt und größte Stadt Deutschlands mit etwa 3,7 Millionen Einwohnern.",
+        "language": "German",
+        "answer": "etwa 3,7 Millionen"
+    }
+]
+
+
+def model_size_mb(model) -> float:
+    """
+    Size of a model's weights, counting shared tensors once
+
+    Handles the packed weights of dynamically quantized Linear layers.
+
+    Args:
+        model: Loaded model
+
+    Returns:
+        Weight size in megabytes
+    """
+    seen = set()
+    total = 0
+
+    def add(value):
+        nonlocal total
+        if isinstance(value, (tuple, list)):
+            for item in value:
+                add(item)
+        elif isinstance(value, torch.Tensor):
+            key = (value.data_ptr(), value.numel())
+            if key not in seen:
+                seen.add(key)
+                total += value.numel() * value.element_size()
+
+    for value in model.state_dict().values():
+        add(value)
+
+    return total / (1024 * 1024)
+
+
+def run_samples(inference: QAInference, samples: List[Dict], warmup: int = 1) -> Dict:
+    """
+    Answer the sample set one request at a time, as served
+
+    Args:
+        inference: QAInference instance
+        samples: Items with question, context, language and answer
+        warmup: Untimed passes over the first sample
+
+    Returns:
+        Predictions, EM, F1 and average latency
+    """
+    for _ in range(warmup):
+        first = samples[0]
+        inference.answer_question(first["question"], first["context"], first["language"])
+
+    predictions = []
+    latencies = []
+    for sample in samples:
+        start = time.perf_counter()
+        answer, _ = inference.answer_question(sample["question"], sample["context"], sample["language"])
+        latencies.append(time.perf_counter() - start)
+        predictions.append(answer)
+
+    return {
+        "predictions": predictions,
+        "errors": sum(p.startswith("❌ Error") for p in predictions),
+        "exact_match": sum(exact_match_score(p, s["answer"]) for p, s in zip(predictions, samples)) / len(samples),
+        "f1": sum(f1_score(p, s["answer"]) for p, s in zip(predictions, samples)) / len(samples),
+        "avg_latency_ms": 1000 * sum(latencies) / len(latencies)
+    }
+
+
+def check_precision_modes(
+    model,
+    tokenizer,
+    device,
+    modes: Sequence[str] = PRECISION_MODES,
+    samples: List[Dict] = None
+) -> Dict[str, Dict]:
+    """
+    Run the fixed sample set in each precision mode and compare against fp32
+
+    Args:
+        model: Loaded fp32 model
+        tokenizer: Loaded tokenizer
+        device: Torch device
+        modes: Precision modes to check
+        samples: QA items (defaults to PRECISION_CHECK_SAMPLES)
+
+    Returns:
+        Report per mode with EM/F1, drift vs fp32, latency and memory gains
+    """
+    samples = samples or PRECISION_CHECK_SAMPLES
+    modes = ["fp32"] + [mode for mode in modes if mode != "fp32"]
+
+    report = {}
+    baseline = None
+    for mode in modes:
+        print(f"⏳ Checking {mode}...")
+        variant = model if mode == "fp32" else apply_precision(copy.deepcopy(model), mode)
+        variant_device = torch.device("cpu") if mode == "int8" else device
+        variant = variant.to(variant_device)
+
+        result = run_samples(QAInference(variant, tokenizer, variant_device), samples)
+        result["model_size_mb"] = model_size_mb(variant)
+        result["rss_mb"] = get_memory_usage()["rss_mb"]
+
+        if baseline is None:
+            baseline = result
+
+        result["em_drift"] = result["exact_match"] - baseline["exact_match"]
+        result["f1_drift"] = result["f1"] - baseline["f1"]
+        result["agreement_with_fp32"] = sum(
+            exact_match_score(p, b) for p, b in zip(result["predictions"], baseline["predictions"])
+        ) / len(samples)
+        result["speedup"] = baseline["avg_latency_ms"] / result["avg_latency_ms"]
+        result["size_reduction"] = 1 - result["model_size_mb"] / baseline["model_size_mb"]
+
+        report[mode] = {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in result.items()
+        }
+
+        if variant is not model:
+            del variant
+
+    return report
+
+
+def print_report(report: Dict[str, Dict]):
+    """Print a precision check report as a table"""
+    print("\n" + "=" * 80)
+    print("🎯 PRECISION CHECK")
+    print("=" * 80)
+    print(f"{'Mode':<6} {'EM':>6} {'F1':>6} {'ΔEM':>7} {'ΔF1':>7} {'Agree':>6} "
+          f"{'Latency':>10} {'Speedup':>8} {'Size MB':>9}")
+    for mode, result in report.items():
+        if result["errors"]:
+            print(f"⚠️ {mode}: {result['errors']} of {len(result['predictions'])} samples failed")
+        print(f"{mode:<6} {result['exact_match']:>6.3f} {result['f1']:>6.3f} "
+              f"{result['em_drift']:>+7.3f} {result['f1_drift']:>+7.3f} "
+              f"{result['agreement_with_fp32']:>6.2f} {result['avg_latency_ms']:>8.1f}ms "
+              f"{result['speedup']:>7.2f}x {result['model_size_mb']:>9.1f}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Compare inference precision modes on a fixed QA sample set")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--modes", nargs="+", default=list(PRECISION_MODES), choices=PRECISION_MODES)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    loader = ModelLoader(model_path=args.model_path, base_model=args.base_model)
+    model, tokenizer = loader.load()
+
+    report = check_precision_modes(model, tokenizer, loader.device, args.modes)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,729 @@
+"""
+Pre-fork Serving Module
+Loads the model once and serves it from forked worker processes that share
+the weights copy-on-write, with per-worker torch threads and
+least-outstanding-requests load balancing
+
+Usage:
+    python -m app.prefork models/multilingual_model --workers 1 2 4 8 --threads-per-worker 4
+    python -m app.prefork --tiny --workers 1 2 4 --output prefork_report.json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Sequence, Tuple
+
+import torch
+
+from .cancellation import CancelToken, RequestAborted, abort_from_answer
+from .metrics import InferenceHooks
+
+# Events the parent reports itself for single questions
+REQUEST_EVENTS = ("on_request", "on_error", "on_abort")
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """
+    Resident memory of a process, including its share of shared pages
+
+    RSS counts shared weights once per process; PSS divides each shared page
+    among the processes mapping it, so the PSS of all workers adds up to the
+    real footprint. USS is the memory private to the process.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Dictionary with rss_mb, pss_mb and uss_mb (None where unavailable)
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            for line in smaps:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024
+    except OSError:
+        return {"rss_mb": None, "pss_mb": None, "uss_mb": None}
+
+    return {
+        "rss_mb": round(fields.get("Rss", 0.0), 1),
+        "pss_mb": round(fields.get("Pss", 0.0), 1),
+        "uss_mb": round(fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0), 1)
+    }
+
+
+def _tokens(deadlines: Sequence[float]) -> List[CancelToken]:
+    """Rebuild request deadlines in a worker (cancellation does not cross processes)"""
+    return [CancelToken(deadline=deadline) if deadline is not None else None for deadline in deadlines]
+
+
+class _HookRecorder(InferenceHooks):
+    """
+    Worker-side hook that records events so the parent can replay them on
+    its own hooks (the forked copies of the parent's hooks are never read)
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def on_stage(self, stage: str, seconds: float):
+        self.events.append(("on_stage", (stage, seconds)))
+
+    def on_encode(self, items: int, tokens_in: int, truncated: int):
+        self.events.append(("on_encode", (items, tokens_in, truncated)))
+
+    def on_generate(self, items: int, num_beams: int, tokens_out: int):
+        self.events.append(("on_generate", (items, num_beams, tokens_out)))
+
+    def on_request(self, language: str, seconds: float):
+        self.events.append(("on_request", (language, seconds)))
+
+    def on_error(self, error: BaseException, language: str):
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(f"{type(error).__name__}: {error}")
+        self.events.append(("on_error", (error, language)))
+
+    def on_abort(self, reason: str, language: str):
+        self.events.append(("on_abort", (reason, language)))
+
+    def drain(self, request_events: bool = True) -> List[Tuple[str, tuple]]:
+        """Take the recorded events, optionally without the request-level ones"""
+        events, self.events = self.events, []
+        return [event for event in events if request_events or event[0] not in REQUEST_EVENTS]
+
+
+def _worker_main(inference_engine, threads: int, max_batch_size: int, connection):
+    """Worker loop: receive tasks, group queued single questions into one answer_batch call"""
+    torch.set_num_threads(threads)
+    recorder = _HookRecorder()
+    if inference_engine.hooks:
+        inference_engine.hooks = [recorder]
+    connection.send(("ready", os.getpid()))
+
+    stopping = False
+    while not stopping:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        batch = [task]
+        while task[0] == "question" and len(batch) < max_batch_size and connection.poll():
+            queued = connection.recv()
+            if queued is None:
+                stopping = True
+                break
+            batch.append(queued)
+
+        questions = [request for request in batch if request[0] == "question"]
+        others = [request for request in batch if request[0] != "question"]
+        answered = set()
+
+        def reply(request_ids, answers, request_events=True):
+            # The events of one engine call travel with its first reply
+            events = recorder.drain(request_events)
+            for request_id, answer in zip(request_ids, answers):
+                connection.send(("done", request_id, answer, None, events))
+                answered.add(request_id)
+                events = []
+
+        try:
+            # Single questions with the same max_length and adapter share one generate batch
+            def group_key(request):
+                return request[5], request[6] or ""
+
+            for (max_length, adapter), group in itertools.groupby(sorted(questions, key=group_key), key=group_key):
+                group = list(group)
+                answers = inference_engine.answer_batch(
+                    [request[2] for request in group],
+                    [request[3] for request in group],
+                    [request[4] for request in group],
+                    max_length=max_length,
+                    batch_size=max_batch_size,
+                    adapter=adapter or None,
+                    cancel_tokens=_tokens([request[7] for request in group])
+                )
+                # The parent reports request-level events of single questions itself
+                reply([request[1] for request in group], [answer for answer, _ in answers], request_events=False)
+
+            for kind, request_id, *args in others:
+                if kind == "batch":
+                    questions_, contexts, languages, max_length, adapter, deadlines = args
+                    answers = inference_engine.answer_batch(
+                        questions_, contexts, languages, max_length=max_length, adapter=adapter,
+                        cancel_tokens=_tokens(deadlines)
+                    )
+                    reply([request_id], [[answer for answer, _ in answers]])
+                elif kind == "long_context":
+                    question, context, language, kwargs, deadline = args
+                    result = inference_engine.answer_long_context(
+                        question, context, language, cancel_token=_tokens([deadline])[0], **kwargs
+                    )
+                    reply([request_id], [result])
+                else:
+                    questions_, context, language, kwargs, deadline = args
+                    rows = inference_engine.answer_questions(
+                        questions_, context, language, cancel_token=_tokens([deadline])[0], **kwargs
+                    )
+                    reply([request_id], [rows])
+        except Exception as e:
+            # Requests of groups that finished before the failure already have their reply
+            events = recorder.drain()
+            for request in batch:
+                if request[1] not in answered:
+                    connection.send(("done", request[1], None, f"{type(e).__name__}: {e}", events))
+                    events = []
+
+
+class _Worker:
+    """Parent-side handle of one forked worker"""
+
+    def __init__(self, process, connection):
+        self.process = process
+        self.connection = connection
+        self.send_lock = threading.Lock()
+        self.pid = None
+        self.in_flight = set()
+        self.served = 0
+
+
+class PreforkServer:
+    """
+    Multi-process serving in front of one loaded QAInference
+
+    The parent loads the model once and forks num_workers processes. The
+    weights are never written after loading, so their pages stay shared
+    copy-on-write between all workers (gc.freeze() keeps the garbage
+    collector from dirtying the pages of pre-fork objects). Each worker
+    pins its own torch thread count and talks to the parent over its own
+    pipe; every request goes to the worker with the fewest requests in
+    flight, and single questions queued on a worker are answered together
+    in one batched generate call. Nothing is shared between workers, so a
+    crashed worker only fails its own requests and is replaced.
+
+    It exposes answer_question/submit like MicroBatcher (plus
+    answer_batch), so it can back the Gradio interface or the HTTP API.
+    Long-context and multi-question requests run on a worker too, so the
+    parent never computes next to the pinned workers. Hook events fired
+    inside a worker (stage timings, token counts) are sent back with its
+    results and replayed on the engine's hooks in the parent. LoRA adapters registered before start()
+    are loaded lazily by each worker; adapters loaded or unloaded later
+    only change the parent.
+    """
+
+    def __init__(
+        self,
+        inference_engine,
+        num_workers: int = 2,
+        threads_per_worker: int = 1,
+        max_batch_size: int = 8
+    ):
+        """
+        Initialize PreforkServer
+
+        Args:
+            inference_engine: QAInference with the loaded model (CPU)
+            num_workers: Worker processes
+            threads_per_worker: torch intra-op threads per worker (workers x
+                threads should not exceed the physical cores)
+            max_batch_size: Queued single questions a worker answers together
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        self.inference_engine = inference_engine
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.max_batch_size = max_batch_size
+
+        self._context = multiprocessing.get_context("fork")
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._futures: Dict[int, Future] = {}
+        self._restarts = 0
+        self._dispatcher = None
+        self._running = False
+
+    def start(self, timeout: float = 120.0):
+        """Fork the workers and wait until all of them are ready"""
+        if self._running:
+            return self
+
+        # Move pre-fork objects out of the collector's reach so it does not
+        # touch (and copy) their pages in the workers
+        gc.collect()
+        gc.freeze()
+
+        self._workers = [self._spawn() for _ in range(self.num_workers)]
+        deadline = time.time() + timeout
+        for worker in self._workers:
+            if not worker.connection.poll(max(0.0, deadline - time.time())):
+                self._running = True
+                self.stop()
+                raise RuntimeError(f"Workers did not start within {timeout}s")
+            worker.pid = worker.connection.recv()[1]
+
+        self._running = True
+        self._dispatcher = threading.Thread(target=self._dispatch, name="prefork-dispatcher", daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Stop all workers (requests already sent to them finish first)"""
+        if not self._running:
+            return
+        self._running = False
+        for worker in self._workers:
+            try:
+                with worker.send_lock:
+                    worker.connection.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+        gc.unfreeze()
+
+        with self._lock:
+            futures, self._futures = self._futures, {}
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Server stopped"))
+
+    def _spawn(self) -> _Worker:
+        parent_end, child_end = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.inference_engine, self.threads_per_worker, self.max_batch_size, child_end),
+            daemon=True
+        )
+        process.start()
+        child_end.close()
+        return _Worker(process, parent_end)
+
+    def _dispatch(self):
+        """Resolve futures from worker results and replace crashed workers"""
+        while self._running or any(worker.in_flight for worker in self._workers):
+            connections = {worker.connection: worker for worker in self._workers}
+            for connection in multiprocessing.connection.wait(list(connections), timeout=0.5):
+                worker = connections[connection]
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    self._replace(worker)
+                    continue
+
+                if message[0] == "ready":
+                    worker.pid = message[1]
+                    continue
+                _, request_id, answer, error, events = message
+                for event, args in events:
+                    self.inference_engine.notify(event, *args)
+                with self._lock:
+                    future = self._futures.pop(request_id, None)
+                    if request_id in worker.in_flight:
+                        worker.in_flight.discard(request_id)
+                        worker.served += 1
+                if future is None:
+                    continue
+                if error is not None:
+                    future.set_exception(RuntimeError(error))
+                elif abort_from_answer(answer) is not None:
+                    future.set_exception(abort_from_answer(answer))
+                else:
+                    future.set_result(answer)
+
+            if not self._running and not any(worker.process.is_alive() for worker in self._workers):
+                return
+
+    def _replace(self, worker: _Worker):
+        """Fail the requests of a dead worker and fork a replacement"""
+        worker.process.join(1.0)
+        with self._lock:
+            futures = [self._futures.pop(request_id, None) for request_id in worker.in_flight]
+            worker.in_flight.clear()
+        for future in futures:
+            if future is not None:
+                future.set_exception(RuntimeError(f"Worker exited with code {worker.process.exitcode}"))
+        if not self._running:
+            return
+
+        # The parent has other threads by now: fork outside the lock so the
+        # child never inherits it held, and freeze the objects created since
+        # start() so the replacement shares their pages too
+        gc.freeze()
+        replacement = self._spawn()
+        with self._lock:
+            self._workers[self._workers.index(worker)] = replacement
+            self._restarts += 1
+        print(f"⚠️ Worker {worker.pid} exited with code {worker.process.exitcode}, restarted")
+
+    def _enqueue(self, task: Tuple) -> Future:
+        if not self._running:
+            self.start()
+        future = Future()
+        request_id = next(self._ids)
+        with self._lock:
+            # Least outstanding requests
+            worker = min(self._workers, key=lambda w: len(w.in_flight))
+            worker.in_flight.add(request_id)
+            self._futures[request_id] = future
+        try:
+            with worker.send_lock:
+                worker.connection.send((task[0], request_id) + task[1:])
+        except OSError as e:
+            with self._lock:
+                self._futures.pop(request_id, None)
+                worker.in_flight.discard(request_id)
+            future.set_exception(RuntimeError(f"Worker unavailable: {e}"))
+        return future
+
+    def submit(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        adapter: str = None,
+        cancel_token: CancelToken = None
+    ) -> Future:
+        """
+        Queue a question without blocking
+
+        Only the token's deadline reaches the worker; cancel() takes effect
+        if it is called before the request is sent.
+
+        Returns:
+            Future resolving to the answer text (or raising the worker error,
+            or RequestAborted when the request was cancelled or expired)
+        """
+        error = cancel_token.error() if cancel_token is not None else None
+        if error is not None:
+            future = Future()
+            future.set_exception(error)
+            return future
+        deadline = cancel_token.deadline if cancel_token is not None else None
+        return self._enqueue(("question", question, context, language, max_length, adapter, deadline))
+
+    def answer_question(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        max_length: int = 64,
+        adapter: str = None,
+        cancel_token: CancelToken = None
+    ) -> Tuple[str, str]:
+        """
+        Answer a question on the least busy worker
+
+        Returns:
+            Tuple of (answer, response_info)
+        """
+        if not question.strip() or not context.strip():
+            return "⚠️ Please provide both a question and context!", ""
+
+        def generate():
+            return self.submit(question, context, language, max_length, adapter, cancel_token).result()
+
+        engine = self.inference_engine
+        key = None
+        if engine.cache is not None:
+            key = engine.cache_key(question, context, language, max_length, adapter=adapter)
+        return engine.respond(generate, context, language, adapter, cancel_token, key)
+
+    def answer_batch(
+        self,
+        questions: List[str],
+        contexts: List[str],
+        languages="English",
+        max_length: int = 64,
+        batch_size: int = 16,
+        adapter: str = None,
+        cancel_tokens: Sequence[CancelToken] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Answer a list of questions, split into chunks across the workers
+
+        Returns:
+            List of (answer, response_info) tuples in input order
+        """
+        if isinstance(languages, str):
+            languages = [languages] * len(questions)
+        deadlines = [
+            token.deadline if token is not None else None for token in cancel_tokens or [None] * len(questions)
+        ]
+
+        futures = [
+            (start, self._enqueue((
+                "batch",
+                questions[start:start + batch_size],
+                contexts[start:start + batch_size],
+                languages[start:start + batch_size],
+                max_length,
+                adapter,
+                deadlines[start:start + batch_size]
+            )))
+            for start in range(0, len(questions), batch_size)
+        ]
+
+        results = []
+        for start, future in futures:
+            try:
+                answers = future.result()
+            except Exception as e:
+                answers = [f"❌ Error: {str(e)}"] * len(questions[start:start + batch_size])
+            for offset, answer in enumerate(answers):
+                # The worker's engine already reported aborts to the hooks
+                if answer.startswith(("❌", "⚠️")) or abort_from_answer(answer) is not None:
+                    results.append((answer, ""))
+                else:
+                    context = contexts[start + offset]
+                    language = languages[start + offset]
+                    results.append((answer, self.inference_engine.build_response_info(
+                        answer, context, language, self.inference_engine.adapter_details(adapter)
+                    )))
+        return results
+
+    def answer_long_context(
+        self,
+        question: str,
+        context: str,
+        language: str = "English",
+        cancel_token: CancelToken = None,
+        **kwargs
+    ) -> Tuple[str, str]:
+        """
+        Answer over a long context on the least busy worker
+
+        Takes the keyword arguments of QAInference.answer_long_context.
+
+        Returns:
+            Tuple of (answer, response_info)
+        """
+        try:
+            return self._run_on_worker("long_context", question, context, language, cancel_token, kwargs)
+        except RequestAborted as e:
+            self.inference_engine.notify("on_abort", e.reason, language)
+            return e.message, ""
+        except Exception as e:
+            self.inference_engine.notify("on_error", e, language)
+            return f"❌ Error: {str(e)}", ""
+
+    def answer_questions(
+        self,
+        questions: List[str],
+        context: str,
+        language: str = "English",
+        cancel_token: CancelToken = None,
+        **kwargs
+    ) -> List[Dict[str, str]]:
+        """
+        Answer several questions about one context on the least busy worker
+
+        Takes the keyword arguments of QAInference.answer_questions.
+
+        Returns:
+            One row per question with "Question", "Answer" and "Confidence"
+        """
+        try:
+            return self._run_on_worker("questions", questions, context, language, cancel_token, kwargs)
+        except Exception as e:
+            if isinstance(e, RequestAborted):
+                self.inference_engine.notify("on_abort", e.reason, language)
+                message = e.message
+            else:
+                self.inference_engine.notify("on_error", e, language)
+                message = f"❌ Error: {str(e)}"
+            questions = [question.strip() for question in questions if question.strip()]
+            return [{"Question": question, "Answer": message, "Confidence": ""} for question in questions]
+
+    def _run_on_worker(self, kind: str, question, context: str, language: str, cancel_token: CancelToken, kwargs):
+        """Send one engine call to a worker and wait for its result"""
+        if cancel_token is not None and cancel_token.error() is not None:
+            raise cancel_token.error()
+        deadline = cancel_token.deadline if cancel_token is not None else None
+        return self._enqueue((kind, question, context, language, kwargs, deadline)).result()
+
+    def get_stats(self) -> Dict:
+        """
+        Get per-worker load and memory statistics
+
+        Returns:
+            Dictionary with requests served per worker, restarts and the
+            memory of the parent and every worker
+        """
+        with self._lock:
+            in_flight = len(self._futures)
+            restarts = self._restarts
+            workers = [
+                {"worker": index, "pid": worker.pid, "served": worker.served, "in_flight": len(worker.in_flight)}
+                for index, worker in enumerate(self._workers)
+            ]
+
+        for worker in workers:
+            worker.update(process_memory(worker["pid"]))
+        parent = process_memory(os.getpid())
+        memory = [parent] + workers
+
+        def total(field):
+            values = [entry[field] for entry in memory]
+            return round(sum(values), 1) if None not in values else None
+
+        return {
+            "workers": workers,
+            "parent": parent,
+            "in_flight": in_flight,
+            "restarts": restarts,
+            "total_rss_mb": total("rss_mb"),
+            "total_pss_mb": total("pss_mb")
+        }
+
+
+def measure_scaling(
+    inference_engine,
+    worker_counts: Sequence[int],
+    threads_per_worker: int = 1,
+    requests: int = 64,
+    max_batch_size: int = 8,
+    samples: List[Dict] = None
+) -> Dict:
+    """
+    Measure aggregate throughput and memory for each worker count
+
+    Args:
+        inference_engine: QAInference with the loaded model
+        worker_counts: Worker counts to try
+        threads_per_worker: torch threads per worker
+        requests: Concurrent requests per measurement
+        max_batch_size: Queued questions a worker answers together
+        samples: QA items (defaults to the precision check samples)
+
+    Returns:
+        Report with the single-process baseline and one row per worker count
+    """
+    from .precision import PRECISION_CHECK_SAMPLES
+
+    samples = samples or PRECISION_CHECK_SAMPLES
+    workload = [samples[i % len(samples)] for i in range(requests)]
+    # Distinct contexts so no cache can answer a repeat
+    workload = [dict(item, context=f"{item['context']} ({i})") for i, item in enumerate(workload)]
+
+    single = process_memory(os.getpid())
+    report = {"cpu_count": os.cpu_count(), "threads_per_worker": threads_per_worker,
+              "single_process": single, "workers": {}}
+
+    for count in worker_counts:
+        print(f"⏳ {count} worker(s)")
+        server = PreforkServer(
+            inference_engine, num_workers=count, threads_per_worker=threads_per_worker,
+            max_batch_size=max_batch_size
+        ).start()
+        try:
+            # Warm up every worker
+            for future in [server.submit(item["question"], item["context"], item["language"]) for item in workload[:count * 2]]:
+                future.result()
+
+            start = time.perf_counter()
+            futures = [server.submit(item["question"], item["context"], item["language"]) for item in workload]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+
+            stats = server.get_stats()
+            naive = single["rss_mb"] * count if single["rss_mb"] is not None else None
+            report["workers"][count] = {
+                "throughput_items_per_s": round(requests / elapsed, 2),
+                "total_rss_mb": stats["total_rss_mb"],
+                "total_pss_mb": stats["total_pss_mb"],
+                "separate_processes_rss_mb": round(naive, 1) if naive is not None else None,
+                "served_per_worker": [worker["served"] for worker in stats["workers"]]
+            }
+        finally:
+            server.stop()
+
+    baseline = report["workers"][worker_counts[0]]["throughput_items_per_s"]
+    for row in report["workers"].values():
+        row["speedup"] = round(row["throughput_items_per_s"] / baseline, 2)
+    return report
+
+
+def print_report(report: Dict):
+    """Print a worker scaling report as a table"""
+    print("\n" + "=" * 80)
+    print("🍴 PRE-FORK SCALING")
+    print("=" * 80)
+    print(f"CPUs: {report['cpu_count']} | torch threads per worker: {report['threads_per_worker']} | "
+          f"single process RSS: {report['single_process']['rss_mb']} MB")
+    print(f"\n{'Workers':>8} {'Items/s':>9} {'Speedup':>8} {'Total PSS':>11} {'Sum of RSS':>11} {'N processes':>12}")
+    for count, row in report["workers"].items():
+        print(f"{count:>8} {row['throughput_items_per_s']:>9.2f} {row['speedup']:>7.2f}x "
+              f"{row['total_pss_mb']:>8.1f} MB {row['total_rss_mb']:>8.1f} MB "
+              f"{row['separate_processes_rss_mb']:>9.1f} MB")
+    print("\nTotal PSS is the real footprint (shared weights counted once); "
+          "N processes is the estimate for N independent copies.")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Measure pre-fork serving throughput and memory")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model")
+    parser.add_argument("--base-model", default=None, help="Base model the adapter is applied to")
+    parser.add_argument("--tiny", action="store_true", help="Use a tiny random mBART instead of model_path")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=64, help="Concurrent requests per measurement")
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    from .inference import QAInference
+    from .model_loader import ModelLoader
+
+    model_path = args.model_path
+    if args.tiny:
+        import tempfile
+        from .tiny_model import build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(save_path=model_path)
+
+    loader = ModelLoader(model_path=model_path, base_model=args.base_model)
+    model, tokenizer = loader.load()
+    inference = QAInference(model, tokenizer, loader.device)
+
+    report = measure_scaling(
+        inference,
+        args.workers,
+        threads_per_worker=args.threads_per_worker,
+        requests=args.requests,
+        max_batch_size=args.max_batch_size
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,676 @@
+"""
+Retrieval Module
+BM25 passage index on disk (SQLite) in front of the QA model: documents are
+split into passages and indexed incrementally, a question retrieves the
+top-k passages, and only those passages are answered in one batch
+
+Usage:
+    python -m app.retrieval build corpus.db data/squad_dev.json wiki_de.txt --language German
+    python -m app.retrieval query corpus.db "Where is the Eiffel Tower?" --answer
+    python -m app.retrieval query corpus.db --questions data/squad_dev.json --output retrieval_report.json
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .utils import is_grounded
+
+
+# Words per passage and words shared by consecutive passages of a document.
+# 120 words plus a question stay within the model's 256-token input.
+PASSAGE_WORDS = 120
+PASSAGE_OVERLAP = 20
+
+# Passages retrieved (and answered) per question
+TOP_K = 5
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Documents inserted per transaction while building
+COMMIT_EVERY = 500
+
+STOPWORDS = {
+    "English": frozenset("""
+        a an and are as at be been but by can did do does for from had has have he her his how i if in into is
+        it its of on or she so than that the their them then there these they this to was we were what when
+        where which who whom why will with you your
+    """.split()),
+    "German": frozenset("""
+        aber als am an auch auf aus bei bin bis da das dass dem den der des die dies diese dieser du durch ein
+        eine einem einen einer eines er es fur hat hatte ich ihr im in ist ja kann mit nach nicht noch nur ob
+        oder sich sie sind so uber um und uns von vor war waren was welche welcher wer wie wir wird wo zu zum zur
+    """.split())
+}
+
+# Suffixes stripped by the light stemmers, longest first
+SUFFIXES = {
+    "English": ("ing", "ed", "es", "ly", "s"),
+    "German": ("ern", "em", "en", "er", "es", "e", "n", "s")
+}
+
+# Shortest stem a suffix may leave behind
+MIN_STEM = 3
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str, language: str = "English") -> List[str]:
+    """
+    Split text into BM25 terms for English or German
+
+    Text is lowercased, German "ß" becomes "ss" and accents and umlauts
+    are folded (so "Brücke" matches "Brucke"). Stopwords of the language
+    are dropped and a light suffix stemmer maps inflections together
+    ("towers" → "tower", "Städten" → "stadt").
+
+    Args:
+        text: Text to tokenize
+        language: "English" or "German"
+
+    Returns:
+        Terms in order
+    """
+    stopwords = STOPWORDS.get(language, STOPWORDS["English"])
+    suffixes = SUFFIXES.get(language, SUFFIXES["English"])
+
+    # Stopwords are listed in this folded spelling too ("für" → "fur")
+    text = text.lower().replace("ß", "ss")
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+    terms = []
+    for word in _TOKEN_PATTERN.findall(text):
+        if word in stopwords:
+            continue
+        for suffix in suffixes:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+                word = word[:-len(suffix)]
+                break
+        terms.append(word)
+    return terms
+
+
+def split_passages(text: str, max_words: int = PASSAGE_WORDS, overlap: int = PASSAGE_OVERLAP) -> List[str]:
+    """
+    Split a document into overlapping word windows
+
+    Args:
+        text: Document text
+        max_words: Words per passage
+        overlap: Words shared by consecutive passages
+
+    Returns:
+        Passages in document order (one passage for short documents)
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return [" ".join(words)] if words else []
+
+    step = max(1, max_words - overlap)
+    passages = []
+    for start in range(0, len(words), step):
+        passages.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return passages
+
+
+def iter_documents(path: str, language: str = "English") -> Iterator[Dict]:
+    """
+    Stream documents from a corpus file
+
+    - .txt: one document per non-empty line
+    - .jsonl: one object per line with "text" (or "context"), and
+      optionally "id" and "language"
+    - .json: SQuAD/XQuAD format; every paragraph context is a document
+
+    Args:
+        path: Corpus file
+        language: Language of documents that do not name one
+
+    Yields:
+        Documents with id, text and language
+    """
+    name = os.path.basename(path)
+    if path.endswith(".txt"):
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield {"id": f"{name}:{line_number}", "text": line.strip(), "language": language}
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                yield {
+                    "id": str(item.get("id", f"{name}:{line_number}")),
+                    "text": item.get("text") or item["context"],
+                    "language": item.get("language", language)
+                }
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for article in data["data"]:
+            title = article.get("title", name)
+            for number, paragraph in enumerate(article["paragraphs"]):
+                yield {"id": f"{title}:{number}", "text": paragraph["context"], "language": language}
+
+
+class PassageIndex:
+    """
+    Incremental BM25 inverted index stored in one SQLite file
+
+    Postings live in a WITHOUT ROWID table clustered by term, so a query
+    reads only the postings of its own terms. Documents are keyed by a
+    hash of their text: adding a corpus again (or a file that overlaps an
+    earlier one) skips what is already indexed, so the index can be grown
+    file by file without rebuilding. Reads and writes are serialized by a
+    lock, so one index can be shared by request threads.
+    """
+
+    def __init__(self, path: str, k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Open (or create) an index
+
+        Args:
+            path: SQLite file
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY, doc_id TEXT NOT NULL, hash TEXT NOT NULL UNIQUE, language TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS passages (
+                id INTEGER PRIMARY KEY, document INTEGER NOT NULL, position INTEGER NOT NULL,
+                language TEXT NOT NULL, length INTEGER NOT NULL, text TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, passage INTEGER NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (term, passage)
+            ) WITHOUT ROWID;
+        """)
+        self._refresh_totals()
+
+    def _refresh_totals(self):
+        """Cache the passage count and average length per language (BM25 scores within one language)"""
+        self._totals = {
+            language: (count, total / count)
+            for language, count, total in self._connection.execute(
+                "SELECT language, COUNT(*), SUM(length) FROM passages GROUP BY language"
+            )
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+    def add_documents(
+        self,
+        documents: Iterable[Dict],
+        max_words: int = PASSAGE_WORDS,
+        overlap: int = PASSAGE_OVERLAP
+    ) -> Dict:
+        """
+        Split documents into passages and index them
+
+        Args:
+            documents: Dicts with text, and optionally id and language
+            max_words: Words per passage
+            overlap: Words shared by consecutive passages
+
+        Returns:
+            Build statistics (documents added/skipped, passages, terms,
+            seconds and passages per second)
+        """
+        stats = Counter()
+        start_time = time.perf_counter()
+        with self._lock:
+            cursor = self._connection.cursor()
+            try:
+                for document in documents:
+                    language = document.get("language", "English")
+                    digest = hashlib.sha1(f"{language}\n{document['text']}".encode("utf-8")).hexdigest()
+                    if cursor.execute("SELECT 1 FROM documents WHERE hash = ?", (digest,)).fetchone():
+                        stats["skipped"] += 1
+                        continue
+
+                    cursor.execute(
+                        "INSERT INTO documents (doc_id, hash, language) VALUES (?, ?, ?)",
+                        (str(document.get("id", digest[:12])), digest, language)
+                    )
+                    document_row = cursor.lastrowid
+                    for position, passage in enumerate(split_passages(document["text"], max_words, overlap)):
+                        terms = tokenize(passage, language)
+                        cursor.execute(
+                            "INSERT INTO passages (document, position, language, length, text) VALUES (?, ?, ?, ?, ?)",
+                            (document_row, position, language, len(terms), passage)
+                        )
+                        passage_row = cursor.lastrowid
+                        counts = Counter(terms)
+                        cursor.executemany(
+                            "INSERT INTO postings (term, passage, tf) VALUES (?, ?, ?)",
+                            [(term, passage_row, tf) for term, tf in counts.items()]
+                        )
+                        stats["passages"] += 1
+                        stats["terms"] += len(terms)
+
+                    stats["documents"] += 1
+                    if stats["documents"] % COMMIT_EVERY == 0:
+                        self._connection.commit()
+                self._connection.commit()
+            finally:
+                self._refresh_totals()
+
+        seconds = time.perf_counter() - start_time
+        return {
+            "documents_added": stats["documents"],
+            "documents_skipped": stats["skipped"],
+            "passages_added": stats["passages"],
+            "terms_indexed": stats["terms"],
+            "seconds": round(seconds, 3),
+            "passages_per_second": round(stats["passages"] / seconds, 1) if seconds else 0.0
+        }
+
+    def add_files(self, paths: Sequence[str], language: str = "English", **kwargs) -> Dict:
+        """
+        Index corpus files (see iter_documents for the formats)
+
+        Returns:
+            Build statistics summed over the files
+        """
+        def documents():
+            for path in paths:
+                yield from iter_documents(path, language)
+
+        return self.add_documents(documents(), **kwargs)
+
+    def search(self, query: str, language: str = "English", top_k: int = TOP_K) -> List[Dict]:
+        """
+        Rank passages of one language against a query with BM25
+
+        Args:
+            query: Question text
+            language: Language of the query (and of the passages searched)
+            top_k: Passages to return
+
+        Returns:
+            Best passages first, each with passage_id, doc_id, position,
+            score and text
+        """
+        terms = Counter(tokenize(query, language))
+        with self._lock:
+            passage_count, avg_length = self._totals.get(language, (0, 0.0))
+            if not terms or not passage_count:
+                return []
+
+            scores = Counter()
+            for term, query_tf in terms.items():
+                postings = self._connection.execute(
+                    "SELECT postings.passage, postings.tf, passages.length FROM postings "
+                    "JOIN passages ON passages.id = postings.passage "
+                    "WHERE postings.term = ? AND passages.language = ?",
+                    (term, language)
+                ).fetchall()
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (passage_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for passage, tf, length in postings:
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[passage] += query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+
+            best = scores.most_common(top_k)
+            if not best:
+                return []
+            rows = {
+                row[0]: row[1:]
+                for row in self._connection.execute(
+                    "SELECT passages.id, documents.doc_id, passages.position, passages.text FROM passages "
+                    "JOIN documents ON documents.id = passages.document WHERE passages.id IN "
+                    f"({','.join('?' * len(best))})",
+                    [passage for passage, _ in best]
+                )
+            }
+
+        return [
+            {
+                "passage_id": passage,
+                "doc_id": rows[passage][0],
+                "position": rows[passage][1],
+                "score": round(score, 4),
+                "text": rows[passage][2]
+            }
+            for passage, score in best
+        ]
+
+    def get_stats(self) -> Dict:
+        """
+        Get index size statistics
+
+        Returns:
+            Documents, passages per language, distinct terms, postings,
+            average passage length (terms) per language and file size in MB
+        """
+        with self._lock:
+            query = self._connection.execute
+            documents = query("SELECT COUNT(*) FROM documents").fetchone()[0]
+            terms, postings = query("SELECT COUNT(DISTINCT term), COUNT(*) FROM postings").fetchone()
+            page_count = query("PRAGMA page_count").fetchone()[0]
+            page_size = query("PRAGMA page_size").fetchone()[0]
+
+        return {
+            "path": self.path,
+            "documents": documents,
+            "passages": sum(count for count, _ in self._totals.values()),
+            "passages_by_language": {language: count for language, (count, _) in self._totals.items()},
+            "terms": terms,
+            "postings": postings,
+            "avg_passage_terms": {language: round(avg, 1) for language, (_, avg) in self._totals.items()},
+            "size_mb": round(page_count * page_size / (1024 * 1024), 2)
+        }
+
+
+class CorpusQA:
+    """
+    Answer questions against a PassageIndex instead of a given context
+
+    The top-k passages are answered in one answer_batch call; the best
+    answer is the one found verbatim in its passage (the grounding check),
+    then the one from the highest-ranked passage.
+    """
+
+    def __init__(self, index: PassageIndex, inference_engine, top_k: int = TOP_K, stats_window: int = 1000):
+        """
+        Args:
+            index: Passage index to search
+            inference_engine: QAInference, MicroBatcher or PreforkServer
+            top_k: Default passages answered per question
+            stats_window: Recent questions kept for latency percentiles
+        """
+        self.index = index
+        self.inference_engine = inference_engine
+        self.top_k = top_k
+        self._stats_lock = threading.Lock()
+        self._latencies = {stage: [] for stage in ("retrieve", "answer", "total")}
+        self._stats_window = stats_window
+
+    def answer(
+        self,
+        question: str,
+        language: str = "English",
+        top_k: int = None,
+        max_length: int = 64
+    ) -> Dict:
+        """
+        Retrieve passages for a question and answer over them
+
+        Args:
+            question: Question text
+            language: "English" or "German"
+            top_k: Passages to answer (default: self.top_k)
+            max_length: Maximum answer length
+
+        Returns:
+            Dict with answer, info (markdown details), source (the passage
+            the answer came from, or None), candidates (every retrieved
+            passage with its answer) and timings_ms
+        """
+        if not question.strip():
+            return {"answer": "⚠️ Please provide a question!", "info": "", "source": None,
+                    "candidates": [], "timings_ms": {}}
+
+        start_time = time.perf_counter()
+        passages = self.index.search(question, language, top_k or self.top_k)
+        retrieved_time = time.perf_counter()
+        if not passages:
+            return {"answer": "⚠️ No passage in the index matches this question.", "info": "", "source": None,
+                    "candidates": [], "timings_ms": {"retrieve": round((retrieved_time - start_time) * 1000, 2)}}
+
+        # MicroBatcher only batches single questions; use the engine behind it
+        engine = self.inference_engine
+        if not hasattr(engine, "answer_batch"):
+            engine = engine.inference_engine
+        results = engine.answer_batch(
+            [question] * len(passages), [passage["text"] for passage in passages], language, max_length=max_length
+        )
+        end_time = time.perf_counter()
+
+        candidates = [dict(passage, answer=answer, rank=rank) for rank, (passage, (answer, _)) in
+                      enumerate(zip(passages, results), start=1)]
+
+        def preference(candidate):
+            answer = candidate["answer"].strip()
+            valid = bool(answer) and not answer.startswith(("❌", "⚠️"))
+            return valid, valid and is_grounded(answer, candidate["text"]), -candidate["rank"]
+
+        best = max(candidates, key=preference)
+        timings = {
+            "retrieve": round((retrieved_time - start_time) * 1000, 2),
+            "answer": round((end_time - retrieved_time) * 1000, 2),
+            "total": round((end_time - start_time) * 1000, 2)
+        }
+        self._record(timings)
+
+        if not preference(best)[0]:
+            return {"answer": best["answer"], "info": "", "source": None, "candidates": candidates,
+                    "timings_ms": timings}
+
+        info = results[best["rank"] - 1][1]
+        details = {
+            "Source": f"{best['doc_id']} (passage {best['position'] + 1}, rank {best['rank']} of {len(passages)})",
+            "BM25 Score": best["score"],
+            "Retrieval": f"{timings['retrieve']:.1f} ms",
+            "Answering": f"{timings['answer']:.1f} ms"
+        }
+        info = info.rstrip() + "\n" + "".join(f"- **{name}**: {value}\n" for name, value in details.items())
+        return {"answer": best["answer"], "info": info, "source": best, "candidates": candidates,
+                "timings_ms": timings}
+
+    def _record(self, timings: Dict[str, float]):
+        with self._stats_lock:
+            for stage, values in self._latencies.items():
+                values.append(timings[stage])
+                del values[:-self._stats_window]
+
+    def get_stats(self) -> Dict:
+        """
+        Get query latency statistics
+
+        Returns:
+            Questions answered and avg/p50/p95 latency (ms) of retrieval,
+            answering and the whole request
+        """
+        with self._stats_lock:
+            latencies = {stage: sorted(values) for stage, values in self._latencies.items()}
+
+        def summary(values):
+            if not values:
+                return {"avg": 0.0, "p50": 0.0, "p95": 0.0}
+            return {
+                "avg": round(sum(values) / len(values), 2),
+                "p50": values[min(len(values) - 1, int(0.5 * len(values)))],
+                "p95": values[min(len(values) - 1, int(0.95 * len(values)))]
+            }
+
+        return {
+            "questions": len(latencies["total"]),
+            "latency_ms": {stage: summary(values) for stage, values in latencies.items()}
+        }
+
+
+def measure_queries(
+    index: PassageIndex,
+    questions: Sequence[Tuple[str, str]],
+    top_k: int = TOP_K,
+    gold_passages: Sequence[str] = None
+) -> Dict:
+    """
+    Measure retrieval latency (and recall when the source passages are known)
+
+    Args:
+        index: Index to query
+        questions: (question, language) pairs
+        top_k: Passages retrieved per question
+        gold_passages: Context each question was written for; counts a hit
+            when one retrieved passage contains its start
+
+    Returns:
+        Questions, latency avg/p50/p95 in ms and recall@k (or None)
+    """
+    latencies, hits = [], 0
+    for i, (question, language) in enumerate(questions):
+        start_time = time.perf_counter()
+        passages = index.search(question, language, top_k)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        if gold_passages is not None:
+            gold = " ".join(gold_passages[i].split())
+            head = " ".join(gold.split()[:PASSAGE_WORDS // 2])
+            hits += any(head in passage["text"] or passage["text"] in gold for passage in passages)
+
+    latencies.sort()
+    return {
+        "questions": len(latencies),
+        "top_k": top_k,
+        "latency_ms": {
+            "avg": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(latencies[len(latencies) // 2], 3) if latencies else 0.0,
+            "p95": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3) if latencies else 0.0
+        },
+        "recall_at_k": round(hits / len(latencies), 4) if gold_passages is not None and latencies else None
+    }
+
+
+def print_report(report: Dict):
+    """Print build, index and query statistics"""
+    print("\n" + "=" * 80)
+    print("🔎 BM25 PASSAGE INDEX")
+    print("=" * 80)
+    if "build" in report:
+        build = report["build"]
+        print(f"Build: {build['documents_added']:,} documents added ({build['documents_skipped']:,} already indexed), "
+              f"{build['passages_added']:,} passages in {build['seconds']}s "
+              f"({build['passages_per_second']:,} passages/s)")
+    index = report["index"]
+    print(f"Index: {index['documents']:,} documents | {index['passages']:,} passages {index['passages_by_language']} | "
+          f"{index['terms']:,} terms | {index['postings']:,} postings | {index['size_mb']} MB")
+    if "queries" in report:
+        queries = report["queries"]
+        latency = queries["latency_ms"]
+        print(f"Queries: {queries['questions']:,} | top-{queries['top_k']} retrieval avg {latency['avg']}ms "
+              f"p50 {latency['p50']}ms p95 {latency['p95']}ms"
+              + (f" | recall@{queries['top_k']} {queries['recall_at_k']:.3f}" if queries["recall_at_k"] is not None else ""))
+    for result in report.get("results", []):
+        print(f"\n❓ {result['question']}")
+        for passage in result["passages"]:
+            print(f"   {passage['score']:>7.3f}  {passage['doc_id']}: {passage['text'][:90]}...")
+        if "answer" in result:
+            print(f"   🎯 {result['answer']}  (from {result['source']})")
+        if "latency_ms" in result:
+            print(f"   ⏱️ {result['latency_ms']}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Build and query the BM25 passage index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Add corpus files to an index (created if missing)")
+    build.add_argument("index", help="SQLite index file")
+    build.add_argument("corpus", nargs="+", help=".txt (one document per line), .jsonl or SQuAD/XQuAD .json")
+    build.add_argument("--language", default="English", choices=("English", "German"),
+                       help="Language of documents that do not name one")
+    build.add_argument("--passage-words", type=int, default=PASSAGE_WORDS)
+    build.add_argument("--overlap", type=int, default=PASSAGE_OVERLAP)
+    build.add_argument("--output", help="Write the report to this JSON file")
+
+    query = commands.add_parser("query", help="Retrieve passages (and optionally answer) for questions")
+    query.add_argument("index", help="SQLite index file")
+    query.add_argument("question", nargs="*", help="Questions to ask")
+    query.add_argument("--questions", help="JSONL or SQuAD/XQuAD file; measures latency and recall@k")
+    query.add_argument("--language", default="English", choices=("English", "German"))
+    query.add_argument("--top-k", type=int, default=TOP_K)
+    query.add_argument("--answer", action="store_true", help="Answer the questions over the retrieved passages")
+    query.add_argument("--model-path", default="models/multilingual_model")
+    query.add_argument("--tiny", action="store_true", help="Answer with a tiny random mBART (no checkpoint needed)")
+    query.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    index = PassageIndex(args.index)
+    report = {}
+    if args.command == "build":
+        report["build"] = index.add_files(
+            args.corpus, args.language, max_words=args.passage_words, overlap=args.overlap
+        )
+    else:
+        if args.questions:
+            from .offline import iter_items
+
+            items = list(iter_items(args.questions, args.language))
+            report["queries"] = measure_queries(
+                index, [(item["question"], item["language"]) for item in items], args.top_k,
+                [item["context"] for item in items]
+            )
+
+        corpus_qa = None
+        if args.answer:
+            from .inference import QAInference
+            from .model_loader import ModelLoader
+
+            model_path = args.model_path
+            if args.tiny:
+                import tempfile
+
+                from .tiny_model import build_tiny_model
+
+                model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+                build_tiny_model(save_path=model_path)
+            loader = ModelLoader(model_path=model_path)
+            model, tokenizer = loader.load()
+            corpus_qa = CorpusQA(index, QAInference(model, tokenizer, loader.device), args.top_k)
+
+        report["results"] = []
+        for question in args.question:
+            if corpus_qa:
+                result = corpus_qa.answer(question, args.language)
+                report["results"].append({
+                    "question": question,
+                    "passages": result["candidates"],
+                    "answer": result["answer"],
+                    "source": result["source"]["doc_id"] if result["source"] else None,
+                    "latency_ms": result["timings_ms"]
+                })
+            else:
+                report["results"].append({
+                    "question": question,
+                    "passages": index.search(question, args.language, args.top_k)
+                })
+    report["index"] = index.get_stats()
+    index.close()
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
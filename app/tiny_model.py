@@ -0,0 +1,153 @@
+"""
+Tiny Model Module
+Builds a small randomly-initialized mBART-50 stand-in (model + tokenizer)
+so inference code can be exercised without downloading the checkpoint
+"""
+
+import io
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+import torch
+import transformers
+from transformers import MBartConfig, MBartForConditionalGeneration
+
+
+# Text the stand-in SentencePiece vocabulary is trained on
+TINY_CORPUS = [
+    "question: What is the capital of France? context: Paris is the capital and most populous city of France.",
+    "It has an area of 105 square kilometres and a population of 2,165,423 residents.",
+    "question: When was the Eiffel Tower built? context: The Eiffel Tower was constructed from 1887 to 1889 as the entrance arch to the 1889 World's Fair.",
+    "question: What is the largest planet in our solar system? context: Jupiter is the largest planet in our solar system.",
+    "It is a gas giant with a mass more than two and a half times that of all the other planets combined.",
+    "question: Was ist die Hauptstadt von Deutschland? context: Berlin ist die Hauptstadt und größte Stadt Deutschlands mit etwa 3,7 Millionen Einwohnern.",
+    "question: Wann wurde der Berliner Fernsehturm gebaut? context: Der Berliner Fernsehturm wurde zwischen 1965 und 1969 erbaut.",
+    "Er ist eines der bekanntesten Wahrzeichen Berlins. Jupiter ist der größte Planet in unserem Sonnensystem.",
+    "Who, where, how many, which year? 0123456789 - ( ) ; : ! ' \" ä ö ü ß é"
+]
+
+
+def build_tiny_tokenizer(vocab_size: int = 400):
+    """
+    Train a small SentencePiece vocabulary and wrap it as an mBART-50 tokenizer
+
+    Args:
+        vocab_size: Target number of SentencePiece pieces
+
+    Returns:
+        MBart50 tokenizer with all mBART-50 language codes
+    """
+    import sentencepiece as spm
+
+    model_proto = io.BytesIO()
+    spm.SentencePieceTrainer.train(
+        sentence_iterator=iter(TINY_CORPUS * 4),
+        model_writer=model_proto,
+        vocab_size=vocab_size,
+        model_type="unigram",
+        character_coverage=1.0,
+        hard_vocab_limit=False,
+        minloglevel=2
+    )
+
+    if int(transformers.__version__.split(".")[0]) >= 5:
+        # transformers 5 builds the tokenizer straight from the piece list
+        from transformers import MBart50TokenizerFast
+
+        processor = spm.SentencePieceProcessor(model_proto=model_proto.getvalue())
+        pieces = [
+            (processor.id_to_piece(i), processor.get_score(i))
+            for i in range(processor.get_piece_size())
+        ]
+        return MBart50TokenizerFast(vocab=pieces, src_lang="en_XX", tgt_lang="en_XX")
+
+    from transformers import MBart50Tokenizer
+
+    vocab_file = Path(tempfile.mkdtemp()) / "sentencepiece.bpe.model"
+    vocab_file.write_bytes(model_proto.getvalue())
+    return MBart50Tokenizer(vocab_file=str(vocab_file), src_lang="en_XX", tgt_lang="en_XX")
+
+
+def build_tiny_model(
+    seed: int = 0,
+    d_model: int = 32,
+    layers: int = 2,
+    save_path: str = None
+) -> Tuple[MBartForConditionalGeneration, object]:
+    """
+    Build a randomly-initialized mBART stand-in with the real architecture
+
+    Args:
+        seed: Random seed for the weights
+        d_model: Hidden size
+        layers: Number of encoder and decoder layers
+        save_path: Optionally save model and tokenizer here (a merged
+            artifact directory that ModelLoader can load)
+
+    Returns:
+        Tuple of (model, tokenizer)
+    """
+    tokenizer = build_tiny_tokenizer()
+
+    torch.manual_seed(seed)
+    config = MBartConfig(
+        vocab_size=len(tokenizer),
+        d_model=d_model,
+        encoder_layers=layers,
+        decoder_layers=layers,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=d_model * 2,
+        decoder_ffn_dim=d_model * 2,
+        max_position_embeddings=1024,
+        pad_token_id=tokenizer.pad_token_id,
+        bos_token_id=tokenizer.bos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        decoder_start_token_id=tokenizer.eos_token_id,
+        forced_eos_token_id=tokenizer.eos_token_id
+    )
+    model = MBartForConditionalGeneration(config)
+    model.eval()
+
+    if save_path:
+        model.save_pretrained(save_path)
+        tokenizer.save_pretrained(save_path)
+
+    return model, tokenizer
+
+
+def build_tiny_adapter(base_model_path: str, save_path: str, seed: int = 0, r: int = 4) -> str:
+    """
+    Save a randomly-initialized LoRA adapter for a saved tiny model
+
+    The LoRA matrices are random (not zero), so each seed changes the
+    answers and adapters can be told apart.
+
+    Args:
+        base_model_path: Directory written by build_tiny_model(save_path=...)
+        save_path: Adapter directory (also receives the tokenizer, like a
+            trained adapter directory)
+        seed: Random seed for the LoRA weights
+        r: LoRA rank
+
+    Returns:
+        save_path
+    """
+    from peft import LoraConfig, get_peft_model
+    from transformers import AutoTokenizer
+
+    model = MBartForConditionalGeneration.from_pretrained(base_model_path)
+    torch.manual_seed(seed)
+    model = get_peft_model(
+        model,
+        LoraConfig(
+            r=r,
+            lora_alpha=r * 2,
+            target_modules=["q_proj", "v_proj", "out_proj", "fc1", "fc2"],
+            init_lora_weights=False
+        )
+    )
+    model.save_pretrained(save_path)
+    AutoTokenizer.from_pretrained(base_model_path).save_pretrained(save_path)
+    return save_path
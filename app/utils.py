@@ -3,12 +3,26 @@ Utility Functions
 Helper functions for the QA system
 """
 
-import pandas as pd
-import plotly.graph_objects as go
-from typing import Dict, Tuple
+import json
+import os
+import re
+import string
+import sys
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
+# pandas and plotly are only needed by the UI tables and charts; they are
+# imported inside those functions so scoring helpers stay cheap to import
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
 
-# Performance data from training
+
+# Written by app.evaluation and shown in the Performance Metrics tab
+EVAL_RESULTS_PATH = "results/eval_results.json"
+
+# Performance data from training (shown until an evaluation results file exists)
 PERFORMANCE_DATA = {
     'English': {
         'BLEU': 37.79,
@@ -31,6 +45,56 @@ PERFORMANCE_DATA = {
 }
 
 
+def get_memory_usage() -> Dict[str, float]:
+    """
+    Get current and peak resident memory of this process
+    
+    Returns:
+        Dictionary with "rss_mb" and "peak_rss_mb" (None where unavailable)
+    """
+    rss_mb = None
+    peak_rss_mb = None
+    
+    try:
+        with open(f"/proc/{os.getpid()}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    rss_mb = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    peak_rss_mb = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    
+    if peak_rss_mb is None:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+            peak_rss_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+        except ImportError:
+            pass
+    
+    return {
+        "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+        "peak_rss_mb": round(peak_rss_mb, 1) if peak_rss_mb is not None else None
+    }
+
+
+def is_grounded(answer: str, context: str) -> bool:
+    """
+    Grounding test: the (non-empty) answer appears in the context
+    
+    Args:
+        answer: Generated answer
+        context: Input context
+        
+    Returns:
+        True if the answer is found in the context
+    """
+    answer = answer.strip()
+    return bool(answer) and answer.lower() in context.lower()
+
+
 def calculate_confidence(answer: str, context: str) -> str:
     """
     Calculate answer confidence level
@@ -44,12 +108,63 @@ def calculate_confidence(answer: str, context: str) -> str:
     """
     if len(answer.split()) < 2:
         return "Low"
-    elif answer.lower() in context.lower():
+    elif is_grounded(answer, context):
         return "High"
     else:
         return "Medium"
 
 
+def normalize_answer(text: str) -> str:
+    """
+    Normalize an answer for SQuAD-style comparison
+    
+    Lowercases, strips punctuation and articles and collapses whitespace.
+    
+    Args:
+        text: Answer text
+        
+    Returns:
+        Normalized answer
+    """
+    text = text.lower()
+    text = "".join(ch for ch in text if ch not in set(string.punctuation))
+    text = re.sub(r"\b(a|an|the)\b", " ", text)
+    return " ".join(text.split())
+
+
+def exact_match_score(prediction: str, reference: str) -> float:
+    """
+    SQuAD exact match between a prediction and a reference answer
+    
+    Returns:
+        1.0 if the normalized answers are identical, else 0.0
+    """
+    return float(normalize_answer(prediction) == normalize_answer(reference))
+
+
+def f1_score(prediction: str, reference: str) -> float:
+    """
+    SQuAD token-level F1 between a prediction and a reference answer
+    
+    Returns:
+        F1 score between 0.0 and 1.0
+    """
+    prediction_tokens = normalize_answer(prediction).split()
+    reference_tokens = normalize_answer(reference).split()
+    
+    if not prediction_tokens or not reference_tokens:
+        return float(prediction_tokens == reference_tokens)
+    
+    common = Counter(prediction_tokens) & Counter(reference_tokens)
+    overlap = sum(common.values())
+    if overlap == 0:
+        return 0.0
+    
+    precision = overlap / len(prediction_tokens)
+    recall = overlap / len(reference_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
 def format_answer(answer: str, language: str, confidence: str) -> str:
     """
     Format answer with metadata
@@ -71,36 +186,53 @@ def format_answer(answer: str, language: str, confidence: str) -> str:
     """
 
 
-def create_performance_chart() -> go.Figure:
+def load_performance_data(results_path: str = EVAL_RESULTS_PATH) -> Tuple[Dict[str, Dict[str, float]], str]:
+    """
+    Load per-language metrics written by app.evaluation
+    
+    Args:
+        results_path: Evaluation results file
+        
+    Returns:
+        Tuple of (metrics by language, description of their source); falls
+        back to PERFORMANCE_DATA when no results file exists
+    """
+    if not os.path.exists(results_path):
+        return PERFORMANCE_DATA, "training-time evaluation (run `python -m app.evaluation` to refresh)"
+    
+    with open(results_path) as f:
+        results = json.load(f)
+    return results["languages"], f"`{results_path}` ({results['model']}, {results['created']})"
+
+
+def create_performance_chart(performance_data: Dict[str, Dict[str, float]] = None) -> "go.Figure":
     """
     Create interactive performance comparison chart
     
+    Args:
+        performance_data: Metrics by language (defaults to PERFORMANCE_DATA)
+        
     Returns:
         Plotly figure object
     """
-    metrics = ['BLEU', 'ROUGE-L', 'Exact Match', 'F1 Score']
-    
-    english_scores = [
-        PERFORMANCE_DATA['English']['BLEU'] / 100,
-        PERFORMANCE_DATA['English']['ROUGE-L'],
-        PERFORMANCE_DATA['English']['Exact Match'],
-        PERFORMANCE_DATA['English']['F1 Score']
-    ]
+    import plotly.graph_objects as go
     
-    german_scores = [
-        PERFORMANCE_DATA['German']['BLEU'] / 100,
-        PERFORMANCE_DATA['German']['ROUGE-L'],
-        PERFORMANCE_DATA['German']['Exact Match'],
-        PERFORMANCE_DATA['German']['F1 Score']
-    ]
+    performance_data = performance_data or PERFORMANCE_DATA
+    metrics = ['BLEU', 'ROUGE-L', 'Exact Match', 'F1 Score']
+    colors = {'English': '#3498db', 'German': '#e74c3c'}
     
     fig = go.Figure(data=[
-        go.Bar(name='English', x=metrics, y=english_scores, marker_color='#3498db'),
-        go.Bar(name='German', x=metrics, y=german_scores, marker_color='#e74c3c')
+        go.Bar(
+            name=language,
+            x=metrics,
+            y=[scores['BLEU'] / 100, scores['ROUGE-L'], scores['Exact Match'], scores['F1 Score']],
+            marker_color=colors.get(language)
+        )
+        for language, scores in performance_data.items()
     ])
     
     fig.update_layout(
-        title='Model Performance Comparison: English vs German',
+        title='Model Performance Comparison: ' + ' vs '.join(performance_data),
         xaxis_title='Metrics',
         yaxis_title='Score',
         yaxis_range=[0, 1],
@@ -113,18 +245,115 @@ def create_performance_chart() -> go.Figure:
     return fig
 
 
-def create_metrics_table() -> pd.DataFrame:
+def create_metrics_table(performance_data: Dict[str, Dict[str, float]] = None) -> "pd.DataFrame":
     """
     Create detailed metrics table
     
+    Args:
+        performance_data: Metrics by language (defaults to PERFORMANCE_DATA)
+        
     Returns:
         Pandas DataFrame with metrics
     """
-    df = pd.DataFrame(PERFORMANCE_DATA).T
+    import pandas as pd
+    
+    df = pd.DataFrame(performance_data or PERFORMANCE_DATA).T
     df = df.round(4)
     return df
 
 
+def create_latency_chart(history: Dict[str, List[Tuple[float, float]]]) -> "go.Figure":
+    """
+    Create rolling per-stage latency chart
+    
+    Args:
+        history: MetricsCollector.latency_history() output
+        
+    Returns:
+        Plotly figure with one line per stage
+    """
+    import plotly.graph_objects as go
+    
+    now = time.time()
+    fig = go.Figure()
+    for stage, points in history.items():
+        if not points:
+            continue
+        fig.add_trace(go.Scatter(
+            name=stage,
+            x=[at - now for at, _ in points],
+            y=[ms for _, ms in points],
+            mode='lines+markers'
+        ))
+    
+    fig.update_layout(
+        title='Live Inference Latency by Stage',
+        xaxis_title='Seconds ago',
+        yaxis_title='Latency (ms)',
+        template='plotly_white',
+        height=400,
+        font=dict(size=12)
+    )
+    
+    return fig
+
+
+def create_live_metrics_table(snapshot: Dict) -> "pd.DataFrame":
+    """
+    Create per-stage latency table
+    
+    Args:
+        snapshot: MetricsCollector.snapshot() output
+        
+    Returns:
+        Pandas DataFrame with count and latency percentiles per stage
+    """
+    import pandas as pd
+    
+    rows = [{"Stage": stage, **stats} for stage, stats in snapshot["stages"].items()]
+    return pd.DataFrame(rows, columns=["Stage", "count", "avg_ms", "p50_ms", "p95_ms", "p99_ms"])
+
+
+def create_answers_table(results: List[Dict[str, str]]) -> "pd.DataFrame":
+    """
+    Create per-question answers table
+    
+    Args:
+        results: Rows from QAInference.answer_questions
+        
+    Returns:
+        Pandas DataFrame with Question, Answer and Confidence columns
+    """
+    import pandas as pd
+    
+    return pd.DataFrame(results, columns=["Question", "Answer", "Confidence"])
+
+
+def create_passages_table(candidates: List[Dict]) -> "pd.DataFrame":
+    """
+    Create retrieved-passages table
+    
+    Args:
+        candidates: "candidates" of CorpusQA.answer
+        
+    Returns:
+        Pandas DataFrame with rank, document, BM25 score, answer and passage
+    """
+    import pandas as pd
+    
+    rows = [
+        {
+            "Rank": candidate["rank"],
+            "Document": candidate["doc_id"],
+            "BM25 Score": candidate["score"],
+            "Answer": candidate["answer"],
+            "Passage": candidate["text"]
+        }
+        for candidate in candidates
+    ]
+    return pd.DataFrame(rows, columns=["Rank", "Document", "BM25 Score", "Answer", "Passage"])
+
+
 def get_example(example_type: str, language: str) -> Tuple[str, str]:
     """
     Get example question and context
@@ -0,0 +1,461 @@
+"""
+Vocabulary Pruning Module
+Shrinks the 250k-token mBART-50 vocabulary to the tokens English and German
+text actually uses, and saves a pruned tokenizer and merged model that
+ModelLoader loads like any serving artifact
+
+Usage:
+    python -m app.vocab models/multilingual_model models/pruned_model --corpus data/train_en.json data/train_de.json
+    python -m app.vocab --tiny --output vocab_report.json
+"""
+
+import argparse
+import itertools
+import json
+import string
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+import torch
+
+from .inference import NUM_BEAMS, QAInference
+from .model_loader import ARTIFACT_MANIFEST, BASE_MODEL, ModelLoader
+from .precision import PRECISION_CHECK_SAMPLES
+
+
+# Characters kept as single-character pieces even if the corpus lacks them,
+# so unseen English/German words still split into known pieces
+SERVING_CHARACTERS = string.printable.strip() + "äöüÄÖÜßéèêàâçëïîôûœ€£°§„“”‚‘’«»–—…"
+
+# Texts tokenized per tokenizer call while scanning the corpus
+CORPUS_BATCH_SIZE = 512
+
+# Corpus texts re-tokenized with the pruned tokenizer to verify segmentation
+VERIFY_TEXTS = 2000
+
+
+def iter_corpus_texts(paths: Sequence[str], language: str = "English") -> Iterator[str]:
+    """
+    Stream texts to derive the vocabulary from
+
+    Plain .txt files yield one text per line. Anything else is read as QA
+    data (JSONL or SQuAD/XQuAD JSON, see app.offline.iter_items) and yields
+    each model input in its serving format plus the gold answers.
+
+    Args:
+        paths: Corpus files
+        language: Language of QA items that do not name one
+
+    Yields:
+        Texts
+    """
+    from .offline import iter_items
+
+    for path in paths:
+        if path.endswith(".txt"):
+            with open(path, encoding="utf-8") as f:
+                yield from (line.strip() for line in f if line.strip())
+            continue
+        for item in iter_items(path, language):
+            yield QAInference._format_input(item["question"], item["context"])
+            yield from item["answers"]
+
+
+def count_tokens(tokenizer, texts: Iterable[str], batch_size: int = CORPUS_BATCH_SIZE) -> Counter:
+    """
+    Count the token ids the tokenizer produces for a stream of texts
+
+    Args:
+        tokenizer: Original tokenizer
+        texts: Corpus texts
+        batch_size: Texts per tokenizer call
+
+    Returns:
+        Counter of token id -> occurrences
+    """
+    counts = Counter()
+    batch = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) == batch_size:
+            for ids in tokenizer(batch, add_special_tokens=False)["input_ids"]:
+                counts.update(ids)
+            batch = []
+    if batch:
+        for ids in tokenizer(batch, add_special_tokens=False)["input_ids"]:
+            counts.update(ids)
+    return counts
+
+
+def select_vocabulary(tokenizer, counts: Counter, min_count: int = 1) -> List[int]:
+    """
+    Choose the token ids the pruned vocabulary keeps
+
+    Keeps every special and added token (all mBART-50 language codes, so
+    the tokenizer class finds the codes it expects), every corpus token seen
+    at least min_count times and the single-character pieces of
+    SERVING_CHARACTERS and of the corpus.
+
+    Args:
+        tokenizer: Original tokenizer
+        counts: Token counts from count_tokens
+        min_count: Minimum corpus occurrences of a kept token
+
+    Returns:
+        Sorted original ids of the kept tokens
+    """
+    keep = set(tokenizer.all_special_ids) | set(tokenizer.added_tokens_decoder)
+    keep.update(token_id for token_id, count in counts.items() if count >= min_count)
+
+    characters = set(SERVING_CHARACTERS)
+    for token_id in counts:
+        characters.update(tokenizer.convert_ids_to_tokens(token_id).replace("▁", ""))
+    for piece, token_id in tokenizer.get_vocab().items():
+        stripped = piece.replace("▁", "")
+        if len(stripped) <= 1 and (not stripped or stripped in characters):
+            keep.add(token_id)
+
+    return sorted(keep)
+
+
+def _remap_ids(node, new_ids: Dict[int, int]):
+    """Rewrite "ids" lists (post-processor special tokens) with the new ids"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "ids" and isinstance(value, list):
+                node[key] = [new_ids[old] for old in value]
+            else:
+                _remap_ids(value, new_ids)
+    elif isinstance(node, list):
+        for value in node:
+            _remap_ids(value, new_ids)
+
+
+def prune_tokenizer(tokenizer, keep_ids: Sequence[int], output_path: str):
+    """
+    Save a tokenizer that only knows the kept pieces
+
+    The Unigram model in tokenizer.json keeps its piece scores, so any text
+    covered by the kept pieces is segmented exactly as before (only the ids
+    change). Works for the fast mBART-50 tokenizer of transformers 4 and 5.
+
+    Args:
+        tokenizer: Original (fast) tokenizer
+        keep_ids: Sorted original ids to keep
+        output_path: Directory to save the pruned tokenizer to
+
+    Returns:
+        The pruned tokenizer, loaded back from output_path
+    """
+    from transformers import AutoTokenizer
+
+    output = Path(output_path)
+    output.mkdir(parents=True, exist_ok=True)
+    tokenizer.save_pretrained(output)
+
+    new_ids = {old: new for new, old in enumerate(keep_ids)}
+    with open(output / "tokenizer.json", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    model = spec["model"]
+    if model["type"] != "Unigram":
+        raise ValueError(f"Only Unigram (SentencePiece) tokenizers can be pruned, got {model['type']}")
+    model["vocab"] = [model["vocab"][old] for old in keep_ids]
+    model["unk_id"] = new_ids[model["unk_id"]]
+    for token in spec["added_tokens"]:
+        token["id"] = new_ids[token["id"]]
+    _remap_ids(spec.get("post_processor"), new_ids)
+
+    with open(output / "tokenizer.json", "w", encoding="utf-8") as f:
+        json.dump(spec, f, ensure_ascii=False)
+    # The slow SentencePiece model still has the full vocabulary; drop it
+    (output / "sentencepiece.bpe.model").unlink(missing_ok=True)
+
+    return AutoTokenizer.from_pretrained(output)
+
+
+def prune_model(model, keep_ids: Sequence[int]):
+    """
+    Keep only the embedding, lm_head and final_logits_bias rows of kept tokens
+
+    Shared and tied weights stay shared: every module holding the original
+    embedding matrix gets the same pruned matrix. Special token ids in the
+    config and generation config are remapped.
+
+    Args:
+        model: Merged (non-PEFT) MBartForConditionalGeneration
+        keep_ids: Sorted original ids to keep
+
+    Returns:
+        The pruned model (modified in place)
+    """
+    index = torch.tensor(keep_ids, dtype=torch.long)
+    new_ids = {old: new for new, old in enumerate(keep_ids)}
+
+    pruned = {}
+    for module in model.modules():
+        weight = getattr(module, "weight", None)
+        if not isinstance(module, (torch.nn.Embedding, torch.nn.Linear)) or weight is None:
+            continue
+        if weight.shape[0] != model.config.vocab_size:
+            continue
+        if id(weight) not in pruned:
+            pruned[id(weight)] = torch.nn.Parameter(weight.data[index].clone(), requires_grad=False)
+        module.weight = pruned[id(weight)]
+        if isinstance(module, torch.nn.Embedding):
+            module.num_embeddings = len(keep_ids)
+            if module.padding_idx is not None:
+                module.padding_idx = new_ids[module.padding_idx]
+        else:
+            module.out_features = len(keep_ids)
+
+    if hasattr(model, "final_logits_bias"):
+        model.register_buffer("final_logits_bias", model.final_logits_bias[:, index].clone())
+
+    model.config.vocab_size = len(keep_ids)
+    for config in (model.config, model.generation_config):
+        for field in ("pad_token_id", "bos_token_id", "eos_token_id", "decoder_start_token_id",
+                      "forced_bos_token_id", "forced_eos_token_id"):
+            value = getattr(config, field, None)
+            if isinstance(value, int):
+                setattr(config, field, new_ids[value])
+            elif isinstance(value, list):
+                setattr(config, field, [new_ids[v] for v in value])
+    return model
+
+
+def measure_step_latency(model, tokenizer, steps: int = 32, batch_size: int = NUM_BEAMS, repeats: int = 3) -> float:
+    """
+    Time one incremental decoder step (decoder layers, lm_head and softmax)
+
+    Args:
+        model: Model to time
+        tokenizer: Its tokenizer
+        steps: Decoder steps per measurement
+        batch_size: Sequences decoded together (the beam width)
+        repeats: Measurements (the fastest is reported)
+
+    Returns:
+        Milliseconds per decoder step
+    """
+    sample = PRECISION_CHECK_SAMPLES[0]
+    input_ids = tokenizer(
+        QAInference._format_input(sample["question"], sample["context"]), return_tensors="pt"
+    )["input_ids"].repeat(batch_size, 1).to(model.device)
+
+    best = float("inf")
+    with torch.no_grad():
+        encoder_outputs = model.get_encoder()(input_ids=input_ids)
+        for _ in range(repeats):
+            next_ids = torch.full((batch_size, 1), model.config.decoder_start_token_id, device=model.device)
+            past = None
+            start = time.perf_counter()
+            for _ in range(steps):
+                outputs = model(
+                    encoder_outputs=encoder_outputs,
+                    decoder_input_ids=next_ids,
+                    past_key_values=past,
+                    use_cache=True
+                )
+                past = outputs.past_key_values
+                next_ids = outputs.logits[:, -1].log_softmax(dim=-1).argmax(dim=-1, keepdim=True)
+            best = min(best, (time.perf_counter() - start) / steps)
+    return round(best * 1000, 3)
+
+
+def _model_mb(model) -> float:
+    return round(sum(p.numel() * p.element_size() for p in model.parameters()) / 1024 ** 2, 1)
+
+
+def _answer_samples(model, tokenizer, samples: List[Dict]):
+    inference = QAInference(model, tokenizer, model.device)
+    start = time.perf_counter()
+    answers = inference.answer_batch(
+        [item["question"] for item in samples],
+        [item["context"] for item in samples],
+        [item["language"] for item in samples]
+    )
+    ms_per_item = (time.perf_counter() - start) * 1000 / len(samples)
+    return [answer for answer, _ in answers], round(ms_per_item, 1)
+
+
+def build_pruned_model(
+    model_path: str,
+    output_path: str,
+    corpus_paths: Sequence[str],
+    base_model: str = None,
+    min_count: int = 1,
+    samples: List[Dict] = None
+) -> Dict:
+    """
+    Prune a model's vocabulary to a corpus, save it and compare it to the original
+
+    The adapter is merged first (like app.artifact), answers and decoder
+    step latency of the original are measured, then the model is pruned in
+    place, saved as a merged artifact and loaded back through ModelLoader
+    for the same measurements.
+
+    Args:
+        model_path: LoRA adapter or merged artifact directory
+        output_path: Directory for the pruned artifact
+        corpus_paths: .txt or QA (JSONL/SQuAD) files in the serving languages
+        base_model: Base model the adapter was trained on
+        min_count: Minimum corpus occurrences of a kept token
+        samples: QA items compared before/after (defaults to the precision
+            check samples)
+
+    Returns:
+        Report with vocabulary, size, step latency and answer agreement
+    """
+    from peft import PeftModel
+
+    samples = samples or PRECISION_CHECK_SAMPLES
+    start_time = time.perf_counter()
+
+    loader = ModelLoader(model_path=model_path, base_model=base_model)
+    loader.device = torch.device("cpu")
+    model, tokenizer = loader.load()
+    if isinstance(model, PeftModel):
+        model = model.merge_and_unload()
+
+    print("⏳ Counting corpus tokens...")
+    texts = itertools.chain(
+        (QAInference._format_input(item["question"], item["context"]) for item in samples),
+        iter_corpus_texts(corpus_paths)
+    )
+    # The corpus is streamed; only the first texts are kept for verification
+    verify_texts = []
+
+    def corpus():
+        for text in texts:
+            if len(verify_texts) < VERIFY_TEXTS:
+                verify_texts.append(text)
+            yield text
+
+    counts = count_tokens(tokenizer, corpus())
+    keep_ids = select_vocabulary(tokenizer, counts, min_count)
+    print(f"✅ Keeping {len(keep_ids):,} of {len(tokenizer):,} tokens")
+
+    original = {
+        "vocab_size": len(tokenizer),
+        "parameters": model.num_parameters(),
+        "weights_mb": _model_mb(model),
+        "step_ms": measure_step_latency(model, tokenizer)
+    }
+    original_answers, original["ms_per_item"] = _answer_samples(model, tokenizer, samples)
+    original_ids = tokenizer(verify_texts, add_special_tokens=False)["input_ids"]
+
+    print("⏳ Pruning tokenizer and model...")
+    pruned_tokenizer = prune_tokenizer(tokenizer, keep_ids, output_path)
+    new_ids = {old: new for new, old in enumerate(keep_ids)}
+    tokenization_mismatches = sum(
+        ids != [new_ids.get(token_id) for token_id in before]
+        for ids, before in zip(pruned_tokenizer(verify_texts, add_special_tokens=False)["input_ids"], original_ids)
+    )
+
+    model = prune_model(model, keep_ids)
+    model.save_pretrained(output_path, safe_serialization=True)
+    del model
+
+    manifest = {
+        "format": "vocab-pruned",
+        "base_model": loader.base_model,
+        "adapter_path": str(model_path),
+        "corpus": [str(path) for path in corpus_paths],
+        "vocab_size": len(keep_ids),
+        "original_vocab_size": original["vocab_size"],
+        "build_seconds": round(time.perf_counter() - start_time, 2),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    with open(Path(output_path) / ARTIFACT_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Load the result the way serving does
+    pruned_loader = ModelLoader(model_path=output_path)
+    pruned_loader.device = torch.device("cpu")
+    pruned_model, pruned_tokenizer = pruned_loader.load()
+    pruned = {
+        "vocab_size": len(pruned_tokenizer),
+        "parameters": pruned_model.num_parameters(),
+        "weights_mb": _model_mb(pruned_model),
+        "step_ms": measure_step_latency(pruned_model, pruned_tokenizer)
+    }
+    pruned_answers, pruned["ms_per_item"] = _answer_samples(pruned_model, pruned_tokenizer, samples)
+
+    mismatches = [
+        {"question": item["question"], "original": before, "pruned": after}
+        for item, before, after in zip(samples, original_answers, pruned_answers)
+        if before != after
+    ]
+    return {
+        "output_path": str(output_path),
+        "original": original,
+        "pruned": pruned,
+        "weights_reduction": round(1 - pruned["weights_mb"] / original["weights_mb"], 4),
+        "step_speedup": round(original["step_ms"] / pruned["step_ms"], 2) if pruned["step_ms"] else None,
+        "tokenization_mismatches": tokenization_mismatches,
+        "answers_compared": len(samples),
+        "answers_matching": len(samples) - len(mismatches),
+        "answer_mismatches": mismatches,
+        "manifest": manifest
+    }
+
+
+def print_report(report: Dict):
+    """Print a vocabulary pruning report as a table"""
+    original, pruned = report["original"], report["pruned"]
+    print("\n" + "=" * 80)
+    print("✂️ VOCABULARY PRUNING")
+    print("=" * 80)
+    print(f"{'':<14} {'Vocab':>10} {'Parameters':>14} {'Weights':>11} {'ms/step':>9} {'ms/item':>9}")
+    for name, row in (("Original", original), ("Pruned", pruned)):
+        print(f"{name:<14} {row['vocab_size']:>10,} {row['parameters']:>14,} {row['weights_mb']:>8.1f} MB "
+              f"{row['step_ms']:>9.3f} {row['ms_per_item']:>9.1f}")
+    print(f"\nWeights: -{report['weights_reduction']:.1%} | decoder step: {report['step_speedup']}x faster")
+    print(f"Corpus texts tokenized differently: {report['tokenization_mismatches']} "
+          f"(first {VERIFY_TEXTS:,} checked)")
+    print(f"Answers matching: {report['answers_matching']}/{report['answers_compared']}")
+    for mismatch in report["answer_mismatches"]:
+        print(f"  ⚠️ {mismatch['question']}: {mismatch['original']!r} → {mismatch['pruned']!r}")
+    print(f"\n💾 Pruned artifact: {report['output_path']} (load with ModelLoader(model_path=...))")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Prune the mBART-50 vocabulary to English/German")
+    parser.add_argument("model_path", nargs="?", default="models/multilingual_model",
+                        help="LoRA adapter or merged artifact directory")
+    parser.add_argument("output_path", nargs="?", default="models/pruned_model")
+    parser.add_argument("--corpus", nargs="+", default=[],
+                        help=".txt files (one text per line) or JSONL/SQuAD QA files in the serving languages")
+    parser.add_argument("--base-model", default=BASE_MODEL, help="Base model the adapter was trained on")
+    parser.add_argument("--min-count", type=int, default=1, help="Minimum corpus occurrences of a kept token")
+    parser.add_argument("--tiny", action="store_true", help="Prune a tiny random mBART (for testing)")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    model_path, output_path, corpus = args.model_path, args.output_path, args.corpus
+    if args.tiny:
+        from .tiny_model import TINY_CORPUS, build_tiny_model
+
+        model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+        build_tiny_model(save_path=model_path)
+        output_path = tempfile.mkdtemp(prefix="tiny_pruned_")
+        corpus_file = Path(tempfile.mkdtemp()) / "corpus.txt"
+        corpus_file.write_text("\n".join(TINY_CORPUS[:3]), encoding="utf-8")
+        corpus = corpus or [str(corpus_file)]
+
+    report = build_pruned_model(model_path, output_path, corpus, args.base_model, args.min_count)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
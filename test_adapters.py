@@ -0,0 +1,136 @@
+"""
+Multi-Adapter Serving Test
+Checks that adapters selected per request answer like a model holding only
+that adapter, through QAInference, MicroBatcher and the HTTP API, and that
+the resident set stays within its LRU limit
+"""
+
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("peft")
+
+from app.batching import MicroBatcher
+from app.inference import QAInference
+from app.model_loader import ModelLoader
+from app.tiny_model import build_tiny_adapter, build_tiny_model
+
+QUESTIONS = [
+    ("Where is Berlin?", "Berlin is the capital of Germany.", "English"),
+    ("Wo liegt Berlin?", "Berlin ist die Hauptstadt von Deutschland.", "German"),
+    ("When was it built?", "The tower was built from 1887 to 1889.", "English")
+]
+
+
+@pytest.fixture(scope="module")
+def paths():
+    base = tempfile.mkdtemp(prefix="tiny_mbart_")
+    build_tiny_model(save_path=base)
+    adapters = {
+        name: build_tiny_adapter(base, tempfile.mkdtemp(prefix="tiny_lora_"), seed=seed)
+        for seed, name in enumerate(["default", "a", "b"])
+    }
+    return base, adapters
+
+
+def load(base, model_path, adapters=None, max_resident=1):
+    loader = ModelLoader(
+        model_path=model_path, base_model=base, adapters=adapters, max_resident_adapters=max_resident
+    )
+    model, tokenizer = loader.load()
+    return QAInference(model, tokenizer, loader.device, adapters=loader.adapters)
+
+
+@pytest.fixture(scope="module")
+def references(paths):
+    base, adapters = paths
+    return {
+        name: [load(base, path).answer_question(*item, max_length=12)[0] for item in QUESTIONS]
+        for name, path in adapters.items()
+    }
+
+
+@pytest.fixture
+def engine(paths):
+    base, adapters = paths
+    return load(base, adapters["default"], {"a": adapters["a"], "b": adapters["b"]}, max_resident=1)
+
+
+def test_adapters_match_single_adapter_models(engine, references):
+    assert len(set(map(tuple, references.values()))) == 3, "tiny adapters should answer differently"
+
+    for name in ["a", "b", "a", None]:
+        answers = [engine.answer_question(*item, max_length=12, adapter=name)[0] for item in QUESTIONS]
+        assert answers == references[name or "default"]
+
+    stats = engine.adapters.get_stats()
+    assert stats["resident"] == ["a"]
+    assert stats["evictions"] == 2
+    assert stats["adapters"]["a"]["loads"] == 2
+    assert 0 < stats["adapters"]["a"]["weights_mb"] < stats["base_model_mb"]
+
+
+def test_batch_and_micro_batched_mixed_adapters(engine, references):
+    batch = engine.answer_batch(*map(list, zip(*QUESTIONS)), max_length=12, adapter="b")
+    assert [answer for answer, _ in batch] == references["b"]
+
+    batcher = MicroBatcher(engine, max_batch_size=8, max_wait_ms=20, num_workers=2).start()
+    try:
+        requests = [(item, name) for name in ["a", "b", None] for item in QUESTIONS] * 2
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            answers = list(pool.map(
+                lambda request: batcher.submit(*request[0], max_length=12, adapter=request[1]).result(timeout=60),
+                requests
+            ))
+    finally:
+        batcher.stop()
+
+    for (item, name), answer in zip(requests, answers):
+        assert answer == references[name or "default"][QUESTIONS.index(item)]
+
+
+def test_unknown_adapter_and_unload(engine):
+    answer, _ = engine.answer_question(*QUESTIONS[0], adapter="missing")
+    assert answer.startswith("❌ Error") and "missing" in answer
+
+    engine.answer_question(*QUESTIONS[0], adapter="b")
+    assert engine.adapters.unload("b") is True
+    assert engine.adapters.get_stats()["resident"] == []
+    engine.adapters.unload("b", forget=True)
+    assert "b" not in engine.adapters
+
+
+def test_api_adapter_selection_and_runtime_loading(paths, references):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from app.api import create_app
+
+    base, adapters = paths
+    app = create_app(lambda: MicroBatcher(load(base, adapters["default"])).start())
+    with TestClient(app) as client:
+        deadline = time.time() + 60
+        while client.get("/ready").status_code != 200:
+            assert time.time() < deadline, "model did not become ready"
+            time.sleep(0.1)
+
+        question, context, language = QUESTIONS[0]
+        item = {"question": question, "context": context, "language": language, "max_length": 12}
+        assert client.post("/v1/answer", json={**item, "adapter": "a"}).status_code == 404
+
+        loaded = client.post("/v1/adapters", json={"name": "a", "path": adapters["a"]})
+        assert loaded.status_code == 200 and loaded.json()["resident"]
+
+        response = client.post("/v1/answer", json={**item, "adapter": "a"}).json()
+        assert response["answer"] == references["a"][0] and response["adapter"] == "a"
+        batch = client.post("/v1/answer/batch", json={"items": [item], "max_length": 12, "adapter": "a"}).json()
+        assert batch["results"][0]["answer"] == references["a"][0]
+        assert client.post("/v1/answer", json=item).json()["answer"] == references["default"][0]
+
+        assert client.get("/v1/adapters").json()["adapters"]["a"]["requests"] >= 2
+        assert client.post("/v1/adapters", json={"name": "bad", "path": "/does/not/exist"}).status_code == 422
+        assert client.delete("/v1/adapters/a", params={"forget": True}).json()["was_resident"] is True
+        assert client.post("/v1/answer", json={**item, "adapter": "a"}).status_code == 404
@@ -0,0 +1,99 @@
+"""
+HTTP API Test
+Serves the tiny model through app.api and checks endpoints, validation and limits
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from app.api import build_engine_factory, create_app
+
+
+@pytest.fixture(scope="module", params=[1, 4], ids=["direct", "micro-batched"])
+def client(request):
+    app = create_app(
+        build_engine_factory(tiny=True, max_batch_size=request.param),
+        max_body_bytes=4096,
+        max_batch_items=4
+    )
+    with TestClient(app) as client:
+        deadline = time.time() + 60
+        while client.get("/ready").status_code != 200:
+            assert time.time() < deadline, "model did not become ready"
+            time.sleep(0.1)
+        yield client
+
+
+def test_health_and_ready(client):
+    assert client.get("/health").json() == {"status": "ok"}
+    assert client.get("/ready").json()["status"] == "ready"
+
+
+def test_single_and_batch_answers(client):
+    item = {"question": "Where is Berlin?", "context": "Berlin is in Germany.", "language": "English"}
+    single = client.post("/v1/answer", json={**item, "max_length": 8})
+    assert single.status_code == 200
+    assert set(single.json()) == {"answer", "confidence", "language", "latency_ms"}
+
+    batch = client.post("/v1/answer/batch", json={
+        "items": [item, {**item, "language": "German"}],
+        "max_length": 8
+    })
+    assert batch.status_code == 200
+    results = batch.json()["results"]
+    assert [r["language"] for r in results] == ["English", "German"]
+    assert results[0]["answer"] == single.json()["answer"]
+
+
+def test_validation_and_limits(client):
+    assert client.post("/v1/answer", json={"question": " ", "context": "Berlin"}).status_code == 422
+    assert client.post("/v1/answer", json={"question": "a?", "context": "b", "language": "French"}).status_code == 422
+
+    too_many = {"items": [{"question": "a?", "context": "b"}] * 5}
+    assert client.post("/v1/answer/batch", json=too_many).status_code == 413
+
+    too_large = {"question": "a?", "context": "x" * 5000}
+    assert client.post("/v1/answer", json=too_large).status_code == 413
+
+    def streamed():
+        yield b'{"question": "a?", "context": "'
+        for _ in range(10):
+            yield b"x" * 500
+        yield b'"}'
+
+    response = client.post("/v1/answer", content=streamed(), headers={"Content-Type": "application/json"})
+    assert response.status_code == 413
+
+
+def test_request_deadline(client):
+    # Not asked before, so the answer cache cannot serve it
+    item = {"question": "Where is Bonn?", "context": "Bonn is in Germany.", "language": "English"}
+    expired = client.post("/v1/answer", json={**item, "max_length": 8, "timeout_seconds": 1e-6})
+    assert expired.status_code == 504 and expired.json()["detail"].startswith("⏱️ Timeout")
+    assert client.post("/v1/answer", json={**item, "max_length": 8, "timeout_seconds": 60}).status_code == 200
+
+    batch = client.post("/v1/answer/batch", json={"items": [item], "max_length": 8, "timeout_seconds": 1e-6})
+    assert batch.json()["results"][0]["error"].startswith("⏱️ Timeout")
+
+
+def test_micro_batched_requests_use_the_cache():
+    engines = []
+    factory = build_engine_factory(tiny=True, max_batch_size=4, max_wait_ms=5, cache_size=16)
+    app = create_app(lambda: engines.append(factory()) or engines[-1])
+    with TestClient(app) as client:
+        deadline = time.time() + 60
+        while client.get("/ready").status_code != 200:
+            assert time.time() < deadline, "model did not become ready"
+            time.sleep(0.1)
+
+        item = {"question": "Where is Berlin?", "context": "Berlin is in Germany.", "max_length": 8}
+        first, second = client.post("/v1/answer", json=item), client.post("/v1/answer", json=item)
+        assert first.status_code == second.status_code == 200
+        assert first.json()["answer"] == second.json()["answer"]
+        stats = engines[0].inference_engine.cache.get_stats()
+        assert stats["misses"] == 1 and stats["hits"] == 1
+        assert engines[0].get_stats()["requests"] == 1
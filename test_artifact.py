@@ -0,0 +1,55 @@
+"""
+Serving Artifact Test
+Merges a tiny LoRA adapter into its base model and checks that the merged
+artifact loads offline through ModelLoader and answers like the adapter
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import torch
+
+from app.artifact import build_serving_artifact
+from app.inference import QAInference
+from app.model_loader import ARTIFACT_MANIFEST, ModelLoader, is_merged_artifact
+from app.tiny_model import build_tiny_adapter, build_tiny_model
+
+QUESTIONS = ["What?", "Where is Paris?", "Wer war das?"]
+CONTEXTS = ["Rome was founded in 753 BC.", "Paris is in France.", "Berlin ist die Hauptstadt."]
+
+
+def test_merged_artifact_matches_adapter():
+    base = tempfile.mkdtemp(prefix="tiny_mbart_")
+    build_tiny_model(seed=1, save_path=base)
+    adapter = build_tiny_adapter(base, tempfile.mkdtemp(prefix="tiny_lora_"), seed=3)
+    output = tempfile.mkdtemp(prefix="tiny_merged_")
+
+    manifest = build_serving_artifact(adapter, output, base_model=base)
+    assert manifest["format"] == "merged" and manifest["base_model"] == base
+    assert json.loads((Path(output) / ARTIFACT_MANIFEST).read_text()) == manifest
+    assert is_merged_artifact(output) and not is_merged_artifact(adapter)
+
+    merged_loader = ModelLoader(model_path=output)
+    merged, tokenizer = merged_loader.load()
+    assert merged_loader.load_stats["merged_artifact"]
+    assert merged_loader.base_model == base and merged_loader.adapters is None
+
+    lora, _ = ModelLoader(model_path=adapter, base_model=base).load()
+    plain, _ = ModelLoader(model_path=base).load()
+    inputs = tokenizer(CONTEXTS, return_tensors="pt", padding=True)
+    decoder_input_ids = torch.full((len(CONTEXTS), 2), tokenizer.eos_token_id)
+    with torch.no_grad():
+        logits = {
+            name: model(**inputs, decoder_input_ids=decoder_input_ids).logits
+            for name, model in (("merged", merged), ("lora", lora), ("base", plain))
+        }
+    torch.testing.assert_close(logits["merged"], logits["lora"], rtol=1e-4, atol=1e-4)
+    # The adapter does change the model, so the comparison is not trivial
+    assert not torch.allclose(logits["merged"], logits["base"], atol=1e-3)
+
+    answers = {
+        name: QAInference(model, tokenizer, "cpu", num_beams=2).answer_batch(QUESTIONS, CONTEXTS, max_length=8)
+        for name, model in (("merged", merged), ("lora", lora))
+    }
+    assert [answer for answer, _ in answers["merged"]] == [answer for answer, _ in answers["lora"]]
@@ -0,0 +1,113 @@
+"""
+Batching Test
+Checks that the micro-batcher groups concurrent requests into shared
+generate calls per language, returns each caller its own answer and
+reports failures per request, and that answer_batch buckets inputs by
+language and length but returns results in input order
+"""
+
+import pytest
+
+from app.batching import MicroBatcher
+from app.inference import QAInference
+from app.metrics import InferenceHooks
+from app.tiny_model import build_tiny_model
+
+CONTEXT = "The Eiffel Tower was built from 1887 to 1889 as the entrance to the World's Fair."
+
+
+@pytest.fixture(scope="module")
+def engine():
+    model, tokenizer = build_tiny_model(seed=1)
+    return QAInference(model, tokenizer, "cpu", num_beams=1)
+
+
+def test_micro_batcher_groups_concurrent_requests(engine):
+    requests = [(f"Question number {i}?", CONTEXT, "English" if i < 6 else "German") for i in range(8)]
+    batcher = MicroBatcher(engine, max_batch_size=4, max_wait_ms=500)
+    try:
+        futures = [batcher.submit(question, context, language, 8) for question, context, language in requests]
+        answers = [future.result(timeout=60) for future in futures]
+    finally:
+        batcher.stop()
+
+    # Each caller gets the answer of its own request
+    for (question, context, language), answer in zip(requests, answers):
+        assert answer == engine.generate_answers([question], [context], language, 8)[0]
+
+    # Batches of 4 requests; the second batch splits into one English and one German call
+    stats = batcher.get_stats()
+    assert stats["requests"] == 8 and stats["batches"] == 3
+    assert stats["batch_size_histogram"] == {2: 2, 4: 1}
+    assert stats["queue_depth"] == 0
+
+
+def test_micro_batcher_reports_errors_per_request(engine):
+    batcher = MicroBatcher(engine, max_batch_size=4, max_wait_ms=5)
+    try:
+        answer, info = batcher.answer_question("Who?", CONTEXT, adapter="missing")
+        assert answer.startswith("❌ Error:") and "missing" in answer and info == ""
+        assert batcher.answer_question(" ", CONTEXT)[0].startswith("⚠️")
+
+        # A failed group does not affect the next request
+        answer, info = batcher.answer_question("Who?", CONTEXT, max_length=8)
+        assert not answer.startswith("❌") and "Response Details" in info
+    finally:
+        batcher.stop()
+
+
+class GenerateCalls(InferenceHooks):
+    """Records the batch size of every generate call"""
+
+    def __init__(self):
+        self.sizes = []
+
+    def on_generate(self, items: int, num_beams: int, tokens_out: int):
+        self.sizes.append(items)
+
+
+def test_answer_batch_restores_input_order():
+    model, tokenizer = build_tiny_model(seed=1)
+    calls = GenerateCalls()
+    # Constrained answers are spans of each item's own context, so a mix-up shows
+    engine = QAInference(model, tokenizer, "cpu", num_beams=1, constrained_decoding=True, hooks=[calls])
+    contexts = [
+        "Rome was founded in 753 BC by Romulus.",
+        "Paris is in France.",
+        "Jupiter is a gas giant planet.",
+        "Berlin ist die Hauptstadt."
+    ] * 2
+    questions = ["What?"] * 8
+    languages = ["English"] * 4 + ["German"] * 4
+
+    results = engine.answer_batch(questions, contexts, languages, max_length=8, batch_size=3)
+
+    # Same answers, in input order, as answering each item on its own
+    expected = [
+        engine.generate_answers([question], [context], language, 8)[0]
+        for question, context, language in zip(questions, contexts, languages)
+    ]
+    assert len(set(expected)) > 4
+    assert [answer for answer, _ in results] == expected
+
+    # 4 items per language in generate calls of at most 3, never mixing languages
+    assert calls.sizes[:4] == [3, 1, 3, 1]
+
+
+def test_answer_batch_sorts_by_length_within_a_language():
+    model, tokenizer = build_tiny_model(seed=1)
+    engine = QAInference(model, tokenizer, "cpu", num_beams=1)
+    input_lengths = []
+    generate_batch = engine._generate_batch
+
+    def record(encoded, *args, **kwargs):
+        input_lengths.append(sorted(len(ids) for ids in encoded))
+        return generate_batch(encoded, *args, **kwargs)
+
+    engine._generate_batch = record
+    contexts = [CONTEXT[:length] for length in (80, 10, 60, 20)]
+    engine.answer_batch(["What?"] * 4, contexts, max_length=8, batch_size=2)
+
+    # The two shortest inputs share one call, the two longest the other
+    assert len(input_lengths) == 2
+    assert max(input_lengths[0]) <= min(input_lengths[1])
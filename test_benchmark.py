@@ -0,0 +1,44 @@
+"""
+Benchmark Suite Test
+Runs a minimal benchmark grid on the tiny model and checks regression flagging
+"""
+
+import copy
+import json
+
+from app.benchmark import compare_results, run_benchmark
+
+
+def test_tiny_benchmark(tmp_path):
+    """A small grid produces complete, JSON-serializable results"""
+    results = run_benchmark(
+        tiny=True,
+        batch_sizes=(1, 2),
+        beam_counts=(1,),
+        context_lengths=(16,),
+        languages=("English", "German"),
+        requests=2
+    )
+
+    assert results["cold_start"]["load_seconds"] >= 0
+    assert results["peak_rss_mb"] > 0
+    assert len(results["scenarios"]) == 4
+    for scenario in results["scenarios"].values():
+        assert scenario["errors"] == 0
+        assert scenario["p50_ms"] <= scenario["p95_ms"] <= scenario["p99_ms"]
+        assert scenario["throughput_items_per_s"] > 0
+
+    path = tmp_path / "bench.json"
+    path.write_text(json.dumps(results))
+    assert json.loads(path.read_text())["scenarios"].keys() == results["scenarios"].keys()
+
+    # Same run: nothing flagged
+    assert compare_results(results, results) == []
+
+    # Slower latency and lower throughput beyond the threshold are flagged
+    slower = copy.deepcopy(results)
+    name = next(iter(slower["scenarios"]))
+    slower["scenarios"][name]["p95_ms"] *= 1.5
+    slower["scenarios"][name]["throughput_items_per_s"] *= 0.5
+    flagged = {(r["scenario"], r["metric"]) for r in compare_results(results, slower, threshold=0.1)}
+    assert flagged == {(name, "p95_ms"), (name, "throughput_items_per_s")}
@@ -0,0 +1,101 @@
+"""
+Answer Cache Test
+Checks LRU eviction, TTL expiry, single-flight coalescing of concurrent
+misses (including a follower's own deadline) and that the inference
+engine answers repeated requests from the cache
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.cache import AnswerCache
+from app.cancellation import CancelToken, RequestTimeout, get_or_compute
+
+
+def test_lru_eviction_and_ttl():
+    cache = AnswerCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"   # "b" is now least recently used
+    cache.put("c", "3")
+    assert cache.get("b") is None and cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.get_stats()["evictions"] == 1
+
+    cache = AnswerCache(ttl_seconds=0.05)
+    cache.put("a", "1")
+    assert cache.get("a") == "1"
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get_stats()["expirations"] == 1 and cache.get_stats()["entries"] == 0
+
+
+def test_single_flight_runs_one_compute_for_concurrent_misses():
+    cache = AnswerCache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get_or_compute, "key", compute) for _ in range(4)]
+        while cache.get_stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        release.set()
+        assert [future.result() for future in futures] == ["answer"] * 4
+
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert stats["misses"] == 1 and stats["coalesced"] == 3
+
+    # Failures reach every waiter and are not cached
+    def fail():
+        raise RuntimeError("generate failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("broken", fail)
+    assert cache.get_or_compute("broken", lambda: "fixed") == "fixed"
+
+
+def test_follower_gives_up_at_its_own_deadline():
+    cache = AnswerCache()
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "answer"
+
+    leader = threading.Thread(target=cache.get_or_compute, args=("key", slow))
+    leader.start()
+    while not cache._in_flight:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    with pytest.raises(RequestTimeout):
+        get_or_compute(cache, "key", slow, CancelToken(timeout=0.1))
+    assert time.perf_counter() - start < 2
+
+    release.set()
+    leader.join()
+    assert cache.get("key") == "answer"
+
+
+def test_engine_answers_repeats_from_cache():
+    from app.inference import QAInference
+    from app.tiny_model import build_tiny_model
+
+    model, tokenizer = build_tiny_model(seed=1)
+    cache = AnswerCache(8)
+    engine = QAInference(model, tokenizer, "cpu", num_beams=1, cache=cache)
+
+    first = engine.answer_question("What?", "Paris is in France.", max_length=8)
+    assert engine.answer_question("What?", "Paris is in France.", max_length=8)[0] == first[0]
+    engine.answer_question("What?", "Paris is in France.", "German", max_length=8)
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2
@@ -0,0 +1,119 @@
+"""
+Cancellation Test
+Checks that deadlines and cancellation stop generation between decode
+steps, reject queued requests and return a distinct timeout result
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.batching import MicroBatcher
+from app.cache import AnswerCache
+from app.cancellation import CancelToken, RequestCancelled, RequestTimeout
+from app.inference import QAInference
+from app.metrics import MetricsCollector
+from app.tiny_model import build_tiny_model
+
+QUESTION = ("What is it?", "The Eiffel Tower was built from 1887 to 1889.", "English")
+
+# The seed-1 tiny model never emits </s>, so greedy generation runs to max_length
+LONG_ANSWER = 400
+
+
+@pytest.fixture(scope="module")
+def model():
+    return build_tiny_model(seed=1)
+
+
+@pytest.mark.parametrize("num_beams", [1, 4])
+def test_deadline_stops_generation_between_steps(model, num_beams):
+    metrics = MetricsCollector()
+    inference = QAInference(*model, "cpu", num_beams=num_beams, hooks=[metrics], cache=AnswerCache(8))
+
+    start = time.perf_counter()
+    answer, info = inference.answer_question(*QUESTION, max_length=LONG_ANSWER, cancel_token=CancelToken(0.05))
+    stopped = time.perf_counter() - start
+    assert (answer, info) == (RequestTimeout.message, "")
+
+    # The timeout is not cached; the full answer takes much longer
+    start = time.perf_counter()
+    answer, _ = inference.answer_question(*QUESTION, max_length=LONG_ANSWER)
+    assert answer != RequestTimeout.message
+    assert stopped < (time.perf_counter() - start) / 2
+
+    assert metrics.snapshot()["aborted"] == {"cancelled": 0, "expired": 1}
+    assert 'qa_aborted_total{reason="expired"} 1' in metrics.render_prometheus()
+
+
+def test_done_requests_are_rejected_before_generate(model):
+    metrics = MetricsCollector()
+    inference = QAInference(*model, "cpu", num_beams=1, hooks=[metrics])
+
+    cancelled = CancelToken()
+    cancelled.cancel()
+    assert inference.answer_question(*QUESTION, cancel_token=cancelled)[0] == RequestCancelled.message
+
+    results = inference.answer_batch(
+        [QUESTION[0]] * 2, [QUESTION[1]] * 2, max_length=8, cancel_tokens=[CancelToken(deadline=0), None]
+    )
+    assert results[0] == (RequestTimeout.message, "")
+    assert results[1][0] == inference.answer_question(*QUESTION, max_length=8)[0]
+
+    snapshot = metrics.snapshot()
+    assert snapshot["aborted"] == {"cancelled": 1, "expired": 1}
+    assert snapshot["generate_calls_by_beams"] == {1: 2}
+
+
+def test_micro_batcher_drops_expired_queued_requests(model):
+    inference = QAInference(*model, "cpu", num_beams=1)
+    batcher = MicroBatcher(inference, max_batch_size=4, max_wait_ms=50).start()
+    try:
+        expired = batcher.submit(*QUESTION, max_length=8, cancel_token=CancelToken(deadline=0))
+        live = batcher.submit(*QUESTION, max_length=8, cancel_token=CancelToken(60))
+        with pytest.raises(RequestTimeout):
+            expired.result(timeout=30)
+        assert live.result(timeout=30)
+
+        assert batcher.answer_question(*QUESTION, cancel_token=CancelToken(deadline=0))[0] == RequestTimeout.message
+        stats = batcher.get_stats()
+        assert stats["expired_in_queue"] == 2 and stats["cancelled_in_queue"] == 0
+        assert stats["requests"] == 1
+    finally:
+        batcher.stop()
+
+
+def test_closing_a_stream_cancels_generation(model):
+    inference = QAInference(*model, "cpu", num_beams=1)
+    stream = inference.stream_answer(*QUESTION, max_length=LONG_ANSWER)
+    assert next(stream)[0]
+    stream.close()
+
+    deadline = time.time() + 5
+    while any(thread.name == "qa-stream" for thread in threading.enumerate()):
+        assert time.time() < deadline, "generation kept running after the stream was closed"
+        time.sleep(0.01)
+
+
+def test_long_context_and_multi_question_honour_deadlines(model):
+    metrics = MetricsCollector()
+    batcher = MicroBatcher(QAInference(*model, "cpu", num_beams=1, hooks=[metrics]))
+    long_context = " ".join([QUESTION[1]] * 30)
+
+    # Stopped between decode steps, through the batcher's delegation
+    start = time.perf_counter()
+    answer = batcher.answer_long_context(
+        QUESTION[0], long_context, max_length=LONG_ANSWER, window_size=64, stride=16, cancel_token=CancelToken(0.05)
+    )
+    assert answer == (RequestTimeout.message, "")
+    rows = batcher.answer_questions(
+        ["Who?", "When?"], QUESTION[1], max_length=LONG_ANSWER, cancel_token=CancelToken(0.05)
+    )
+    assert [(row["Answer"], row["Confidence"]) for row in rows] == [(RequestTimeout.message, "")] * 2
+    assert time.perf_counter() - start < 10
+
+    cancelled = CancelToken()
+    cancelled.cancel()
+    assert batcher.answer_long_context(*QUESTION, cancel_token=cancelled)[0] == RequestCancelled.message
+    assert metrics.snapshot()["aborted"] == {"cancelled": 1, "expired": 2}
@@ -0,0 +1,73 @@
+"""
+Cascade Decoding Test
+Checks that greedy answers above the score threshold are kept, that answers
+below it or outside their context escalate to beam search, and that the
+cascade counters and threshold sweep report it
+"""
+
+import pytest
+
+from app.cascade import sweep_thresholds
+from app.inference import QAInference
+from app.precision import PRECISION_CHECK_SAMPLES
+from app.tiny_model import build_tiny_model
+
+SAMPLES = PRECISION_CHECK_SAMPLES[:4]
+
+
+@pytest.fixture(scope="module")
+def tiny():
+    return build_tiny_model(seed=1)
+
+
+def answers(engine):
+    results = engine.answer_batch(
+        [s["question"] for s in SAMPLES], [s["context"] for s in SAMPLES], "English", max_length=10
+    )
+    return [answer for answer, _ in results]
+
+
+@pytest.mark.parametrize("min_score, escalated", [(-1e9, 0), (1.0, len(SAMPLES))])
+def test_cascade_escalates_below_threshold(tiny, min_score, escalated):
+    model, tokenizer = tiny
+    # Constrained answers are always grounded, so only the score decides
+    engine = QAInference(
+        model, tokenizer, "cpu", num_beams=4, constrained_decoding=True, cascade=True, cascade_min_score=min_score
+    )
+    greedy = answers(QAInference(model, tokenizer, "cpu", num_beams=1, constrained_decoding=True))
+    beam = answers(QAInference(model, tokenizer, "cpu", num_beams=4, constrained_decoding=True))
+    assert greedy != beam
+    assert answers(engine) == (beam if escalated else greedy)
+
+    stats = engine.get_cascade_stats()
+    assert stats["items"] == len(SAMPLES) and stats["escalated"] == escalated
+    assert stats["latency_ms"]["greedy"]["calls"] == 1
+    assert stats["latency_ms"]["beam"]["calls"] == (1 if escalated else 0)
+
+
+def test_ungrounded_greedy_answers_escalate(tiny):
+    model, tokenizer = tiny
+    # The unconstrained random model answers outside the context
+    engine = QAInference(model, tokenizer, "cpu", num_beams=4, cascade=True, cascade_min_score=-1e9)
+    answers(engine)
+    assert engine.get_cascade_stats()["escalation_rate"] == 1.0
+
+
+def test_threshold_sweep(tiny):
+    model, tokenizer = tiny
+    report = sweep_thresholds(model, tokenizer, "cpu", thresholds=(-1e9, 1.0), samples=SAMPLES)
+    assert list(report["thresholds"]) == [-1e9, 1.0]
+    # No greedy score reaches 1.0, so that threshold escalates everything
+    assert report["thresholds"][1.0]["escalation_rate"] == 1.0
+    assert report["thresholds"][1.0]["exact_match"] == report["beam_only"]["exact_match"]
+    assert report["recommended_min_score"] in report["thresholds"]
+
+
+def test_score_candidates_match_the_tiers(tiny):
+    model, tokenizer = tiny
+    engine = QAInference(model, tokenizer, "cpu", num_beams=4, constrained_decoding=True)
+    questions, contexts = [s["question"] for s in SAMPLES], [s["context"] for s in SAMPLES]
+    for num_beams in (1, 4):
+        candidates, scores = engine.score_candidates(questions, contexts, "English", num_beams, max_length=10)
+        tier = QAInference(model, tokenizer, "cpu", num_beams=num_beams, constrained_decoding=True)
+        assert candidates == answers(tier) and len(scores) == len(SAMPLES)
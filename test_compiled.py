@@ -0,0 +1,95 @@
+"""
+Compiled Inference Test
+Loads a tiny model with torch.compile (eager dynamo backend, to keep the
+test fast), checks that warm-up covers every length bucket, that answers
+match eager mode without recompiling, and that a compile failure falls
+back to eager
+"""
+
+import tempfile
+
+import pytest
+import torch
+
+from app.compiled import RECOMPILE_LIMIT_PER_BUCKET, CompiledModel, check_buckets
+from app.inference import QAInference
+from app.model_loader import ModelLoader
+from app.tiny_model import build_tiny_model
+
+QUESTIONS = ["What?", "What is the capital of France, and when was it founded? " * 5]
+CONTEXT = "Paris is the capital and most populous city of France."
+
+
+def save_tiny_model():
+    path = tempfile.mkdtemp(prefix="tiny_mbart_")
+    build_tiny_model(seed=1, save_path=path)
+    return path
+
+
+def answers(engine, question):
+    """Single-request and micro-batched answers to a question"""
+    single, _ = engine.answer_question(question, CONTEXT, max_length=10)
+    batch = engine.answer_batch([question] * 3, [CONTEXT] * 3, max_length=10)
+    return single, [answer for answer, _ in batch]
+
+
+def test_bucket_padding():
+    assert check_buckets([256, 32, 32]) == (32, 256)
+    with pytest.raises(ValueError):
+        check_buckets([32, 64])
+    with pytest.raises(ValueError):
+        ModelLoader(model_path="unused", backend="onnx", torch_compile=True)
+
+    model, tokenizer = build_tiny_model()
+    inference = QAInference(model, tokenizer, "cpu")
+    compiled = CompiledModel(model, tokenizer, "cpu", backend="eager", length_buckets=(8, 32, 256))
+    limit = "recompile_limit" if hasattr(torch._dynamo.config, "recompile_limit") else "cache_size_limit"
+    default_limit = getattr(torch._dynamo.config, limit)
+    assert inference._pad_inputs([[5] * 3, [5] * 6])[0].shape == (2, 6)
+
+    # compile() makes every engine on the model pad to the buckets
+    compiled.compile()
+    assert getattr(torch._dynamo.config, limit) == max(default_limit, 3 * RECOMPILE_LIMIT_PER_BUCKET)
+    assert inference._pad_inputs([[5] * 3, [5] * 6])[0].shape == (2, 8)
+    assert inference._pad_inputs([[5] * 9])[0].shape == (1, 32)
+    # Longer than the largest bucket: exact width
+    input_ids, attention_mask = inference._pad_inputs([[5] * 300])
+    assert input_ids.shape == (1, 300) and attention_mask.all()
+
+    compiled.revert()
+    assert inference._pad_inputs([[5] * 3, [5] * 6])[0].shape == (2, 6)
+    assert getattr(torch._dynamo.config, limit) == default_limit
+
+
+def test_compiled_model_matches_eager_without_recompiles():
+    path = save_tiny_model()
+    loader = ModelLoader(model_path=path, torch_compile=True, compile_backend="eager", length_buckets=(16, 256))
+    model, tokenizer = loader.load()
+    assert loader.length_buckets == (16, 256)
+
+    stats = loader.get_model_info()["compile"]
+    assert set(stats["warmup"]["buckets"]) == {16, 256}
+    assert all(bucket["graphs"] > 0 and bucket["latency_ms"] > 0 for bucket in stats["warmup"]["buckets"].values())
+    assert stats["graphs"]["encoder"] > 0 and stats["graphs"]["decoder"] > 0
+    assert loader.load_stats["compiled"]
+
+    compiled = QAInference(model, tokenizer, loader.device)
+    eager_model, _ = ModelLoader(model_path=path).load()
+    eager = QAInference(eager_model, tokenizer, "cpu")
+    for question in QUESTIONS:
+        assert answers(compiled, question) == answers(eager, question)
+
+    assert loader.compiled.get_stats()["recompiles_after_warmup"] == 0
+
+
+def test_compile_failure_falls_back_to_eager():
+    path = save_tiny_model()
+    loader = ModelLoader(model_path=path, torch_compile=True, compile_backend="no_such_backend")
+    model, tokenizer = loader.load()
+    assert loader.compiled is None and loader.length_buckets is None
+    assert not loader.load_stats["compiled"]
+    assert "forward" not in model.get_encoder().__dict__
+
+    inference = QAInference(model, tokenizer, loader.device)
+    assert inference._pad_inputs([[5] * 3, [5] * 6])[0].shape == (2, 6)
+    assert inference.answer_question("What?", CONTEXT, max_length=8)[1]
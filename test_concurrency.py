@@ -0,0 +1,76 @@
+"""
+Concurrency Stress Test
+Runs mixed English/German requests from many threads against one shared
+model and checks every answer matches its sequential, single-threaded result
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import torch
+
+from app.batching import MicroBatcher
+from app.inference import QAInference
+from app.precision import PRECISION_CHECK_SAMPLES
+from app.tiny_model import build_tiny_model
+
+
+NUM_THREADS = 8
+ROUNDS = 6
+
+
+@pytest.fixture(scope="module")
+def engine():
+    model, tokenizer = build_tiny_model(seed=1)
+    return QAInference(model, tokenizer, torch.device("cpu"))
+
+
+@pytest.fixture(scope="module")
+def workload(engine):
+    """Every sample asked in both languages, with its sequential reference answer"""
+    requests = [
+        (sample["question"], sample["context"], language)
+        for sample in PRECISION_CHECK_SAMPLES
+        for language in ("English", "German")
+    ]
+    expected = {request: engine.answer_question(*request) for request in requests}
+
+    # The forced language token must actually change the output, otherwise
+    # a language mix-up between threads would go unnoticed
+    differing = sum(
+        expected[(q, c, "English")][0] != expected[(q, c, "German")][0]
+        for q, c, language in requests if language == "English"
+    )
+    assert differing > 0
+
+    shuffled = requests * ROUNDS
+    random.Random(0).shuffle(shuffled)
+    return shuffled, expected
+
+
+def test_threads_share_engine(engine, workload):
+    """Mixed-language requests from many threads get their own language's answer"""
+    requests, expected = workload
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as pool:
+        results = list(pool.map(lambda request: engine.answer_question(*request), requests))
+
+    for request, result in zip(requests, results):
+        assert result == expected[request]
+
+    assert engine.tokenizer.src_lang == "en_XX"
+
+
+def test_micro_batcher_workers(engine, workload):
+    """Several batching workers answer mixed-language batches in parallel"""
+    requests, expected = workload
+    batcher = MicroBatcher(engine, max_batch_size=4, max_wait_ms=5, num_workers=3).start()
+    try:
+        with ThreadPoolExecutor(max_workers=NUM_THREADS) as pool:
+            results = list(pool.map(lambda request: batcher.answer_question(*request), requests))
+    finally:
+        batcher.stop()
+
+    for request, result in zip(requests, results):
+        assert result == expected[request]
+    assert batcher.get_stats()["requests"] == len(requests)
@@ -0,0 +1,49 @@
+"""
+Constrained Decoding Test
+Checks the context span index and that constrained answers of a tiny
+model are always spans of their own context, for greedy and beam search
+"""
+
+import pytest
+import torch
+
+from app.constrained import ContextConstraint, ContextSpanIndex
+from app.inference import QAInference
+from app.precision import PRECISION_CHECK_SAMPLES
+from app.tiny_model import build_tiny_model
+
+
+def test_span_index_and_constraint():
+    index = ContextSpanIndex([5, 6, 7, 5, 8])
+    assert sorted(index.next_tokens(())) == [5, 6, 7, 8]
+    assert sorted(index.next_tokens((5,))) == [6, 8]
+    assert index.next_tokens((5, 6)) == [7]
+    assert index.next_tokens((5, 8)) == []     # end of the context
+    assert index.next_tokens((6, 5)) == []     # not a span
+
+    constraint = ContextConstraint([[5, 6, 7], [9]], lang_code=3, eos_token_id=2)
+    assert constraint(0, torch.tensor([0])) == [3]                    # forced language token
+    assert sorted(constraint(0, torch.tensor([0, 3]))) == [5, 6, 7]   # no empty answer
+    assert sorted(constraint(0, torch.tensor([0, 3, 6]))) == [2, 7]
+    assert constraint(1, torch.tensor([0, 3, 9])) == [2]              # only EOS remains
+
+
+@pytest.mark.parametrize("num_beams", [1, 4])
+def test_constrained_answers_are_context_spans(num_beams):
+    model, tokenizer = build_tiny_model(seed=1)
+    engine = QAInference(model, tokenizer, "cpu", num_beams=num_beams, constrained_decoding=True)
+    samples = PRECISION_CHECK_SAMPLES
+
+    results = engine.answer_batch(
+        [s["question"] for s in samples], [s["context"] for s in samples], [s["language"] for s in samples],
+        max_length=10
+    )
+    for (answer, _), sample in zip(results, samples):
+        # The tiny tokenizer drops unknown characters, so compare with the context as the model sees it
+        context = tokenizer.decode(tokenizer(sample["context"], add_special_tokens=False)["input_ids"])
+        assert answer.strip() and answer.strip() in context
+
+    # Without the constraint the random model does not stay in the context
+    free = QAInference(model, tokenizer, "cpu", num_beams=num_beams)
+    answer, _ = free.answer_question(samples[0]["question"], samples[0]["context"], max_length=10)
+    assert answer.strip() not in samples[0]["context"]
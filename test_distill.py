@@ -0,0 +1,58 @@
+"""
+Distillation Test
+Distills a 2-layer-decoder student from a tiny 4-layer teacher and checks
+that it keeps the teacher's encoder, trains, and loads through ModelLoader
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import torch
+
+from app.distill import build_distilled_model, build_student, select_layers
+from app.model_loader import ARTIFACT_MANIFEST, ModelLoader
+from app.precision import PRECISION_CHECK_SAMPLES
+from app.tiny_model import build_tiny_model
+
+
+def test_select_layers():
+    assert select_layers(12, 3) == [0, 6, 11]
+    assert select_layers(4, 2) == [0, 3]
+    assert select_layers(4, 1) == [3]
+
+
+def test_student_copies_teacher_layers():
+    teacher, _ = build_tiny_model(layers=4)
+    student = build_student(teacher, decoder_layers=2)
+    assert student.config.decoder_layers == len(student.model.decoder.layers) == 2
+    assert student.model.decoder.layers[1].self_attn.layer_idx == 1
+    torch.testing.assert_close(
+        student.model.decoder.layers[1].fc1.weight, teacher.model.decoder.layers[3].fc1.weight
+    )
+    assert student.model.decoder.layers[1].fc1.weight is not teacher.model.decoder.layers[3].fc1.weight
+
+
+def test_build_distilled_model_is_a_drop_in():
+    teacher_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+    build_tiny_model(layers=4, save_path=teacher_path)
+    output_path = tempfile.mkdtemp(prefix="tiny_student_")
+
+    report = build_distilled_model(
+        teacher_path, output_path, PRECISION_CHECK_SAMPLES, PRECISION_CHECK_SAMPLES[:2],
+        decoder_layers=2, epochs=3, batch_size=4, learning_rate=1e-3, max_length=16
+    )
+    losses = report["training"]["loss_per_epoch"]
+    assert len(losses) == 3 and losses[-1] < losses[0]
+    assert report["student"]["model_size_mb"] < report["teacher"]["model_size_mb"]
+    assert {"exact_match", "f1", "agreement_em", "agreement_f1", "speedup"} <= set(report["student"])
+
+    manifest = json.loads((Path(output_path) / ARTIFACT_MANIFEST).read_text())
+    assert manifest["format"] == "distilled" and manifest["layer_map"] == [0, 3]
+
+    student, _ = ModelLoader(model_path=output_path).load()
+    teacher, _ = ModelLoader(model_path=teacher_path).load()
+    assert len(student.model.decoder.layers) == 2
+    torch.testing.assert_close(
+        student.model.encoder.layers[0].fc1.weight, teacher.model.encoder.layers[0].fc1.weight
+    )
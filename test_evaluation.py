@@ -0,0 +1,66 @@
+"""
+Evaluation Pipeline Test
+Scores known predictions and checks that reruns only regenerate or rescore
+changed items
+"""
+
+import json
+
+import pytest
+import torch
+
+from app.evaluation import _score_items, corpus_bleu, evaluate_datasets
+from app.inference import QAInference
+from app.tiny_model import build_tiny_model
+from app.utils import PERFORMANCE_DATA, load_performance_data
+
+
+def test_scoring():
+    exact, partial, wrong = _score_items([
+        ("die Hauptstadt", ["Hauptstadt", "die Hauptstadt"]),
+        ("the capital city", ["the capital"]),
+        ("Paris", ["Berlin"])
+    ])
+    assert exact["exact_match"] == 1.0 and exact["f1"] == 1.0 and exact["rougeL"] == 1.0
+    assert partial["exact_match"] == 0.0 and 0.0 < partial["f1"] < 1.0
+    assert wrong["f1"] == 0.0 and wrong["rouge1"] == 0.0
+
+    assert corpus_bleu(["the cat sat on the mat"], [["the cat sat on the mat", "a cat"]]) == pytest.approx(100.0)
+
+
+def test_cached_rerun(tmp_path):
+    model, tokenizer = build_tiny_model()
+    inference = QAInference(model, tokenizer, torch.device("cpu"), num_beams=1)
+
+    path = tmp_path / "de.jsonl"
+
+    def write_items(answers):
+        with open(path, "w") as f:
+            for i in range(6):
+                item = {"question": f"Frage {i}?", "context": f"Berlin ist die Hauptstadt {i}.", "answers": answers}
+                f.write(json.dumps(item) + "\n")
+
+    write_items(["Berlin"])
+    cache_path = str(tmp_path / "cache.jsonl")
+    run = lambda: evaluate_datasets(inference, [(str(path), "German")], "tiny", cache_path=cache_path,
+                                    max_length=8, chunk_size=4, processes=2)
+
+    first = run()
+    assert first["stats"]["generated"] == 6 and first["stats"]["scored"] == 6
+    assert set(first["languages"]["German"]) >= set(PERFORMANCE_DATA["German"])
+
+    second = run()
+    assert second["stats"]["generated"] == 0 and second["stats"]["scored"] == 0
+    assert second["languages"] == first["languages"]
+
+    # Changed references: predictions are reused, only scoring reruns
+    write_items(["die Hauptstadt"])
+    third = run()
+    assert third["stats"]["generated"] == 0 and third["stats"]["scored"] == 6
+
+    # The Performance Metrics tab loads the results file instead of the constants
+    results_path = tmp_path / "eval_results.json"
+    results_path.write_text(json.dumps(third))
+    data, source = load_performance_data(str(results_path))
+    assert data == third["languages"] and "tiny" in source
+    assert load_performance_data(str(tmp_path / "missing.json"))[0] is PERFORMANCE_DATA
@@ -0,0 +1,63 @@
+"""
+Import-Time Test
+Guards against heavy dependencies creeping back into light entry points
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY = ("torch", "transformers", "peft", "gradio", "plotly", "pandas")
+
+# Module -> heavy dependencies it may import at module level
+ALLOWED = {
+    "app": (),
+    "app.utils": (),
+    "app.metrics": (),
+    "app.cache": (),
+    "app.batching": (),
+    "app.constrained": (),
+    "app.api": (),
+    "app.evaluation": (),
+    "app.retrieval": (),
+    "app.cancellation": (),
+    "app.inference": ("torch",),
+    "app.model_loader": ("torch",),
+}
+
+# Generous wall-clock budget for importing a module without heavy dependencies
+LIGHT_IMPORT_BUDGET_SECONDS = 1.0
+
+
+def measure_import(module: str) -> dict:
+    """Import module in a fresh interpreter; return its import time and loaded heavy modules"""
+    code = (
+        "import importlib, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"importlib.import_module({module!r})\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': seconds, 'heavy': [m for m in {HEAVY!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", list(ALLOWED))
+def test_no_heavy_imports(module):
+    result = measure_import(module)
+    unexpected = set(result["heavy"]) - set(ALLOWED[module])
+    assert not unexpected, f"importing {module} loads {sorted(unexpected)}"
+    if not ALLOWED[module]:
+        assert result["seconds"] < LIGHT_IMPORT_BUDGET_SECONDS, f"importing {module} took {result['seconds']:.2f}s"
+
+
+def test_lazy_package_exports():
+    """Package-level names still resolve (and load their module on access)"""
+    import app
+
+    assert app.calculate_confidence("in Germany", "Berlin is in Germany.") == "High"
+    assert app.QAInference.__name__ == "QAInference"
+    assert set(app.__all__) <= set(dir(app))
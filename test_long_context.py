@@ -0,0 +1,64 @@
+"""
+Long Context Test
+Checks that the sliding windows cover a long context with the requested
+overlap and that the answer is chosen across windows: grounded answers
+first, then the highest score
+"""
+
+import pytest
+
+from app.inference import QAInference
+from app.tiny_model import build_tiny_model
+
+SENTENCES = [f"Fact {i} is that item {i} sits on shelf {i}." for i in range(40)]
+CONTEXT = " ".join(SENTENCES)
+
+
+@pytest.fixture()
+def engine():
+    model, tokenizer = build_tiny_model(seed=1)
+    return QAInference(model, tokenizer, "cpu", num_beams=1)
+
+
+def test_windows_cover_context_with_overlap(engine):
+    windows = engine._split_windows("Where is item 7?", CONTEXT, "English", window_size=64, stride=16)
+    assert len(windows) > 2
+    assert all(len(ids) <= 64 for ids, _ in windows)
+
+    context_ids = engine.tokenizer(CONTEXT, add_special_tokens=False)["input_ids"]
+    question_ids, prefix_ids = engine.tokenizer(
+        ["question: Where is item 7?", "context:"], add_special_tokens=False
+    )["input_ids"]
+    # [lang_code] question: ... context: <window> </s>
+    spans = [ids[1 + len(question_ids) + len(prefix_ids):-1] for ids, _ in windows]
+    assert spans[0] == context_ids[:len(spans[0])]
+    # Consecutive windows share stride tokens, and the last one reaches the end
+    assert spans[1][:16] == spans[0][-16:]
+    assert spans[-1] == context_ids[-len(spans[-1]):]
+
+    with pytest.raises(ValueError):
+        engine._split_windows("Where is item 7?", CONTEXT, "English", window_size=20, stride=16)
+
+
+def test_answer_chosen_across_windows(engine):
+    def generate(encoded, language, max_length, return_scores=False, contexts=None, **kwargs):
+        # Window 2 is the only grounded answer; window 3 scores higher but is not in its window
+        answers = ["not in the text"] * len(encoded)
+        scores = [-1.0] * len(encoded)
+        answers[1] = contexts[1].split()[2]
+        answers[2], scores[2] = "also not in the text", 0.0
+        return answers, scores
+
+    engine._generate_from_ids = generate
+    answer, info = engine.answer_long_context("Where is item 7?", CONTEXT, window_size=64, stride=16)
+    windows = engine._split_windows("Where is item 7?", CONTEXT, "English", 64, 16)
+    assert answer == windows[1][1].split()[2]
+    assert "- **Best Window**: 2\n" in info
+
+
+def test_long_context_on_tiny_model():
+    model, tokenizer = build_tiny_model(seed=1)
+    engine = QAInference(model, tokenizer, "cpu", num_beams=2, constrained_decoding=True)
+    answer, info = engine.answer_long_context("Where is item 7?", CONTEXT, max_length=8, window_size=64, stride=16)
+    assert answer.strip() and answer.strip() in CONTEXT
+    assert "Windows Evaluated" in info
@@ -0,0 +1,34 @@
+"""
+Metrics Test
+Checks that QAInference reports stage timings and counters to its hooks
+"""
+
+import torch
+
+from app.inference import QAInference
+from app.metrics import STAGES, MetricsCollector
+from app.tiny_model import build_tiny_model
+
+
+def test_stage_metrics_and_prometheus_export():
+    """Every stage is timed and exported; counters match the requests made"""
+    model, tokenizer = build_tiny_model()
+    metrics = MetricsCollector()
+    inference = QAInference(model, tokenizer, torch.device("cpu"), hooks=[metrics])
+
+    inference.answer_question("Where is Berlin?", "Berlin is in Germany.", "English", max_length=8)
+    inference.answer_batch(["Wo?", "Was?"], ["Berlin liegt in Deutschland.", "Ein Satz."], "German", max_length=8)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"English": 1, "German": 2}
+    assert snapshot["encoded_items"] == 3
+    assert snapshot["tokens_in"] > 0 and snapshot["tokens_out"] > 0
+    assert snapshot["generate_calls_by_beams"] == {inference.num_beams: 2}
+    for stage in STAGES:
+        stats = snapshot["stages"][stage]
+        assert stats["count"] > 0
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    text = metrics.render_prometheus()
+    assert 'qa_requests_total{language="German"} 2' in text
+    assert 'qa_stage_latency_seconds_count{stage="generate"} 2' in text
@@ -0,0 +1,62 @@
+"""
+Multi-Question Test
+Checks that answer_questions encodes the shared context once into the same
+inputs as single requests, keeps each answer with its question and input
+order, and reports a failed generation as per-question error rows
+"""
+
+import pytest
+
+from app.inference import QAInference
+from app.tiny_model import build_tiny_model
+
+CONTEXT = "Rome was founded in 753 BC by Romulus. Paris is in France. Jupiter is a gas giant planet."
+QUESTIONS = ["Who founded Rome?", "Where is Paris?", " ", "What is Jupiter?", "Who founded Rome?"]
+
+
+@pytest.fixture()
+def engine():
+    model, tokenizer = build_tiny_model(seed=1)
+    return QAInference(model, tokenizer, "cpu", num_beams=1)
+
+
+def test_shared_context_encoding_and_order(engine):
+    calls = []
+    generate_from_ids = engine._generate_from_ids
+
+    def echo(encoded, *args, **kwargs):
+        # Answer every input with its own text, so a question/answer mix-up shows
+        calls.append(encoded)
+        return [engine.tokenizer.decode(ids, skip_special_tokens=True) for ids in encoded]
+
+    engine._generate_from_ids = echo
+    rows = engine.answer_questions(QUESTIONS, CONTEXT, max_length=8)
+
+    # Blank questions are skipped, duplicates answered once, input order kept
+    assert [row["Question"] for row in rows] == [q for q in QUESTIONS if q.strip()]
+    assert len(calls) == 1 and len(calls[0]) == 3
+
+    # The shared-context inputs are the ones single requests build
+    single = {
+        row["Question"]: engine._encode([engine._format_input(row["Question"], CONTEXT)], ["English"], 256)[0]
+        for row in rows
+    }
+    assert calls[0] == [single[q] for q in ("Who founded Rome?", "Where is Paris?", "What is Jupiter?")]
+    for row in rows:
+        assert row["Answer"] == engine.tokenizer.decode(single[row["Question"]], skip_special_tokens=True)
+
+    engine._generate_from_ids = generate_from_ids
+    rows = engine.answer_questions(QUESTIONS, CONTEXT, max_length=8)
+    assert [row["Answer"] for row in rows] == [
+        engine.generate_answers([row["Question"]], [CONTEXT], "English", 8)[0] for row in rows
+    ]
+
+
+def test_failed_generation_gives_error_rows(engine):
+    def fail(*args, **kwargs):
+        raise RuntimeError("generate failed")
+
+    engine._generate_from_ids = fail
+    rows = engine.answer_questions(QUESTIONS, CONTEXT)
+    assert len(rows) == 4
+    assert all(row["Answer"] == "❌ Error: generate failed" and row["Confidence"] == "" for row in rows)
@@ -0,0 +1,88 @@
+"""
+Offline Batch Inference Test
+Streams a JSONL and a SQuAD-format file through the tiny model and checks
+that a crashed run resumes without redoing or losing items
+"""
+
+import json
+
+import pytest
+import torch
+
+from app.inference import QAInference
+from app.offline import checkpoint_path, iter_items, run_offline
+from app.tiny_model import build_tiny_model
+
+
+@pytest.fixture(scope="module")
+def inference():
+    model, tokenizer = build_tiny_model()
+    return QAInference(model, tokenizer, torch.device("cpu"), num_beams=1)
+
+
+@pytest.fixture
+def jsonl_input(tmp_path):
+    path = tmp_path / "input.jsonl"
+    with open(path, "w") as f:
+        for i in range(11):
+            item = {"id": f"q{i}", "question": f"Question {i}?", "context": f"Context number {i} about Berlin."}
+            if i % 2:
+                item["language"] = "German"
+            f.write(json.dumps(item) + "\n")
+    return str(path)
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_squad_input(tmp_path):
+    path = tmp_path / "xquad.json"
+    path.write_text(json.dumps({"data": [{"paragraphs": [{
+        "context": "Berlin ist die Hauptstadt.",
+        "qas": [
+            {"id": "a", "question": "Was ist Berlin?", "answers": [{"text": "die Hauptstadt", "answer_start": 11}]},
+            {"id": "b", "question": "Wo?", "answers": []}
+        ]
+    }]}]}, indent=2))
+
+    items = list(iter_items(str(path), language="German"))
+    assert [item["id"] for item in items] == ["a", "b"]
+    assert items[0]["answers"] == ["die Hauptstadt"]
+    assert {item["language"] for item in items} == {"German"}
+
+
+def test_resume_after_crash(inference, jsonl_input, tmp_path):
+    reference_path = str(tmp_path / "reference.jsonl")
+    stats = run_offline(inference, jsonl_input, reference_path, chunk_size=4, batch_size=2, max_length=8)
+    assert stats["processed"] == 11 and stats["errors"] == 0
+    reference = read_jsonl(reference_path)
+    assert [r["id"] for r in reference] == [f"q{i}" for i in range(11)]
+
+    # Crash while answering the third chunk, after a partial write
+    output_path = str(tmp_path / "output.jsonl")
+    answer_batch = inference.answer_batch
+    calls = []
+
+    def crashing_answer_batch(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            with open(output_path, "a") as f:
+                f.write('{"id": "partial"')
+            raise RuntimeError("simulated crash")
+        return answer_batch(*args, **kwargs)
+
+    inference.answer_batch = crashing_answer_batch
+    try:
+        with pytest.raises(RuntimeError):
+            run_offline(inference, jsonl_input, output_path, chunk_size=4, batch_size=2, max_length=8)
+    finally:
+        del inference.answer_batch
+
+    with open(checkpoint_path(output_path)) as f:
+        assert json.load(f)["items_done"] == 8
+
+    stats = run_offline(inference, jsonl_input, output_path, chunk_size=4, batch_size=2, max_length=8)
+    assert stats["resumed_from"] == 8 and stats["processed"] == 3
+    assert read_jsonl(output_path) == reference
@@ -0,0 +1,132 @@
+"""
+ONNX Backend Parity Test
+Checks that the ONNX Runtime backend generates exactly what PyTorch
+generates, using a tiny randomly-initialized mBART model
+"""
+
+import tempfile
+import threading
+
+import pytest
+import torch
+
+pytest.importorskip("onnxruntime")
+
+from app.inference import LANGUAGE_CODES, QAInference
+from app.model_loader import ModelLoader
+from app.onnx_backend import export_onnx
+from app.precision import PRECISION_CHECK_SAMPLES
+from app.tiny_model import build_tiny_model
+
+
+@pytest.fixture(scope="module")
+def engines():
+    """PyTorch and ONNX Runtime engines over the same tiny model"""
+    model, tokenizer = build_tiny_model(seed=0)
+    output = tempfile.mkdtemp()
+    export_onnx(model, tokenizer, output)
+
+    loader = ModelLoader(model_path=output, backend="onnx")
+    onnx_model, onnx_tokenizer = loader.load()
+
+    cpu = torch.device("cpu")
+    return QAInference(model, tokenizer, cpu), QAInference(onnx_model, onnx_tokenizer, cpu)
+
+
+@pytest.mark.parametrize("num_beams", [1, 4])
+@pytest.mark.parametrize("language", ["English", "German"])
+def test_generate_parity(engines, num_beams, language):
+    """Beam and greedy search return the same sequences and scores"""
+    torch_engine, onnx_engine = engines
+    encoded = torch_engine._encode(
+        [torch_engine._format_input(s["question"], s["context"]) for s in PRECISION_CHECK_SAMPLES],
+        [language] * len(PRECISION_CHECK_SAMPLES),
+        256
+    )
+    width = max(len(ids) for ids in encoded)
+    input_ids = torch.tensor([ids + [1] * (width - len(ids)) for ids in encoded])
+    attention_mask = (input_ids != 1).long()
+    lang_code = torch_engine.tokenizer.convert_tokens_to_ids(LANGUAGE_CODES[language])
+
+    for max_length in (5, 32):
+        kwargs = dict(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            max_length=max_length,
+            num_beams=num_beams,
+            early_stopping=True,
+            forced_bos_token_id=lang_code,
+            output_scores=True,
+            return_dict_in_generate=True
+        )
+        expected = torch_engine.model.generate(**kwargs)
+        actual = onnx_engine.model.generate(**kwargs)
+
+        assert torch.equal(expected.sequences, actual.sequences)
+        if num_beams > 1:
+            assert torch.allclose(expected.sequences_scores, actual.sequences_scores, atol=1e-4)
+
+
+def test_answer_parity(engines):
+    """QAInference returns identical (answer, response_info) on both backends"""
+    torch_engine, onnx_engine = engines
+    for sample in PRECISION_CHECK_SAMPLES:
+        expected = torch_engine.answer_question(sample["question"], sample["context"], sample["language"])
+        actual = onnx_engine.answer_question(sample["question"], sample["context"], sample["language"])
+        assert not expected[0].startswith("❌")
+        assert expected == actual
+
+
+class RecordingStreamer:
+    """Collects what generate hands to a streamer"""
+
+    def __init__(self):
+        self.values = []
+        self.ended = False
+
+    def put(self, value):
+        self.values.append(value.reshape(-1).tolist())
+
+    def end(self):
+        self.ended = True
+
+
+def test_streamer_and_unsupported_arguments(engines):
+    """The streamer sees the same tokens as transformers; unknown arguments are rejected"""
+    torch_engine, onnx_engine = engines
+    encoded = torch_engine._encode(["question: What? context: Paris is in France."], ["English"], 256)
+    kwargs = dict(input_ids=torch.tensor(encoded), max_length=12, num_beams=1, forced_bos_token_id=encoded[0][0])
+
+    streamed = {}
+    for name, engine in (("torch", torch_engine), ("onnx", onnx_engine)):
+        streamer = RecordingStreamer()
+        sequences = engine.model.generate(**kwargs, streamer=streamer)
+        assert streamer.ended
+        assert [token for value in streamer.values for token in value] == sequences[0].tolist()
+        streamed[name] = streamer.values
+    assert streamed["torch"] == streamed["onnx"]
+
+    with pytest.raises(ValueError):
+        onnx_engine.model.generate(**{**kwargs, "num_beams": 2}, streamer=RecordingStreamer())
+    with pytest.raises(TypeError):
+        onnx_engine.model.generate(**kwargs, min_new_tokens=4)
+
+
+def test_stream_answer_through_onnx(engines):
+    """Streaming through the ONNX backend finishes with the greedy answer"""
+    torch_engine, onnx_engine = engines
+    streaming = QAInference(onnx_engine.model, onnx_engine.tokenizer, torch.device("cpu"), num_beams=1)
+    sample = PRECISION_CHECK_SAMPLES[0]
+    args = (sample["question"], sample["context"], sample["language"])
+
+    chunks = []
+    consumer = threading.Thread(
+        target=lambda: chunks.extend(streaming.stream_answer(*args, max_length=12)), daemon=True
+    )
+    consumer.start()
+    consumer.join(timeout=60)
+    assert not consumer.is_alive(), "stream_answer did not finish"
+
+    reference = QAInference(torch_engine.model, torch_engine.tokenizer, torch.device("cpu"), num_beams=1)
+    answer, info = chunks[-1]
+    assert answer == reference.answer_question(*args, max_length=12)[0] and "Response Details" in info
@@ -0,0 +1,53 @@
+"""
+Precision Modes Test
+Converts a tiny model to bf16 and int8, loads a precision mode through
+ModelLoader and checks the precision report against fp32
+"""
+
+import tempfile
+
+import pytest
+import torch
+
+from app.inference import QAInference
+from app.model_loader import ModelLoader, apply_precision
+from app.precision import PRECISION_CHECK_SAMPLES, check_precision_modes, model_size_mb
+from app.tiny_model import build_tiny_model
+
+
+def test_apply_precision():
+    model, _ = build_tiny_model(seed=1)
+    assert apply_precision(model, "fp32") is model
+    with pytest.raises(ValueError):
+        apply_precision(model, "fp8")
+
+    bf16 = apply_precision(build_tiny_model(seed=1)[0], "bf16")
+    assert bf16.model.encoder.layers[0].fc1.weight.dtype == torch.bfloat16
+
+    int8 = apply_precision(build_tiny_model(seed=1)[0], "int8")
+    assert "quantized" in type(int8.model.encoder.layers[0].fc1).__module__
+    assert model_size_mb(int8) < model_size_mb(model)
+
+
+def test_loader_precision_and_report():
+    path = tempfile.mkdtemp(prefix="tiny_mbart_")
+    build_tiny_model(seed=1, save_path=path)
+    with pytest.raises(ValueError):
+        ModelLoader(model_path=path, precision="fp16")
+
+    loader = ModelLoader(model_path=path, precision="bf16")
+    model, tokenizer = loader.load()
+    assert loader.get_model_info()["precision"] == "bf16"
+    assert next(model.parameters()).dtype == torch.bfloat16
+    engine = QAInference(model, tokenizer, loader.device)
+    answer, info = engine.answer_question("What?", "Paris is in France.", max_length=8)
+    assert not answer.startswith("❌") and "Response Details" in info
+
+    fp32, _ = ModelLoader(model_path=path).load()
+    report = check_precision_modes(fp32, tokenizer, torch.device("cpu"), ["int8"], PRECISION_CHECK_SAMPLES[:3])
+    assert list(report) == ["fp32", "int8"]
+    assert report["fp32"]["em_drift"] == 0 and report["fp32"]["agreement_with_fp32"] == 1
+    assert report["int8"]["errors"] == 0 and 0 <= report["int8"]["agreement_with_fp32"] <= 1
+    assert report["int8"]["model_size_mb"] < report["fp32"]["model_size_mb"]
+    # The original model is left in fp32
+    assert next(fp32.parameters()).dtype == torch.float32
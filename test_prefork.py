@@ -0,0 +1,145 @@
+"""
+Pre-fork Serving Test
+Checks that forked workers answer like the in-process engine, share the
+load, report their hook events to the parent and are replaced when they
+crash
+"""
+
+import os
+import signal
+import sys
+import time
+
+import pytest
+import torch
+
+from app.cancellation import CancelToken, RequestTimeout
+from app.inference import QAInference
+from app.metrics import MetricsCollector
+from app.prefork import PreforkServer
+from app.tiny_model import build_tiny_model
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="pre-fork serving needs fork and /proc")
+
+
+@pytest.fixture(scope="module")
+def inference():
+    model, tokenizer = build_tiny_model()
+    return QAInference(model, tokenizer, torch.device("cpu"))
+
+
+def make_requests(count):
+    return [
+        (f"Question {i}?", f"Context {i} about Berlin and Germany.", "German" if i % 3 == 0 else "English")
+        for i in range(count)
+    ]
+
+
+def test_prefork_matches_in_process(inference):
+    requests = make_requests(12)
+    reference = [inference.answer_question(*request)[0] for request in requests]
+
+    server = PreforkServer(inference, num_workers=3, max_batch_size=4).start()
+    try:
+        futures = [server.submit(*request) for request in requests]
+        assert [future.result(timeout=60) for future in futures] == reference
+        assert [server.answer_question(*request)[0] for request in requests[:3]] == reference[:3]
+
+        questions, contexts, languages = zip(*requests)
+        batch = server.answer_batch(list(questions), list(contexts), list(languages), batch_size=5)
+        assert [answer for answer, _ in batch] == reference
+
+        stats = server.get_stats()
+        assert len(stats["workers"]) == 3
+        assert sum(worker["served"] for worker in stats["workers"]) > 0
+        assert stats["total_pss_mb"] < stats["total_rss_mb"]
+
+        # Deadlines reach the workers; expired requests get the timeout result
+        expired = CancelToken(deadline=0)
+        assert server.answer_question(*requests[0], cancel_token=expired)[0] == RequestTimeout.message
+        assert server.answer_question(*requests[0], cancel_token=CancelToken(60))[0] == reference[0]
+        batch = server.answer_batch(
+            list(questions[:2]), list(contexts[:2]), list(languages[:2]), cancel_tokens=[expired, None]
+        )
+        assert [answer for answer, _ in batch] == [RequestTimeout.message, reference[1]]
+    finally:
+        server.stop()
+
+
+def test_crashed_worker_is_replaced(inference):
+    request = make_requests(1)[0]
+    server = PreforkServer(inference, num_workers=1).start()
+    try:
+        expected = server.answer_question(*request)[0]
+        os.kill(server.get_stats()["workers"][0]["pid"], signal.SIGKILL)
+
+        deadline = time.time() + 30
+        while server.get_stats()["restarts"] == 0:
+            assert time.time() < deadline, "worker was not restarted"
+            time.sleep(0.1)
+        assert server.answer_question(*request)[0] == expected
+    finally:
+        server.stop()
+
+
+def test_failed_group_does_not_reply_twice(inference, monkeypatch):
+    request = make_requests(1)[0]
+    reference = inference.answer_question(*request)[0]
+    answer_batch = inference.answer_batch
+
+    def flaky_answer_batch(*args, adapter=None, **kwargs):
+        if adapter == "slow":
+            time.sleep(1.0)
+            adapter = None
+        elif adapter == "broken":
+            raise RuntimeError("group failed")
+        return answer_batch(*args, adapter=adapter, **kwargs)
+
+    # Patched before the fork, so the worker inherits it
+    monkeypatch.setattr(inference, "answer_batch", flaky_answer_batch)
+    server = PreforkServer(inference, num_workers=1, max_batch_size=4).start()
+    try:
+        # The shorter max_length sorts the blocker first even when all three share a batch
+        blocker = server.submit(*request, max_length=8, adapter="slow")
+        # Both queue behind the blocker and reach the worker in one batch
+        answered = server.submit(*request)
+        failed = server.submit(*request, adapter="broken")
+
+        blocker.result(timeout=60)
+        assert answered.result(timeout=60) == reference
+        with pytest.raises(RuntimeError, match="group failed"):
+            failed.result(timeout=60)
+        time.sleep(0.5)
+        stats = server.get_stats()
+        assert stats["workers"][0]["served"] == 3 and stats["workers"][0]["in_flight"] == 0
+    finally:
+        server.stop()
+
+
+def test_worker_events_and_long_requests_reach_the_parent():
+    model, tokenizer = build_tiny_model()
+    metrics = MetricsCollector()
+    inference = QAInference(model, tokenizer, torch.device("cpu"), hooks=[metrics])
+    question, context, language = make_requests(1)[0]
+    long_context = " ".join([context] * 20)
+    reference = QAInference(model, tokenizer, torch.device("cpu"))
+    expected_long = reference.answer_long_context(question, long_context, language, window_size=64, stride=16)
+    expected_rows = reference.answer_questions(["Who?", "Where?"], context, language)
+
+    server = PreforkServer(inference, num_workers=1).start()
+    try:
+        assert server.answer_question(question, context, language)[0]
+        assert server.answer_long_context(question, long_context, language, window_size=64, stride=16) == expected_long
+        assert server.answer_questions(["Who?", "Where?"], context, language) == expected_rows
+        expired = CancelToken(deadline=0)
+        assert server.answer_long_context(question, long_context, cancel_token=expired) == (RequestTimeout.message, "")
+
+        # The long-context and multi-question requests ran on the worker
+        assert server.get_stats()["workers"][0]["served"] == 3
+        snapshot = metrics.snapshot()
+        assert snapshot["requests"] == {language: 3}
+        assert snapshot["aborted"]["expired"] == 1
+        assert snapshot["tokens_in"] > 0 and snapshot["tokens_out"] > 0
+        assert snapshot["stages"]["generate"]["count"] == snapshot["stages"]["decode"]["count"] > 2
+    finally:
+        server.stop()
@@ -0,0 +1,86 @@
+"""
+Retrieval Test
+Builds a small English/German BM25 index incrementally, checks ranking and
+language handling, and answers a question over the retrieved passages
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from app.retrieval import CorpusQA, PassageIndex, split_passages, tokenize
+
+DOCUMENTS = [
+    {"id": "paris", "text": "Paris is the capital and most populous city of France."},
+    {"id": "eiffel", "text": "The Eiffel Tower was built from 1887 to 1889 as the entrance to the World's Fair."},
+    {"id": "rome", "text": "Rome is the capital city of Italy and was founded in 753 BC."},
+    {"id": "berlin", "text": "Berlin ist die Hauptstadt von Deutschland und die größte Stadt des Landes.",
+     "language": "German"},
+    {"id": "brücke", "text": "Die Oberbaumbrücke verbindet die Bezirke Kreuzberg und Friedrichshain.",
+     "language": "German"}
+]
+
+
+def build_index(documents=DOCUMENTS):
+    path = Path(tempfile.mkdtemp()) / "corpus.db"
+    corpus = path.with_suffix(".jsonl")
+    corpus.write_text("\n".join(json.dumps(document) for document in documents), encoding="utf-8")
+    index = PassageIndex(str(path))
+    return index, index.add_files([str(corpus)])
+
+
+def test_tokenize_and_split():
+    assert tokenize("The towers were built", "English") == ["tower", "built"]
+    assert tokenize("Die größten Städte über der Brücke", "German") == ["grosst", "stadt", "bruck"]
+    assert tokenize("Brucke", "German") == tokenize("Brücke", "German")
+
+    passages = split_passages(" ".join(str(i) for i in range(250)), max_words=100, overlap=20)
+    assert [len(passage.split()) for passage in passages] == [100, 100, 90]
+    assert passages[1].split()[0] == "80"
+
+
+def test_incremental_build_and_search():
+    index, build = build_index(DOCUMENTS[:3])
+    assert build["documents_added"] == 3 and build["passages_added"] == 3
+
+    # Re-adding skips indexed documents; new documents extend the index
+    more = index.add_documents(DOCUMENTS)
+    assert more["documents_added"] == 2 and more["documents_skipped"] == 3
+
+    stats = index.get_stats()
+    assert stats["passages_by_language"] == {"English": 3, "German": 2}
+    assert stats["size_mb"] > 0
+
+    assert index.search("When was the Eiffel Tower built?", "English")[0]["doc_id"] == "eiffel"
+    assert index.search("capital of Italy", "English", top_k=1)[0]["doc_id"] == "rome"
+    assert index.search("Hauptstadt Deutschlands", "German")[0]["doc_id"] == "berlin"
+    assert [hit["doc_id"] for hit in index.search("Brücke Kreuzberg", "German")] == ["brücke"]
+    # Passages of another language are not searched
+    assert index.search("Hauptstadt", "English") == []
+    assert index.search("the of and", "English") == []
+
+    # The index persists on disk
+    index.close()
+    reopened = PassageIndex(index.path)
+    assert reopened.get_stats()["passages"] == 5
+    assert reopened.search("Eiffel", "English")[0]["doc_id"] == "eiffel"
+
+
+def test_corpus_qa_answers_over_retrieved_passages():
+    from app.inference import QAInference
+    from app.tiny_model import build_tiny_model
+
+    model, tokenizer = build_tiny_model()
+    index, _ = build_index()
+    corpus_qa = CorpusQA(index, QAInference(model, tokenizer, "cpu", num_beams=1), top_k=2)
+
+    result = corpus_qa.answer("When was the Eiffel Tower in the capital built?", "English", max_length=8)
+    assert len(result["candidates"]) == 2
+    assert result["candidates"][0]["doc_id"] == "eiffel"
+    assert result["answer"] in [candidate["answer"] for candidate in result["candidates"]]
+    if result["source"] is not None:
+        assert "**Source**" in result["info"]
+    assert result["timings_ms"]["total"] >= result["timings_ms"]["retrieve"]
+
+    assert corpus_qa.answer("Quantum chromodynamics", "English")["candidates"] == []
+    assert corpus_qa.get_stats()["questions"] == 1
@@ -0,0 +1,61 @@
+"""
+Streaming Test
+Checks that streamed answers grow token by token, end with the greedy
+non-streaming answer and report time to first token
+"""
+
+from app.batching import MicroBatcher
+from app.cache import AnswerCache
+from app.inference import QAInference
+from app.metrics import MetricsCollector
+from app.tiny_model import build_tiny_model
+
+QUESTION = ("What is it?", "The Eiffel Tower was built from 1887 to 1889.", "English")
+
+
+def test_stream_answer_matches_greedy_answer():
+    model, tokenizer = build_tiny_model(seed=1)
+    metrics = MetricsCollector()
+    inference = QAInference(model, tokenizer, "cpu", num_beams=1, hooks=[metrics], cache=AnswerCache(8))
+
+    chunks = list(inference.stream_answer(*QUESTION, max_length=12))
+    partials = [answer for answer, info in chunks[:-1]]
+    answer, info = chunks[-1]
+    assert len(partials) > 1 and all(info == "" for _, info in chunks[:-1])
+    assert all(answer.startswith(partial) for partial in partials)
+    assert partials[-1] == answer and "Response Details" in info
+
+    # Same greedy answer as the non-streaming path (which stays available)
+    reference = QAInference(model, tokenizer, "cpu", num_beams=1)
+    assert reference.answer_question(*QUESTION, max_length=12)[0] == answer
+
+    stages = metrics.snapshot()["stages"]
+    assert stages["first_token"]["count"] == 1
+    assert stages["first_token"]["avg_ms"] <= stages["request"]["avg_ms"]
+
+    # A cached answer is yielded at once
+    assert list(inference.stream_answer(*QUESTION, max_length=12)) == [chunks[-1]]
+
+
+def test_stream_through_micro_batcher_and_blank_input():
+    model, tokenizer = build_tiny_model(seed=1)
+    batcher = MicroBatcher(QAInference(model, tokenizer, "cpu", num_beams=1))
+    assert list(batcher.stream_answer(*QUESTION, max_length=12))[-1][0]
+    assert list(batcher.stream_answer("", "context")) == [("⚠️ Please provide both a question and context!", "")]
+
+
+def test_backend_without_streamer_support_yields_final_answer():
+    model, tokenizer = build_tiny_model(seed=1)
+    reference = QAInference(model, tokenizer, "cpu", num_beams=1).answer_question(*QUESTION, max_length=12)[0]
+    generate = model.generate
+
+    def generate_without_streaming(*args, streamer=None, **kwargs):
+        return generate(*args, **kwargs)
+
+    # A backend that ignores the streamer must not leave the stream waiting
+    model.generate = generate_without_streaming
+    metrics = MetricsCollector()
+    inference = QAInference(model, tokenizer, "cpu", num_beams=1, hooks=[metrics])
+    chunks = list(inference.stream_answer(*QUESTION, max_length=12))
+    assert len(chunks) == 1 and chunks[0][0] == reference and "Response Details" in chunks[0][1]
+    assert metrics.snapshot()["stages"]["first_token"]["count"] == 1
@@ -0,0 +1,66 @@
+"""
+Vocabulary Pruning Test
+Prunes the tiny model to a small corpus and checks that kept tokens keep
+their segmentation and logits, and that ModelLoader serves the result
+"""
+
+import copy
+import tempfile
+from pathlib import Path
+
+import torch
+
+from app.inference import QAInference
+from app.model_loader import ModelLoader
+from app.tiny_model import TINY_CORPUS, build_tiny_model
+from app.vocab import build_pruned_model, count_tokens, prune_model, prune_tokenizer, select_vocabulary
+
+CORPUS = TINY_CORPUS[:2]
+
+
+def test_pruned_model_keeps_logits_of_kept_tokens():
+    model, tokenizer = build_tiny_model()
+    keep_ids = select_vocabulary(tokenizer, count_tokens(tokenizer, CORPUS))
+    assert len(keep_ids) < len(tokenizer)
+    assert tokenizer.convert_tokens_to_ids("de_DE") in keep_ids
+
+    pruned_tokenizer = prune_tokenizer(tokenizer, keep_ids, tempfile.mkdtemp())
+    pruned_model = prune_model(copy.deepcopy(model), keep_ids)
+    assert len(pruned_tokenizer) == len(keep_ids) == pruned_model.config.vocab_size
+
+    original = tokenizer(CORPUS[0], return_tensors="pt")["input_ids"]
+    pruned = pruned_tokenizer(CORPUS[0], return_tensors="pt")["input_ids"]
+    assert pruned.tolist() == [[keep_ids.index(token_id) for token_id in original[0].tolist()]]
+    assert pruned_tokenizer.convert_ids_to_tokens(pruned_tokenizer.convert_tokens_to_ids("en_XX")) == "en_XX"
+
+    decoder_ids = original[:, :5]
+    with torch.no_grad():
+        expected = model(input_ids=original, decoder_input_ids=decoder_ids).logits[..., keep_ids]
+        actual = pruned_model(input_ids=pruned, decoder_input_ids=pruned[:, :5]).logits
+    torch.testing.assert_close(actual, expected)
+
+
+def test_build_pruned_model_loads_and_answers_alike():
+    model_path = tempfile.mkdtemp(prefix="tiny_mbart_")
+    build_tiny_model(save_path=model_path)
+    corpus_file = Path(tempfile.mkdtemp()) / "corpus.txt"
+    corpus_file.write_text("\n".join(CORPUS), encoding="utf-8")
+    samples = [
+        {"question": "What is the capital of France?", "language": "English",
+         "context": "Paris is the capital and most populous city of France."}
+    ]
+
+    output_path = tempfile.mkdtemp(prefix="tiny_pruned_")
+    report = build_pruned_model(model_path, output_path, [str(corpus_file)], samples=samples)
+    assert report["pruned"]["vocab_size"] < report["original"]["vocab_size"]
+    assert report["pruned"]["parameters"] < report["original"]["parameters"]
+    assert report["tokenization_mismatches"] == 0
+
+    # Greedy decoding constrained to the context only scores kept tokens
+    answers = []
+    for path in (model_path, output_path):
+        loader = ModelLoader(model_path=path)
+        model, tokenizer = loader.load()
+        inference = QAInference(model, tokenizer, loader.device, num_beams=1, constrained_decoding=True)
+        answers.append(inference.answer_question(samples[0]["question"], samples[0]["context"], max_length=12)[0])
+    assert answers[0] == answers[1]